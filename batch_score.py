@@ -0,0 +1,43 @@
+import argparse
+import os
+import sys
+
+from src.core.batch_scoring import load_manifest, run_batch, write_summary
+from src.config.settings import BATCH_REPORTS_DIRECTORY
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score a manifest of recorded assessment videos in parallel")
+    parser.add_argument("manifest", help="JSON or CSV manifest of videos with their affected side")
+    parser.add_argument("--output-dir", default=BATCH_REPORTS_DIRECTORY,
+                        help="directory for the reports, logs, ledger and summary (default: %(default)s)")
+    parser.add_argument("--workers", type=int,
+                        help="worker processes (default: one per core, limited by the available memory)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="score every video again instead of skipping those in the completed-jobs ledger")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = load_manifest(args.manifest)
+    if jobs is None:
+        return 1
+
+    rows = run_batch(jobs, args.output_dir, workers=args.workers, resume=not args.no_resume)
+
+    print(f"\n{'video':<30}{'status':<10}{'affected':>10}{'unaffected':>12}{'max':>6}{'seconds':>10}")
+    for row in rows:
+        print(f"{row['id']:<30}{row['status']:<10}{row.get('affected_total', '-'):>10}"
+              f"{row.get('unaffected_total', '-'):>12}{row.get('max_score', '-'):>6}{row['seconds']:>10}")
+    summary_path = write_summary(rows, os.path.join(args.output_dir, "summary.csv"))
+    print(f"\nSummary saved to {summary_path}")
+
+    failed = [row["id"] for row in rows if row["status"] != "ok"]
+    if failed:
+        print(f"{len(failed)} videos failed, see their logs in {args.output_dir}")
+    return 0 if len(rows) == len(jobs) and not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
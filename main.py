@@ -1,69 +1,161 @@
+import argparse
 import cv2
+import os
 import sys
+import time
 
-from src.gui.exercise_interface import ExerciseInterface
+from src.core.frame_sources import ClockedSource, open_frame_source
 from src.core.pose_evaluator import PoseEvaluator
 from src.core.results_manager import ResultsManager
 from src.core.assessment_session import FuglMeyerAssessment
+from src.core.frame_governor import FrameRateGovernor
+from src.core.session_recorder import SessionRecorder
+from src.utils.clock import ReplayClock
 from src.utils.file_utils import ensure_directories_exist, get_non_affected_side
+from src.utils.instrumentation import instrumentation
+from src.utils.profiling import SessionProfiler
 from src.config.settings import *
-from src.gui.results_interface import ResultsInterface
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fugl Meyer Upper Extremity Assessment")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without any window or results GUI and only write the report")
+    parser.add_argument("--side", choices=["left", "right"],
+                        help="non-affected side (asked interactively when omitted, required with --headless)")
+    parser.add_argument("--source", default=str(CAMERA_ID),
+                        help="camera index, video file, directory of images or synthetic[:WIDTHxHEIGHT] "
+                             "(default: %(default)s)")
+    parser.add_argument("--pacing", choices=["realtime", "fast"],
+                        help="play recorded sources at their frame rate or as fast as they decode "
+                             "(default: fast with --headless, realtime otherwise)")
+    parser.add_argument("--output", help="path of the report JSON (default: timestamped file in the reports directory)")
+    parser.add_argument("--exercises", nargs="+", metavar="ID",
+                        help="only run these exercise ids, in configuration order")
+    parser.add_argument("--instrument", action="store_true",
+                        help="track frame rate, stage latencies and detection misses and add them to the report "
+                             "(also enabled by INSTRUMENTATION_ENABLED)")
+    parser.add_argument("--record", nargs="?", const="", metavar="PATH",
+                        help="record the session's landmarks and scores to PATH (default: timestamped file in "
+                             "the sessions directory); also enabled by SESSION_RECORDING_ENABLED")
+    parser.add_argument("--frame-rates", choices=list(FRAME_RATE_PRESETS), default=FRAME_RATE_PRESET,
+                        help="display, pose, gesture and evaluation rates from FRAME_RATE_PRESETS, e.g. "
+                             "low_power for battery-powered tablets (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.headless and args.side is None:
+        parser.error("--side is required with --headless")
+    return args
+
+def exercise_clock(source, pacing):
+    """
+    Clock that times the exercises: recorded sources read as fast as they
+    decode run on their own timestamps, so scores do not depend on how fast
+    the machine is. None keeps the system clock.
+    """
+    if pacing == "fast" and not str(source).isdigit():
+        return ReplayClock()
+    return None
+
+def main(argv=None):
     """
     Main application entry point for Fugl Meyer Upper Extremity Assessment
     """
+    args = parse_args(argv)
+    record = args.record is not None or SESSION_RECORDING_ENABLED
+    if args.instrument:
+        instrumentation.enabled = True
+
     # Ensure required directories exist
     ensure_directories_exist([
-        MODELS_DIRECTORY, 
+        MODELS_DIRECTORY,
         ASSESSMENT_REPORTS_DIRECTORY,
         REFERENCE_POSES_DIRECTORY
-    ])
-    
+    ] + ([SESSION_RECORDINGS_DIRECTORY] if record else []))
+
     # Get non-affected side
-    non_affected_side = get_non_affected_side()
-    
+    non_affected_side = args.side or get_non_affected_side()
+
     # Initialize assessment session
-    assessment = FuglMeyerAssessment()
-    if not assessment.initialize():
+    pacing = args.pacing or ("fast" if args.headless else "realtime")
+    clock = exercise_clock(args.source, pacing)
+    assessment = FuglMeyerAssessment(clock=clock)
+    assessment.set_governor(FrameRateGovernor.from_preset(args.frame_rates))
+    if not assessment.initialize(args.exercises):
         print("Failed to initialize assessment. Exiting.")
-        return
-    
-    # Initialize components
-    interface = ExerciseInterface("Fugl Meyer Assessment")
-    evaluator = PoseEvaluator(non_affected_side)
+        return 1
+
+    # Initialize components. The GUI modules are only imported when needed,
+    # so headless runs work without a display or PyQt.
+    interface = None
+    if not args.headless:
+        from src.gui.exercise_interface import ExerciseInterface
+        interface = ExerciseInterface("Fugl Meyer Assessment")
+    evaluator = PoseEvaluator(non_affected_side, clock)
     results = ResultsManager()
-    
+
     # Set components in assessment
     assessment.set_components(interface, evaluator, results)
-    
-    # Open webcam
-    cap = cv2.VideoCapture(0)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
-    cap.set(cv2.CAP_PROP_FPS, 30)  # Set to 30 FPS
-    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimize buffer size
-    
-    if not cap.isOpened():
-        print("Error: Could not open webcam")
-        return
-        
-    print("Webcam opened successfully")
-    
+
+    # Open the webcam or recorded source
+    source = open_frame_source(args.source, realtime=pacing == "realtime")
+
+    if source is None:
+        print(f"Error: Could not open video source {args.source}")
+        return 1
+    if clock is not None:
+        source = ClockedSource(source, clock)
+
+    print("Video source opened successfully")
+
+    # Record the session when asked to
+    recorder = None
+    if record:
+        recording_path = args.record or os.path.join(
+            SESSION_RECORDINGS_DIRECTORY, f"session_{time.strftime('%Y%m%d-%H%M%S')}.fma")
+        recorder = SessionRecorder(recording_path, metadata={
+            "non_affected_side": non_affected_side,
+            "source": args.source,
+            "exercises": [exercise["id"] for exercise in assessment.exercises],
+            "pose_running_mode": POSE_RUNNING_MODE
+        })
+        if recorder.start():
+            assessment.set_recorder(recorder)
+        else:
+            recorder = None
+
+    # Deep profiling, switched on with the FMA_TRACE / FMA_PROFILE environment variables
+    profiler = SessionProfiler.from_environment()
+    if profiler:
+        assessment.set_profiler(profiler.start())
+
     # Run the assessment
-    assessment.run_assessment(cap)
-    
+    assessment.run_assessment(source)
+
     # Generate and save report
-    report_path = results.save_report()
+    report_path = results.save_report(args.output)
     print(f"\nAssessment complete. Report saved to {report_path}")
-    
+
     # Clean up
-    cap.release()
+    if profiler:
+        profiler.close()
+        for path in [profiler.trace_path] + profiler.profile_paths:
+            if path:
+                print(f"Profile saved to {path}")
+    if recorder:
+        recorder.close()
+        if recorder.error is None:
+            print(f"Session recorded to {recorder.path}")
+        else:
+            print(f"Session recording {recorder.path} is incomplete and cannot be replayed")
+    source.release()
+    assessment.detector.close()
+    if args.headless:
+        return 0
     cv2.destroyAllWindows()
-    
+
     # Show results using the original ResultsManager instance
+    from src.gui.results_interface import ResultsInterface
     interface = ResultsInterface(results, evaluator.affected_side)
     return interface.show()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import argparse
+import json
+import sys
+import time
+
+from src.core.replay_engine import ReplayEngine
+
+
+def parse_override(text):
+    """EXERCISE_ID.SETTING=VALUE, the value is read as JSON when possible"""
+    target, _, value = text.partition("=")
+    exercise_id, _, setting = target.rpartition(".")
+    if not exercise_id or not setting or not value:
+        raise argparse.ArgumentTypeError(f"expected EXERCISE_ID.SETTING=VALUE, got {text!r}")
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    return exercise_id, setting, value
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score recorded Fugl Meyer sessions without a camera")
+    parser.add_argument("archives", nargs="+", help="session archives recorded with main.py --record")
+    parser.add_argument("--exercises", nargs="+", metavar="ID", help="only re-score these exercise ids")
+    parser.add_argument("--set", dest="overrides", action="append", type=parse_override, default=[],
+                        metavar="ID.SETTING=VALUE",
+                        help="override an exercise setting, e.g. a_2_flexor.stabilization_ms=800")
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    overrides = {}
+    for exercise_id, setting, value in args.overrides:
+        overrides.setdefault(exercise_id, {})[setting] = value
+    engine = ReplayEngine(overrides=overrides)
+
+    results = {}
+    frames = 0
+    start = time.perf_counter()
+    for path in args.archives:
+        try:
+            results[path] = engine.rescore_archive(path, args.exercises)
+        except (OSError, ValueError) as e:
+            print(f"Could not replay {path}: {e}")
+            continue
+        frames += sum(result["evaluated_frames"] for result in results[path])
+    elapsed = time.perf_counter() - start
+
+    for path, rows in results.items():
+        print(f"\n{path}")
+        print(f"{'exercise':<38}{'phase':<12}{'recorded':>10}{'replayed':>10}{'changed frames':>16}")
+        for row in rows:
+            print(f"{row['exercise_id']:<38}{row['phase']:<12}{row['recorded_score']:>10}{row['score']:>10}"
+                  f"{row['changed_frames']:>10}/{row['evaluated_frames']:<5}")
+    print(f"\nReplayed {frames} frames of {len(results)} sessions in {elapsed * 1000:.0f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+    return 0 if len(results) == len(args.archives) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
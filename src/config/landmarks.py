@@ -27,3 +27,17 @@ RIGHT_LANDMARKS = {
     "HEEL": 30,
     "FOOT_INDEX": 32
 }
+
+# Face landmarks of each side
+LEFT_FACE_LANDMARKS = (1, 2, 3, 7, 9)
+RIGHT_FACE_LANDMARKS = (4, 5, 6, 8, 10)
+NOSE = 0
+
+# Skeleton edges between the 33 pose landmarks (same as MediaPipe's POSE_CONNECTIONS)
+POSE_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),
+    (11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+    (27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32)
+)
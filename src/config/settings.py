@@ -8,6 +8,20 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 CAMERA_ID = 0
 CAMERA_WIDTH = 640
 CAMERA_HEIGHT = 480
+# Resolution requested from the camera. It can be set above CAMERA_WIDTH x
+# CAMERA_HEIGHT (the display size) when POSE_ROI_ENABLED is on, so the pose
+# crop keeps more detail without running the model on the whole frame.
+CAPTURE_WIDTH = CAMERA_WIDTH
+CAPTURE_HEIGHT = CAMERA_HEIGHT
+CAMERA_FPS = 30
+CAMERA_BUFFER_SIZE = 1  # Frames buffered by the camera driver, kept minimal for latency
+
+# Frame source settings
+# Frames are decoded ahead on a background thread. Recorded sources (video
+# files, image directories) block when the buffer is full so no frame is lost;
+# the camera drops the oldest frame so the newest is always available.
+FRAME_PREFETCH_SIZE = 4
+CAMERA_PREFETCH_FRAMES = 1
 
 # MediaPipe model settings
 MODEL_PATH = str(PROJECT_ROOT / "data/models/pose_landmarker.task")
@@ -15,9 +29,120 @@ MODEL_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pos
 HAND_MODEL_PATH = str(PROJECT_ROOT / "data/models/gesture_recognizer.task")
 HAND_MODEL_URL = "https://storage.googleapis.com/mediapipe-models/gesture_recognizer/gesture_recognizer/float16/latest/gesture_recognizer.task"
 
+# Pose model tiers, ordered from fastest to most accurate
+POSE_MODEL_TIERS = {
+    "lite": {
+        "url": "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/1/pose_landmarker_lite.task",
+        "path": str(PROJECT_ROOT / "data/models/pose_landmarker_lite.task")
+    },
+    "full": {
+        "url": "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_full/float16/1/pose_landmarker_full.task",
+        "path": str(PROJECT_ROOT / "data/models/pose_landmarker_full.task")
+    },
+    "heavy": {
+        "url": MODEL_URL,
+        "path": MODEL_PATH
+    }
+}
+POSE_MODEL_TIER = "heavy"
+
+# Adaptive tier selection: step down a tier when the rolling pose inference
+# latency exceeds the frame-time budget, step up when there is enough headroom
+ADAPTIVE_MODEL_TIER = False
+FRAME_TIME_BUDGET_MS = 100
+MODEL_TIER_WINDOW = 30  # Frames in the rolling latency window
+MODEL_TIER_UPGRADE_RATIO = 0.4  # Step up when latency is below this fraction of the budget
+MODEL_TIER_COOLDOWN_FRAMES = 150  # Frames to wait after stepping down before stepping up again
+
 # File paths
 OUTPUT_DIRECTORY = str(PROJECT_ROOT / "data/assessment_reports")
 MODELS_DIRECTORY = str(PROJECT_ROOT / "data/models")
 ASSESSMENT_REPORTS_DIRECTORY = str(PROJECT_ROOT / "data/assessment_reports")
 REFERENCE_POSES_DIRECTORY = str(PROJECT_ROOT / "data/reference_poses")
 CONFIG_DIRECTORY = str(PROJECT_ROOT / "src/config")
+
+# Frame loop settings
+# When enabled, capture and inference run on worker threads and the display
+# shows the newest available result instead of waiting on the pose model
+PIPELINE_ENABLED = False
+PIPELINE_CAPTURE_QUEUE_SIZE = 1  # Capture keeps only the newest frame
+PIPELINE_RENDER_QUEUE_SIZE = 2
+
+# Frame rate governor
+# Target rates in frames per second of the display, pose inference, gesture
+# inference and evaluation; None runs a stage on every frame. Frames without
+# pose inference are shown with the last landmarks, extrapolated when
+# FRAME_RATE_EXTRAPOLATE is on. Gestures only run on frames with pose
+# inference. Keep evaluation above 1000 / STABILIZATION_DROPOUT_TOLERANCE_MS
+# fps so the gaps between scores do not restart the holds.
+FRAME_RATE_PRESETS = {
+    "full": {"display": None, "pose": None, "gesture": None, "evaluate": None},
+    "balanced": {"display": 30, "pose": 15, "gesture": 5, "evaluate": 15},
+    "low_power": {"display": 15, "pose": 8, "gesture": 3, "evaluate": 8}  # Battery-powered tablets
+}
+FRAME_RATE_PRESET = "full"
+FRAME_RATE_EXTRAPOLATE = False
+FRAME_RATE_EXTRAPOLATION_MAX_MS = 150  # Furthest the landmarks are moved ahead of the last inference
+
+# Frame loop instrumentation
+# When enabled, capture, pose, gesture, evaluate, render and whole-frame
+# times, the effective fps and the detection miss rate are tracked per
+# exercise and saved in the report
+INSTRUMENTATION_ENABLED = False
+INSTRUMENTATION_WINDOW = 120  # Frames in the rolling windows of the live readout
+INSTRUMENTATION_OVERLAY = False  # Show the live readout in the camera view
+
+# Score stabilization
+# Scored frames further apart than this (no pose, no score) restart the hold
+# of exercises whose stabilization is set in milliseconds. Exercises can set
+# their own "dropout_tolerance_ms".
+STABILIZATION_DROPOUT_TOLERANCE_MS = 300
+
+# Session recording
+# When enabled, every frame's landmarks, gestures, score and metrics are
+# written to a compact session archive that can be replayed without a camera
+SESSION_RECORDING_ENABLED = False
+SESSION_RECORDINGS_DIRECTORY = str(PROJECT_ROOT / "data/sessions")
+SESSION_CHUNK_FRAMES = 256  # Frames per compressed chunk
+
+# Batch scoring of recorded videos (batch_score.py)
+BATCH_REPORTS_DIRECTORY = str(PROJECT_ROOT / "data/batch_reports")
+BATCH_WORKER_MEMORY_MB = 1024  # Memory budget per worker process (pose and gesture models, frame buffers)
+BATCH_LEDGER_NAME = "completed_jobs.jsonl"  # Completed jobs, in the output directory
+
+# Pose tracking settings
+# Running mode of the MediaPipe detectors: "IMAGE", "VIDEO" or "LIVE_STREAM".
+# VIDEO and LIVE_STREAM track the pose between frames, so the person detector
+# only runs when tracking is lost. IMAGE treats every frame independently.
+POSE_RUNNING_MODE = "VIDEO"
+MIN_POSE_DETECTION_CONFIDENCE = 0.5
+MIN_POSE_PRESENCE_CONFIDENCE = 0.5
+MIN_TRACKING_CONFIDENCE = 0.5
+
+# Gesture recognizer lifecycle
+# Number of upcoming exercises checked when deciding to preload the hand model
+GESTURE_PRELOAD_AHEAD = 1
+
+# Hand ROI settings
+# When enabled, gestures are recognized on a square crop around the assessed
+# hand (located from the pose wrist/finger landmarks) instead of the full frame
+HAND_ROI_ENABLED = False
+HAND_ROI_SCALE = 3.0  # Crop side relative to the extent of the pose hand landmarks
+HAND_ROI_MIN_SIZE = 96  # Minimum crop side in pixels
+
+# Pose ROI settings
+# When enabled, pose detection runs on a square crop around the previous
+# frame's landmarks, resized to the model input size, and falls back to the
+# full frame when tracking is lost. Works best with the IMAGE or VIDEO mode.
+POSE_ROI_ENABLED = False
+POSE_ROI_SCALE = 1.3  # Crop side relative to the extent of the visible landmarks
+POSE_ROI_INPUT_SIZE = 256  # Pose landmarker input resolution
+POSE_ROI_MIN_VISIBILITY = 0.5  # Landmarks below this visibility do not shape the crop
+
+# Skeleton overlay style: "default" colors both sides, "assessed_side"
+# highlights the side being assessed and dims the rest
+LANDMARK_STYLE = "default"
+
+# Instruction panel layers (title, wrapped instructions, resized reference
+# image) kept between frames; two per exercise covers both sides
+INSTRUCTION_PANEL_CACHE_SIZE = 4
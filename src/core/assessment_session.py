@@ -1,11 +1,21 @@
 from src.core.pose_detector import PoseDetector
 from src.utils.file_utils import load_fugl_meyer_tests
 import cv2
+import numpy as np
 import time
 from src.utils.pose_visualization import draw_landmarks
+from src.core.frame_governor import FrameRateGovernor, extrapolate_landmarks
+from src.core.frame_pipeline import FramePipeline
+from src.core.score_tracker import ScoreTracker
+from src.utils.clock import system_clock
+from src.utils.frame_buffers import frame_counter
+from src.utils.instrumentation import instrumentation
+from src.utils.roi import letterbox_region
+from src.config import settings
 
 class FuglMeyerAssessment:
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock or system_clock
         self.detector = PoseDetector()
         self.exercises = []
         self.assessment_phase = "unaffected"
@@ -17,8 +27,15 @@ class FuglMeyerAssessment:
         self.interface = None
         self.evaluator = None
         self.results_manager = None
+        self.recorder = None
+        self.profiler = None
+        self.governor = FrameRateGovernor.from_preset()
+        self._reset_inference_state()
+        self.pipeline_stats = {}
+        self.frame_buffer_stats = {}
         
-    def initialize(self):
+    def initialize(self, exercise_ids=None):
+        """Load the pose model and the exercises, optionally only those in `exercise_ids`"""
         print("\nInitializing pose detector...")
         if not self.detector.initialize():
             return False
@@ -30,22 +47,44 @@ class FuglMeyerAssessment:
             return False
         
         self.exercises = tests["exercises"]
+        if exercise_ids:
+            known_ids = {exercise["id"] for exercise in self.exercises}
+            unknown_ids = [exercise_id for exercise_id in exercise_ids if exercise_id not in known_ids]
+            if unknown_ids:
+                print(f"Unknown exercises: {', '.join(unknown_ids)}")
+                return False
+            self.exercises = [exercise for exercise in self.exercises if exercise["id"] in exercise_ids]
         print(f"Loaded {len(self.exercises)} exercises")
         return True
         
     def set_components(self, interface, evaluator, results_manager):
-        """Set the components needed for running exercises"""
+        """
+        Set the components needed for running exercises. Without an interface
+        the assessment runs headless: no window, no rendering, no key handling.
+        """
         self.interface = interface
         self.evaluator = evaluator
         self.results_manager = results_manager
+    
+    def set_profiler(self, profiler):
+        """Profile the following exercises with a SessionProfiler (None stops profiling)"""
+        self.profiler = profiler
+    
+    def set_governor(self, governor):
+        """Run display, inference and evaluation at the rates of a FrameRateGovernor"""
+        self.governor = governor
+    
+    def set_recorder(self, recorder):
+        """Record every frame of the following exercises to a SessionRecorder (None stops recording)"""
+        self.recorder = recorder
             
-    def run_assessment(self, cap):
+    def run_assessment(self, source):
         """Run the complete assessment"""
         if not self.exercises:
             print("No exercises to run")
             return False
             
-        if not all([self.interface, self.evaluator, self.results_manager]):
+        if not all([self.evaluator, self.results_manager]):
             print("Missing required components. Call set_components first.")
             return False
             
@@ -55,12 +94,13 @@ class FuglMeyerAssessment:
         for i, exercise in enumerate(self.exercises):
             self.current_exercise_index = i
             print(f"\nExercise {i+1}/{len(self.exercises)}: {exercise['name']}")
+            self._update_hand_model(i)
             
             # First do unaffected side
             self.assessment_phase = "unaffected"
             print(f"\nStarting {self.assessment_phase} side...")
             
-            exercise_complete = self.run_exercise(cap, exercise, self.assessment_phase)
+            exercise_complete = self.run_exercise(source, exercise, self.assessment_phase)
             if exercise_complete:
                 self.results[self.assessment_phase][exercise['id']] = {
                     'name': exercise['name'],
@@ -76,7 +116,7 @@ class FuglMeyerAssessment:
 
             self.evaluator.reset_current_exercise()
             
-            exercise_complete = self.run_exercise(cap, exercise, self.assessment_phase)
+            exercise_complete = self.run_exercise(source, exercise, self.assessment_phase)
             if exercise_complete:
                 self.results[self.assessment_phase][exercise['id']] = {
                     'name': exercise['name'],
@@ -87,75 +127,246 @@ class FuglMeyerAssessment:
                 print(f"\nExercise skipped by user")
                 
             print(f"\nCompleted exercise {i+1} for both sides")
-            
+        
+        self.detector.release_hand_recognizer()
         return self.results
+    
+    def _update_hand_model(self, exercise_index):
+        """
+        Keep the gesture recognizer loaded only while it is useful: preload it
+        in the background shortly before a gesture exercise and release it
+        once no remaining exercise needs it.
+        """
+        remaining = self.exercises[exercise_index:]
+        if not any(exercise.get("gesture_required", False) for exercise in remaining):
+            self.detector.release_hand_recognizer()
+            return
+        
+        upcoming = remaining[:settings.GESTURE_PRELOAD_AHEAD + 1]
+        if any(exercise.get("gesture_required", False) for exercise in upcoming):
+            self.detector.preload_hand_recognizer()
 
-    def run_exercise(self, cap, exercise, assessment_phase="affected"):
+    def run_exercise(self, source, exercise, assessment_phase="affected"):
         """Run a single exercise and handle its results"""
-        start_time = time.time()
-        best_score = 0
-        stabilization_frames = 0
+        start_time = self.clock.time()
         
         # Set the current side in the evaluator and load the exercise
         self.evaluator.set_assessment_side(assessment_phase)
         self.evaluator.set_current_exercise(exercise)
+        if self.recorder:
+            self.recorder.begin_segment(exercise['id'], assessment_phase, self.evaluator.get_actual_side())
+        if self.profiler:
+            self.profiler.begin_exercise(exercise['id'], assessment_phase)
         
         # Read exercise configuration
         exercise_duration = exercise.get("duration", 30)
-        required_stable_frames = exercise.get("required_stable_frames", 30) 
+        score_tracker = ScoreTracker.for_exercise(exercise)
         
-        while time.time() - start_time < exercise_duration and best_score < exercise.get("max_score", 2):
-            # Calculate remaining time
-            remaining_time = int(exercise_duration - (time.time() - start_time))
-            
-            # Read frame
-            ret, frame = cap.read()
-            if not ret:
-                break
+        frame = None
+        frame_counter.reset()
+        instrumentation.reset()
+        self._reset_inference_state()
+        dropped_at_start = self._source_dropped(source)
+        headless = self.interface is None
+        
+        pipeline = None
+        if settings.PIPELINE_ENABLED:
+            pipeline = FramePipeline(
+                source,
+                lambda frame, timestamp_ms: self._infer_frame(frame, exercise, timestamp_ms),
+                capture_queue_size=settings.PIPELINE_CAPTURE_QUEUE_SIZE,
+                render_queue_size=settings.PIPELINE_RENDER_QUEUE_SIZE
+            )
+            pipeline.start()
+        
+        try:
+            while (self.clock.time() - start_time < exercise_duration
+                   and score_tracker.best_score < exercise.get("max_score", 2)):
+                # Calculate remaining time
+                remaining_time = int(exercise_duration - (self.clock.time() - start_time))
+                frame_start = instrumentation.time()
                 
-            # Process the frame with pose detection
-            
-            rgb_frame, detection_result = self.detector.process_frame(frame, detect_gestures=exercise.get("gesture_required", False))
-            annotated_frame = draw_landmarks(rgb_frame, detection_result)
-            
-            # Convert back to BGR 
-            annotated_frame = cv2.cvtColor(annotated_frame, cv2.COLOR_RGB2BGR)
-
-            # Evaluate the pose
-            score = self.evaluator.evaluate_exercise(exercise, detection_result)
-            metrics = self.evaluator.get_last_metrics()
-            
-            # Track best score and if they achieve it, we can stop the exercise
-            if score is not None:
-                if score >= best_score:
-                    stabilization_frames += 1
-                    if stabilization_frames >= required_stable_frames:
-                        best_score = score
+                if pipeline:
+                    # Take the newest inference result, the capture and
+                    # inference threads keep running in the background
+                    item = pipeline.get_result()
+                    if item is None:
+                        if pipeline.finished:
+                            break
+                        # Keep the window responsive while the model is busy
+                        if not headless and cv2.waitKey(1) & 0xFF == 27:
+                            return False
+                        continue
+                    frame, (landmark_frame, score, metrics) = item
                 else:
-                    stabilization_frames = 0
-            
-            # Create split screen view
-            split_screen = self.interface.create_split_screen(
-                annotated_frame, 
-                exercise, 
-                self.evaluator, 
-                metrics,
-                time_remaining=remaining_time
-            )
-            self.interface.display(split_screen)
-            
-            # Handle keyboard input
-            key = cv2.waitKey(1) & 0xFF
-            if key == 27:  # ESC key
-                return False
+                    # Read the next frame, handing the previous one back for reuse
+                    capture_start = instrumentation.time()
+                    ret, frame, timestamp_ms = source.read(frame)
+                    instrumentation.add("capture", capture_start)
+                    if not ret:
+                        break
+                    landmark_frame, score, metrics = self._infer_frame(frame, exercise, timestamp_ms)
+                
+                # Track best score and if they achieve it, we can stop the exercise
+                score_tracker.update(score, self.clock.time())
+                instrumentation.next_frame(landmark_frame is not None)
+                
+                if headless:
+                    frame_counter.next_frame()
+                elif self.governor.due("display", self.clock.time()):
+                    render_start = instrumentation.time()
+                    keep_going = self._render_frame(frame, landmark_frame, exercise, metrics, remaining_time)
+                    instrumentation.add("render", render_start)
+                    if not keep_going:
+                        return False
+                instrumentation.add("frame", frame_start)
+        finally:
+            self._print_throughput(frame_counter.frames, self.clock.time() - start_time)
+            self.results_manager.add_model_tier(exercise['id'], self.detector.model_tier, assessment_phase)
+            self.frame_buffer_stats[(exercise['id'], assessment_phase)] = frame_counter.get_stats()
+            self._print_frame_buffer_stats(frame_counter.get_stats())
+            dropped_frames = self._source_dropped(source) - dropped_at_start
+            if pipeline:
+                pipeline.stop()
+                self.pipeline_stats[(exercise['id'], assessment_phase)] = pipeline.get_stats()
+                self._print_pipeline_stats(pipeline.get_stats())
+                dropped_frames += sum(stage["dropped"] for stage in pipeline.get_stats().values())
+            self.results_manager.add_frame_rates(exercise['id'], self.governor.summary(), assessment_phase)
+            if instrumentation.enabled:
+                self.results_manager.add_performance(
+                    exercise['id'], instrumentation.summary(dropped_frames), assessment_phase)
+            # After the pipeline stopped, so no inference result is still on its way
+            if self.recorder:
+                self.recorder.end_segment()
+            if self.profiler:
+                self.profiler.end_exercise()
         
         # If exercise completed successfully, save the score
+        best_score = score_tracker.best_score
         if best_score > 0:
             max_score = exercise.get("max_score", 2)
             self.results_manager.add_exercise_score(exercise['id'], best_score, max_score, assessment_phase)
             print(f"Exercise {exercise['id']} ({assessment_phase} side) completed with score: {best_score}")
             
         return True
+    
+    def _infer_frame(self, frame, exercise, timestamp_ms=None):
+        """
+        Inference stage: pose (and gesture) detection followed by evaluation,
+        each at the rate the governor allows. Frames without pose inference
+        return the last landmarks and metrics and no score.
+        """
+        governor = self.governor
+        now = self.clock.time()
+        governor.frame(now)
+        if not governor.due("pose", now):
+            return self._reuse_landmarks(timestamp_ms), None, self._last_metrics
+        
+        gesture_required = exercise.get("gesture_required", False)
+        detect_gestures = gesture_required and governor.due("gesture", now)
+        _, landmark_frame = self.detector.process_frame(
+            frame,
+            detect_gestures=detect_gestures,
+            timestamp_ms=timestamp_ms,
+            hand_side=self.evaluator.get_actual_side()
+        )
+        if gesture_required and landmark_frame is not None:
+            self._carry_hands(landmark_frame, detect_gestures)
+        if governor.limited:
+            self._previous_landmarks, self._last_landmarks = self._last_landmarks, landmark_frame
+        
+        # Evaluate the pose
+        score = None
+        metrics = self._last_metrics
+        if governor.due("evaluate", now):
+            evaluate_start = instrumentation.time()
+            score = self.evaluator.evaluate_exercise(exercise, landmark_frame)
+            metrics = self._last_metrics = self.evaluator.get_last_metrics()
+            instrumentation.add("evaluate", evaluate_start)
+        if self.recorder:
+            self.recorder.record(landmark_frame, time.monotonic() * 1000 if timestamp_ms is None else timestamp_ms,
+                                 score, metrics)
+        return landmark_frame, score, metrics
+    
+    def _reset_inference_state(self):
+        self.governor.reset()
+        # Latest inference results, shown on the frames in between
+        self._previous_landmarks = self._last_landmarks = None
+        self._last_hands = None
+        self._last_metrics = {}
+    
+    def _carry_hands(self, landmark_frame, detected):
+        """Keep the newest hand landmarks and gestures on frames where gesture recognition did not run"""
+        if detected:
+            self._last_hands = landmark_frame
+        elif self._last_hands is not None:
+            last = self._last_hands
+            landmark_frame.hands = last.hands
+            landmark_frame.set_gesture("right", last.right_gesture, last.right_gesture_score)
+            landmark_frame.set_gesture("left", last.left_gesture, last.left_gesture_score)
+    
+    def _reuse_landmarks(self, timestamp_ms):
+        """Landmarks shown on a frame without pose inference"""
+        if not settings.FRAME_RATE_EXTRAPOLATE:
+            return self._last_landmarks
+        timestamp = time.monotonic() if timestamp_ms is None else timestamp_ms / 1000
+        return extrapolate_landmarks(self._previous_landmarks, self._last_landmarks, timestamp)
+    
+    def _render_frame(self, frame, landmark_frame, exercise, metrics, remaining_time):
+        """Render stage: returns False when the user asked to skip the exercise"""
+        canvas, camera_view = self.interface.get_canvas(settings.CAMERA_HEIGHT, settings.CAMERA_WIDTH)
+        
+        # One copy of the BGR camera frame into the display buffer. Frames of
+        # another size are scaled on the way, and frames of another aspect
+        # ratio (e.g. 16:9 video files) are letterboxed rather than stretched.
+        if frame.shape[:2] == camera_view.shape[:2]:
+            view = camera_view
+            np.copyto(view, frame)
+        else:
+            x0, y0, x1, y1 = letterbox_region(frame.shape[1], frame.shape[0],
+                                              settings.CAMERA_WIDTH, settings.CAMERA_HEIGHT)
+            view = camera_view[y0:y1, x0:x1]
+            camera_view[:y0] = 0
+            camera_view[y1:] = 0
+            camera_view[y0:y1, :x0] = 0
+            camera_view[y0:y1, x1:] = 0
+            cv2.resize(frame, (x1 - x0, y1 - y0), dst=view, interpolation=cv2.INTER_AREA)
+        frame_counter.count_copy(camera_view.nbytes)
+        
+        # Annotations are drawn directly into the display buffer
+        draw_landmarks(view, landmark_frame, in_place=True,
+                       style=settings.LANDMARK_STYLE, side=self.evaluator.get_actual_side())
+        self.interface.draw_panels(
+            canvas, 
+            exercise, 
+            self.evaluator, 
+            metrics,
+            time_remaining=remaining_time
+        )
+        self.interface.display(canvas)
+        frame_counter.next_frame()
+        
+        # Handle keyboard input
+        key = cv2.waitKey(1) & 0xFF
+        return key != 27  # ESC key
+    
+    def _source_dropped(self, source):
+        """Frames the source dropped so far (live sources keep only the freshest)"""
+        get_stats = getattr(source, "get_stats", None)
+        return get_stats().get("dropped", 0) if get_stats else 0
+    
+    def _print_throughput(self, frames, elapsed):
+        fps = frames / elapsed if elapsed > 0 else 0
+        print(f"Processed {frames} frames in {elapsed:.1f}s ({fps:.1f} fps)")
+    
+    def _print_frame_buffer_stats(self, stats):
+        print(f"Frame buffers - {stats['allocations_per_frame']:.2f} allocations, "
+              f"{stats['copies_per_frame']:.2f} copies per frame over {stats['frames']} frames")
+    
+    def _print_pipeline_stats(self, stats):
+        summary = ", ".join(f"{stage}: {values['frames']} frames / {values['dropped']} dropped"
+                            for stage, values in stats.items())
+        print(f"Pipeline stats - {summary}")
         
     def get_current_exercise(self):
         if not self.exercises or self.current_exercise_index >= len(self.exercises):
@@ -0,0 +1,229 @@
+import contextlib
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from src.config import settings
+from src.utils.workers import adaptive_worker_count
+
+# State of a worker process, set up once by _init_worker
+_worker = None
+
+
+def load_manifest(path):
+    """
+    Read the videos to score from a JSON or CSV manifest. Returns a list of
+    jobs ({"id", "video", "affected_side", "segments"}), or None when the
+    manifest is invalid.
+
+    JSON: {"videos": [{"video": "p001.mp4", "affected_side": "left",
+    "id": "p001", "segments": [{"exercise": "a_2_flexor", "phase":
+    "affected", "start": 12.0, "end": 40.5}, ...]}, ...]}. id and segments
+    are optional; without segments the exercises follow each other through
+    the video as in a live session. CSV: columns video, affected_side and
+    optionally id.
+    """
+    try:
+        with open(path, newline="") as f:
+            if path.lower().endswith(".csv"):
+                entries = list(csv.DictReader(f))
+            else:
+                entries = json.load(f)
+                entries = entries.get("videos", []) if isinstance(entries, dict) else entries
+    except (OSError, ValueError) as e:
+        print(f"Could not read manifest {path}: {e}")
+        return None
+
+    base_directory = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    for number, entry in enumerate(entries, 1):
+        video = entry.get("video")
+        affected_side = entry.get("affected_side")
+        if not video or affected_side not in ("left", "right"):
+            print(f"Manifest entry {number} needs a video and an affected_side of left or right")
+            return None
+        segments = entry.get("segments") or []
+        for segment in segments:
+            if not {"exercise", "phase", "start", "end"} <= segment.keys() or \
+                    segment["phase"] not in ("affected", "unaffected"):
+                print(f"Manifest entry {number} has an invalid segment: {segment}")
+                return None
+        jobs.append({
+            "id": entry.get("id") or os.path.splitext(os.path.basename(video))[0],
+            # Relative paths are relative to the manifest
+            "video": os.path.join(base_directory, video),
+            "affected_side": affected_side,
+            "segments": segments
+        })
+
+    ids = [job["id"] for job in jobs]
+    duplicates = sorted({job_id for job_id in ids if ids.count(job_id) > 1})
+    if duplicates:
+        print(f"Duplicate job ids in manifest: {', '.join(duplicates)}")
+        return None
+    return jobs
+
+
+class CompletedJobsLedger:
+    """
+    Append-only record of finished jobs (one JSON line each), so an
+    interrupted batch resumes where it stopped. Only the parent process
+    writes to it. Failed jobs are recorded too but run again on resume.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # A line cut short by an interruption
+                    self.entries[entry["id"]] = entry
+
+    def is_completed(self, job_id):
+        return self.entries.get(job_id, {}).get("status") == "ok"
+
+    def record(self, entry):
+        self.entries[entry["id"]] = entry
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _init_worker():
+    """Load the pose model and the exercises once per worker process"""
+    global _worker
+    # Imported here so the parent process never loads MediaPipe
+    from src.core.assessment_session import FuglMeyerAssessment
+    from src.utils.clock import ReplayClock
+
+    clock = ReplayClock()
+    assessment = FuglMeyerAssessment(clock=clock)
+    if not assessment.initialize():
+        print(f"Worker {os.getpid()} could not initialize the assessment")
+        return
+    _worker = (assessment, list(assessment.exercises), clock)
+
+
+def score_video(job, output_directory):
+    """Score one video in a worker process, returns its summary row"""
+    start = time.perf_counter()
+    row = {"id": job["id"], "video": job["video"], "status": "failed", "report": None}
+    log_path = os.path.join(output_directory, f"{job['id']}.log")
+    with open(log_path, "w") as log, contextlib.redirect_stdout(log):
+        try:
+            if _worker is None:
+                raise RuntimeError("the worker could not load the pose model")
+            report_path = os.path.join(output_directory, f"{job['id']}.json")
+            row.update(_score_video(job, report_path), status="ok", report=report_path)
+        except Exception as e:
+            row["error"] = str(e)
+            print(f"Scoring failed: {e}")
+    row["seconds"] = round(time.perf_counter() - start, 2)
+    return row
+
+
+def _score_video(job, report_path):
+    from src.core.frame_sources import ClockedSource, VideoFileSource
+    from src.core.pose_evaluator import PoseEvaluator
+    from src.core.results_manager import ResultsManager
+
+    assessment, exercises, clock = _worker
+    video = VideoFileSource(job["video"])
+    if not video.open():
+        raise RuntimeError(f"could not open {job['video']}")
+    non_affected_side = "right" if job["affected_side"] == "left" else "left"
+    evaluator = PoseEvaluator(non_affected_side, clock)
+    results = ResultsManager()
+    assessment.set_components(None, evaluator, results)
+    assessment.results = {"affected": {}, "unaffected": {}}
+    assessment.detector.reset_stream()
+
+    try:
+        if not job["segments"]:
+            assessment.exercises = exercises
+            assessment.run_assessment(ClockedSource(video, clock))
+        else:
+            exercises_by_id = {exercise["id"]: exercise for exercise in exercises}
+            position_ms = 0.0
+            for segment in job["segments"]:
+                exercise = exercises_by_id.get(segment["exercise"])
+                if exercise is None:
+                    raise ValueError(f"unknown exercise {segment['exercise']}")
+                start_frame = int(segment["start"] * video.fps)
+                start_ms = start_frame * 1000 / video.fps
+                # VIDEO mode needs increasing timestamps, so a segment earlier
+                # in the video starts a new stream
+                if start_ms < position_ms:
+                    assessment.detector.reset_stream()
+                position_ms = segment["end"] * 1000
+                video.seek(start_frame)
+                assessment.exercises = [exercise]
+                if exercise.get("gesture_required", False):
+                    assessment.detector.load_hand_recognizer()
+                # Every segment starts the exercise afresh
+                if evaluator.current_exercise is not None:
+                    evaluator.reset_current_exercise()
+                assessment.run_exercise(ClockedSource(video, clock, start_ms, segment["end"] * 1000),
+                                        exercise, segment["phase"])
+            assessment.detector.release_hand_recognizer()
+    finally:
+        video.release()
+
+    results.save_report(report_path)
+    report = results.generate_report()
+    return {
+        "affected_total": sum(report["affected_side_scores"].values()),
+        "unaffected_total": sum(report["unaffected_side_scores"].values()),
+        "max_score": report["max_score"]
+    }
+
+
+def run_batch(jobs, output_directory, workers=None, resume=True):
+    """
+    Score the jobs on a process pool, writing a report and a log per video to
+    output_directory. Returns the summary rows of all jobs, including those
+    completed by an earlier run when resuming.
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    ledger_path = os.path.join(output_directory, settings.BATCH_LEDGER_NAME)
+    if not resume and os.path.exists(ledger_path):
+        os.remove(ledger_path)
+    ledger = CompletedJobsLedger(ledger_path)
+
+    pending = [job for job in jobs if not ledger.is_completed(job["id"])]
+    print(f"{len(jobs) - len(pending)} of {len(jobs)} videos already scored")
+    if pending:
+        worker_count = adaptive_worker_count(len(pending), settings.BATCH_WORKER_MEMORY_MB, workers)
+        print(f"Scoring {len(pending)} videos with {worker_count} worker processes")
+        # Spawned workers do not inherit MediaPipe state from the parent
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(worker_count, mp_context=context, initializer=_init_worker) as pool:
+            futures = {pool.submit(score_video, job, output_directory): job for job in pending}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    row = future.result()
+                    ledger.record(row)
+                    print(f"[{done}/{len(pending)}] {row['id']}: {row['status']} ({row['seconds']}s)")
+            except BrokenProcessPool as e:
+                print(f"A worker process died ({e}); run the batch again to resume")
+
+    return [ledger.entries[job["id"]] for job in jobs if job["id"] in ledger.entries]
+
+
+def write_summary(rows, path):
+    """Summary table of a batch as CSV"""
+    columns = ["id", "status", "affected_total", "unaffected_total", "max_score", "seconds", "report", "video",
+               "error"]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
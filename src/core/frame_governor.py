@@ -0,0 +1,105 @@
+import threading
+
+from src.config import settings
+
+# Stages whose rate the governor controls
+STAGES = ("display", "pose", "gesture", "evaluate")
+
+# A stage may run this fraction of its interval early, so frame timing
+# jitter does not skip a frame that is only just ahead of schedule
+EARLY_FRACTION = 0.2
+
+
+class FrameRateGovernor:
+    """
+    Decides per frame which stages run, so display, pose inference, gesture
+    inference and evaluation each keep their own target rate (frames per
+    second, None for every frame). Each stage follows a fixed schedule from
+    its first run; a stage that fell more than an interval behind starts a new
+    schedule instead of catching up. Counts the frames and the runs of every
+    stage for the achieved rates.
+    """
+    def __init__(self, rates=None):
+        rates = rates or {}
+        unknown = set(rates) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown frame rate stages: {', '.join(sorted(unknown))}")
+        self.rates = {stage: rates.get(stage) for stage in STAGES}
+        self.intervals = {stage: 1.0 / rate if rate else 0.0 for stage, rate in self.rates.items()}
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_preset(cls, name=None):
+        """Governor with the rates of a preset in settings.FRAME_RATE_PRESETS"""
+        name = name or settings.FRAME_RATE_PRESET
+        if name not in settings.FRAME_RATE_PRESETS:
+            raise ValueError(f"frame rate preset must be one of {', '.join(settings.FRAME_RATE_PRESETS)}")
+        return cls(settings.FRAME_RATE_PRESETS[name])
+
+    @property
+    def limited(self):
+        """Whether any stage runs below the frame rate"""
+        return any(self.intervals.values())
+
+    def reset(self):
+        with self._lock:
+            self._next_due = dict.fromkeys(STAGES)
+            self.counts = dict.fromkeys(STAGES, 0)
+            self.frames = 0
+            self._first = None
+            self._last = None
+
+    def frame(self, now):
+        """Count a frame arriving at clock time now (seconds)"""
+        with self._lock:
+            self.frames += 1
+            if self._first is None:
+                self._first = now
+            self._last = now
+
+    def due(self, stage, now):
+        """Whether the stage runs on the frame at clock time now; a True answer counts as a run"""
+        interval = self.intervals[stage]
+        with self._lock:
+            if interval:
+                next_due = self._next_due[stage]
+                if next_due is not None and now < next_due - interval * EARLY_FRACTION:
+                    return False
+                if next_due is None or now - next_due > interval:
+                    next_due = now
+                self._next_due[stage] = next_due + interval
+            self.counts[stage] += 1
+            return True
+
+    def summary(self):
+        """Target and achieved rates of the stages since the last reset"""
+        with self._lock:
+            elapsed = (self._last - self._first) if self.frames > 1 else 0.0
+            rate = lambda count: round(count / elapsed, 1) if elapsed > 0 else None
+            return {
+                "frames": self.frames,
+                "frame_rate": rate(self.frames),
+                "target": dict(self.rates),
+                "achieved": {stage: rate(count) for stage, count in self.counts.items()}
+            }
+
+
+def extrapolate_landmarks(previous, last, timestamp, max_ms=None):
+    """
+    LandmarkFrame with the pose of `last` moved on linearly to `timestamp`
+    (seconds), at the velocity between `previous` and `last`. Looks at most
+    max_ms ahead; returns `last` itself when there is nothing to extrapolate.
+    """
+    if max_ms is None:
+        max_ms = settings.FRAME_RATE_EXTRAPOLATION_MAX_MS
+    if previous is None or last is None:
+        return last
+    step = last.timestamp - previous.timestamp
+    ahead = min(timestamp - last.timestamp, max_ms / 1000)
+    if step <= 0 or ahead <= 0:
+        return last
+    landmark_frame = last.copy()
+    landmark_frame.pose[:, :3] += (last.pose[:, :3] - previous.pose[:, :3]) * (ahead / step)
+    landmark_frame.timestamp = timestamp
+    return landmark_frame
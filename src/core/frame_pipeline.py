@@ -0,0 +1,142 @@
+import threading
+from collections import deque
+from src.utils.instrumentation import instrumentation
+
+
+class DropOldestQueue:
+    """
+    Bounded FIFO queue shared between two pipeline stages.
+    When the queue is full, put() discards the oldest item instead of blocking
+    the producer, so the consumer always works on the freshest data.
+    """
+    def __init__(self, maxsize=1):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.put_count = 0
+        self.dropped = 0
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def put(self, item):
+        with self._condition:
+            if self._closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.put_count += 1
+            self._condition.notify()
+            return True
+
+    def get(self, timeout=None):
+        """Return the oldest queued item, or None on timeout or once closed and drained"""
+        with self._condition:
+            if not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self):
+        with self._condition:
+            return self._closed and not self._items
+
+
+class FramePipeline:
+    """
+    Capture -> inference -> render pipeline.
+
+    The capture thread reads from the frame source as fast as it delivers
+    frames and only keeps the newest one. The inference thread runs
+    `infer(frame, timestamp_ms)` on the latest captured frame. Results are handed to the render stage (the caller,
+    which must stay on the main thread for OpenCV's HighGUI) through a small
+    drop-oldest queue, so rendering never waits on a slow model.
+    """
+    def __init__(self, source, infer, capture_queue_size=1, render_queue_size=2):
+        self.source = source
+        self.infer = infer
+        self.capture_queue = DropOldestQueue(capture_queue_size)
+        self.render_queue = DropOldestQueue(render_queue_size)
+        self.rendered = 0
+        self.error = None
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def start(self):
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="fma-capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="fma-inference", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self.capture_queue.close()
+        self.render_queue.close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+    def get_result(self, timeout=0.1):
+        """
+        Return the next (frame, inference_result) pair for rendering.
+        Returns None if nothing arrived within the timeout; check `finished`
+        to tell a slow model apart from the end of the stream.
+        """
+        item = self.render_queue.get(timeout)
+        if item is not None:
+            self.rendered += 1
+        return item
+
+    @property
+    def finished(self):
+        return self.render_queue.closed
+
+    def _capture_loop(self):
+        try:
+            while not self._stop_event.is_set():
+                capture_start = instrumentation.time()
+                ret, frame, timestamp_ms = self.source.read()
+                instrumentation.add("capture", capture_start)
+                if not ret:
+                    break
+                self.capture_queue.put((frame, timestamp_ms))
+        except Exception as e:
+            self.error = e
+            print(f"Capture stage failed: {e}")
+        finally:
+            self.capture_queue.close()
+
+    def _inference_loop(self):
+        try:
+            while not self._stop_event.is_set():
+                item = self.capture_queue.get(timeout=0.1)
+                if item is None:
+                    if self.capture_queue.closed:
+                        break
+                    continue
+                frame, timestamp_ms = item
+                self.render_queue.put((frame, self.infer(frame, timestamp_ms)))
+        except Exception as e:
+            self.error = e
+            print(f"Inference stage failed: {e}")
+        finally:
+            self.render_queue.close()
+
+    def get_stats(self):
+        """Frames handled and dropped by each stage"""
+        return {
+            "capture": {"frames": self.capture_queue.put_count, "dropped": 0},
+            "inference": {"frames": self.render_queue.put_count, "dropped": self.capture_queue.dropped},
+            "render": {"frames": self.rendered, "dropped": self.render_queue.dropped}
+        }
@@ -0,0 +1,410 @@
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from src.config import settings
+from src.utils.frame_buffers import frame_counter
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+# How long release() and seek() wait for the decode thread to finish its read
+DECODE_STOP_TIMEOUT_S = 2.0
+
+
+class PrefetchBuffer:
+    """
+    Bounded buffer between a decode thread and the consumer.
+
+    Decoded frames wait in at most `maxsize` slots. When the buffer is full,
+    put() either blocks (file sources, where every frame counts) or drops the
+    oldest frame (live sources, where freshness counts). Frame buffers the
+    consumer is done with are recycled for decoding.
+    """
+    def __init__(self, maxsize, drop_oldest=False):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.drop_oldest = drop_oldest
+        self.dropped = 0
+        self._frames = deque()
+        self._free = []
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def take_free(self):
+        """A recycled frame buffer to decode into, or None"""
+        with self._condition:
+            return self._free.pop() if self._free else None
+
+    def recycle(self, frame):
+        with self._condition:
+            if len(self._free) <= self.maxsize:
+                self._free.append(frame)
+
+    def put(self, frame, timestamp_ms):
+        """Queue a decoded frame, returns False once the buffer is closed"""
+        with self._condition:
+            while len(self._frames) >= self.maxsize and not self.drop_oldest and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                return False
+            if len(self._frames) >= self.maxsize:
+                dropped_frame, _ = self._frames.popleft()
+                self._free.append(dropped_frame)
+                self.dropped += 1
+            self._frames.append((frame, timestamp_ms))
+            self._condition.notify_all()
+            return True
+
+    def get(self):
+        """Next (frame, timestamp_ms), or None once closed and drained"""
+        with self._condition:
+            while not self._frames and not self._closed:
+                self._condition.wait()
+            if not self._frames:
+                return None
+            item = self._frames.popleft()
+            self._condition.notify_all()
+            return item
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class FrameSource:
+    """
+    Base class of the frame sources.
+
+    read() returns (ok, frame, timestamp_ms), where timestamp_ms is the
+    capture time of the BGR frame in milliseconds: the clock time for live
+    sources, the position in the stream for recorded ones. Passing the
+    previous frame to read() hands its buffer back for reuse, so a steady
+    loop does not allocate a frame per read.
+
+    With prefetch > 0 a background thread decodes up to `prefetch` frames
+    ahead. With realtime, read() paces recorded frames to their timestamps
+    instead of returning them as fast as they decode.
+
+    Subclasses implement _open(), _grab(buffer) and _close().
+    """
+    def __init__(self, prefetch=0, drop_oldest=False, realtime=False):
+        self.prefetch = prefetch
+        self.drop_oldest = drop_oldest
+        self.realtime = realtime
+        self._opened = False
+        self._buffer = None
+        self._decode_thread = None
+        self._pace_origin_ms = None
+        # Set when release() left the close to a decode thread still inside a read
+        self._close_pending = False
+        self._close_lock = threading.Lock()
+
+    def open(self):
+        if self._close_pending:
+            print("Frame source is still closing, a read did not return")
+            return False
+        if not self._open():
+            return False
+        self._opened = True
+        self._start_prefetch()
+        return True
+
+    def isOpened(self):
+        return self._opened
+
+    def read(self, recycle=None):
+        if not self._opened:
+            return False, None, None
+        if self._buffer is None:
+            ok, frame, timestamp_ms = self._grab(recycle)
+            if not ok:
+                return False, None, None
+        else:
+            if recycle is not None:
+                self._buffer.recycle(recycle)
+            item = self._buffer.get()
+            if item is None:
+                return False, None, None
+            frame, timestamp_ms = item
+        if self.realtime:
+            self._pace(timestamp_ms)
+        return True, frame, timestamp_ms
+
+    def release(self):
+        self._stop_prefetch()
+        with self._close_lock:
+            if not self._opened:
+                return
+            self._opened = False
+            if self._decode_thread is not None and self._decode_thread.is_alive():
+                # Closing the capture under a read can crash it, so the decode
+                # thread closes it once the read returns
+                print("Frame decoding did not stop in time, closing the source after the current read")
+                self._close_pending = True
+            else:
+                self._close()
+
+    def get_stats(self):
+        return {"dropped": self._buffer.dropped if self._buffer is not None else 0}
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _grab(self, buffer):
+        """Decode the next frame, into `buffer` when possible: returns (ok, frame, timestamp_ms)"""
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def _pace(self, timestamp_ms):
+        now_ms = time.perf_counter() * 1000
+        if self._pace_origin_ms is None:
+            self._pace_origin_ms = now_ms - timestamp_ms
+            return
+        delay_ms = self._pace_origin_ms + timestamp_ms - now_ms
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def _start_prefetch(self):
+        if self.prefetch <= 0:
+            return
+        self._buffer = PrefetchBuffer(self.prefetch, self.drop_oldest)
+        self._decode_thread = threading.Thread(target=self._decode_loop, name="fma-decode", daemon=True)
+        self._decode_thread.start()
+
+    def _stop_prefetch(self):
+        """Stop decoding ahead, returns False if the decode thread is still inside a read"""
+        if self._buffer is not None:
+            self._buffer.close()
+        self._buffer = None
+        if self._decode_thread is not None:
+            self._decode_thread.join(timeout=DECODE_STOP_TIMEOUT_S)
+            if self._decode_thread.is_alive():
+                return False
+        self._decode_thread = None
+        return True
+
+    def _decode_loop(self):
+        buffer = self._buffer
+        try:
+            while True:
+                ok, frame, timestamp_ms = self._grab(buffer.take_free())
+                if not ok or not buffer.put(frame, timestamp_ms):
+                    break
+        except Exception as e:
+            print(f"Frame decoding failed: {e}")
+        finally:
+            buffer.close()
+            with self._close_lock:
+                if self._close_pending:
+                    self._close_pending = False
+                    self._close()
+
+
+def _read_capture(cap, buffer):
+    """cv2.VideoCapture.read into `buffer` when given, counting new allocations"""
+    ok, frame = cap.read(buffer) if buffer is not None else cap.read()
+    if ok and frame is not buffer:
+        frame_counter.count_allocation(frame.nbytes)
+    return ok, frame
+
+
+class WebcamSource(FrameSource):
+    """Live camera, timestamped with the monotonic clock when each frame arrives"""
+    def __init__(self, camera_id=settings.CAMERA_ID, width=settings.CAPTURE_WIDTH,
+                 height=settings.CAPTURE_HEIGHT, fps=settings.CAMERA_FPS,
+                 buffer_size=settings.CAMERA_BUFFER_SIZE, prefetch=settings.CAMERA_PREFETCH_FRAMES):
+        # A live source keeps only the freshest frames
+        super().__init__(prefetch=prefetch, drop_oldest=True)
+        self.camera_id = camera_id
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.buffer_size = buffer_size
+        self.cap = None
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.camera_id)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)  # Minimize driver-side latency
+        return self.cap.isOpened()
+
+    def _grab(self, buffer):
+        ok, frame = _read_capture(self.cap, buffer)
+        return ok, frame, time.monotonic() * 1000
+
+    def _close(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Recorded video, timestamped by frame position. Supports seeking."""
+    def __init__(self, path, realtime=False, prefetch=settings.FRAME_PREFETCH_SIZE):
+        super().__init__(prefetch=prefetch, realtime=realtime)
+        self.path = path
+        self.cap = None
+        self.fps = None
+        self.frame_count = 0
+        self._next_index = 0
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            return False
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or settings.CAMERA_FPS
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        return True
+
+    def _grab(self, buffer):
+        ok, frame = _read_capture(self.cap, buffer)
+        timestamp_ms = self._next_index * 1000 / self.fps
+        self._next_index += 1
+        return ok, frame, timestamp_ms
+
+    def seek(self, frame_index):
+        """Continue reading at `frame_index`, discarding frames decoded ahead"""
+        if not self._opened:
+            return False
+        if not self._stop_prefetch():
+            print("Frame decoding did not stop in time, cannot seek")
+            self.release()
+            return False
+        ok = self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        self._next_index = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+        self._pace_origin_ms = None
+        self._start_prefetch()
+        return ok
+
+    def _close(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Still images of a directory in name order, played back at `fps`"""
+    def __init__(self, directory, fps=settings.CAMERA_FPS, loop=False, realtime=False,
+                 prefetch=settings.FRAME_PREFETCH_SIZE):
+        super().__init__(prefetch=prefetch, realtime=realtime)
+        self.directory = directory
+        self.fps = fps
+        self.loop = loop
+        self.paths = []
+        self._next_index = 0
+
+    def _open(self):
+        if not os.path.isdir(self.directory):
+            return False
+        self.paths = sorted(os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        return bool(self.paths)
+
+    def _grab(self, buffer):
+        while self.loop or self._next_index < len(self.paths):
+            path = self.paths[self._next_index % len(self.paths)]
+            timestamp_ms = self._next_index * 1000 / self.fps
+            self._next_index += 1
+            # imread cannot decode into an existing buffer
+            frame = cv2.imread(path)
+            if frame is None:
+                print(f"Could not read image {path}")
+                continue
+            frame_counter.count_allocation(frame.nbytes)
+            return True, frame, timestamp_ms
+        return False, None, None
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames (a disc moving over a gradient) at a given resolution,
+    for benchmarks and tests that need no camera or files. Runs forever
+    unless frame_count is given.
+    """
+    def __init__(self, width=settings.CAMERA_WIDTH, height=settings.CAMERA_HEIGHT, fps=settings.CAMERA_FPS,
+                 frame_count=None, realtime=False, prefetch=settings.FRAME_PREFETCH_SIZE):
+        super().__init__(prefetch=prefetch, realtime=realtime)
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_count = frame_count
+        self._background = None
+        self._next_index = 0
+
+    def _open(self):
+        gradient = np.linspace(32, 160, self.width, dtype=np.uint8)
+        self._background = np.repeat(gradient[np.newaxis, :, np.newaxis], 3, axis=2)
+        return True
+
+    def _grab(self, buffer):
+        if self.frame_count is not None and self._next_index >= self.frame_count:
+            return False, None, None
+        if buffer is None or buffer.shape != (self.height, self.width, 3):
+            buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            frame_counter.count_allocation(buffer.nbytes)
+        index = self._next_index
+        self._next_index += 1
+        buffer[:] = self._background
+        radius = max(self.height // 10, 1)
+        x = radius + index * 4 % max(self.width - 2 * radius, 1)
+        cv2.circle(buffer, (x, self.height // 2), radius, (255, 255, 255), -1)
+        return True, buffer, index * 1000 / self.fps
+
+
+class ClockedSource:
+    """
+    Wraps a recorded frame source so a replay clock follows its timestamps,
+    and optionally ends the stream at end_ms. Exercise timing then runs on
+    video time however fast the frames decode. After each read the clock
+    stands at the end of that frame's interval, so an exercise of d seconds
+    takes exactly d * fps frames and the next one starts on the following
+    frame. The clock starts at start_ms, the timestamp of the first frame the
+    source will return, so an exercise that starts before the first read is
+    timed from there and not from wherever an earlier video or segment left
+    the clock.
+    """
+    def __init__(self, source, clock, start_ms=0.0, end_ms=None):
+        self.source = source
+        self.clock = clock
+        self.end_ms = end_ms
+        self.frame_ms = 1000 / source.fps
+        clock.set_ms(start_ms)
+
+    def read(self, recycle=None):
+        ok, frame, timestamp_ms = self.source.read(recycle)
+        if not ok or (self.end_ms is not None and timestamp_ms >= self.end_ms):
+            return False, None, None
+        self.clock.set_ms(timestamp_ms + self.frame_ms)
+        return ok, frame, timestamp_ms
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def release(self):
+        self.source.release()
+
+
+def open_frame_source(spec, realtime=False):
+    """
+    Open a frame source from a command-line style spec: a camera index, a
+    video file, a directory of images, or "synthetic[:WIDTHxHEIGHT]".
+    Returns None when it cannot be opened.
+    """
+    spec = str(spec)
+    if spec.isdigit():
+        source = WebcamSource(int(spec))
+    elif spec.startswith("synthetic"):
+        width, height = settings.CAMERA_WIDTH, settings.CAMERA_HEIGHT
+        if ":" in spec:
+            width, height = (int(value) for value in spec.split(":", 1)[1].lower().split("x"))
+        source = SyntheticSource(width, height, realtime=realtime)
+    elif os.path.isdir(spec):
+        source = ImageDirectorySource(spec, realtime=realtime)
+    else:
+        source = VideoFileSource(spec, realtime=realtime)
+    return source if source.open() else None
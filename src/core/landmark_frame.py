@@ -0,0 +1,83 @@
+import time
+import numpy as np
+
+NUM_POSE_LANDMARKS = 33
+NUM_HAND_LANDMARKS = 21
+
+# Column order of LandmarkFrame.pose
+X, Y, Z, VISIBILITY = range(4)
+
+# Row order of LandmarkFrame.hands
+HAND_SIDES = ("right", "left")
+
+
+class LandmarkFrame:
+    """
+    Landmarks of a single frame in one compact layout.
+
+    pose: (33, 4) float32 array of x, y, z, visibility in normalized image
+        coordinates.
+    hands: (2, 21, 3) float32 array of x, y, z hand landmarks, right hand
+        first (see HAND_SIDES), NaN where a hand was not found. None when
+        gesture recognition did not run on this frame.
+    right_gesture / left_gesture: gesture label of each hand, or None.
+    right_gesture_score / left_gesture_score: confidence of that label.
+    timestamp: capture time in seconds.
+    features: KinematicFeatures cache, filled on first use by
+        kinematic_features(); pose must not be modified after that.
+    """
+    __slots__ = ("pose", "hands", "right_gesture", "left_gesture",
+                 "right_gesture_score", "left_gesture_score", "timestamp", "features")
+
+    def __init__(self, pose, hands=None, right_gesture=None, left_gesture=None,
+                 right_gesture_score=0.0, left_gesture_score=0.0, timestamp=None):
+        self.pose = np.ascontiguousarray(pose, dtype=np.float32)
+        if self.pose.shape != (NUM_POSE_LANDMARKS, 4):
+            raise ValueError(f"pose must have shape ({NUM_POSE_LANDMARKS}, 4), got {self.pose.shape}")
+        self.hands = None if hands is None else np.ascontiguousarray(hands, dtype=np.float32)
+        self.right_gesture = right_gesture
+        self.left_gesture = left_gesture
+        self.right_gesture_score = right_gesture_score
+        self.left_gesture_score = left_gesture_score
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+        self.features = None
+
+    @classmethod
+    def from_pose_landmarks(cls, pose_landmarks, timestamp=None):
+        """Build a frame from MediaPipe NormalizedLandmark objects"""
+        pose = np.array([(landmark.x, landmark.y, landmark.z,
+                          1.0 if landmark.visibility is None else landmark.visibility)
+                         for landmark in pose_landmarks[:NUM_POSE_LANDMARKS]], dtype=np.float32)
+        return cls(pose, timestamp=timestamp)
+
+    def empty_hands(self):
+        """Start the hand array for a frame on which gesture recognition ran"""
+        self.hands = np.full((len(HAND_SIDES), NUM_HAND_LANDMARKS, 3), np.nan, dtype=np.float32)
+        return self.hands
+
+    def gesture(self, side):
+        return self.right_gesture if side == "right" else self.left_gesture
+
+    def gesture_score(self, side):
+        return self.right_gesture_score if side == "right" else self.left_gesture_score
+
+    def set_gesture(self, side, label, score):
+        if side == "right":
+            self.right_gesture, self.right_gesture_score = label, score
+        else:
+            self.left_gesture, self.left_gesture_score = label, score
+
+    def hand(self, side):
+        """(21, 3) landmarks of one hand, or None if it was not found"""
+        if self.hands is None:
+            return None
+        hand = self.hands[HAND_SIDES.index(side)]
+        return None if np.isnan(hand[0, 0]) else hand
+
+    def copy(self):
+        return LandmarkFrame(
+            self.pose.copy(),
+            None if self.hands is None else self.hands.copy(),
+            self.right_gesture, self.left_gesture,
+            self.right_gesture_score, self.left_gesture_score,
+            self.timestamp)
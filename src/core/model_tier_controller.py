@@ -0,0 +1,52 @@
+import statistics
+from collections import deque
+
+
+class ModelTierController:
+    """
+    Chooses a pose model tier from the measured inference latency.
+
+    Tiers are ordered from fastest to most accurate. Once the rolling median
+    latency exceeds the frame-time budget the controller steps down one tier;
+    when it stays below `upgrade_ratio * budget_ms` it steps up again, but not
+    within `cooldown_frames` of the last step down, so it does not oscillate
+    between a tier that is too slow and one that is just fast enough.
+    """
+    def __init__(self, tiers, initial_tier, budget_ms, window=30, upgrade_ratio=0.4, cooldown_frames=150):
+        if initial_tier not in tiers:
+            raise ValueError(f"Unknown model tier: {initial_tier}")
+        self.tiers = list(tiers)
+        self.tier = initial_tier
+        self.budget_ms = budget_ms
+        self.upgrade_ratio = upgrade_ratio
+        self.cooldown_frames = cooldown_frames
+        self._latencies = deque(maxlen=window)
+        self._frames_since_downgrade = cooldown_frames
+        self.history = [initial_tier]
+
+    def record(self, latency_ms):
+        """Add a latency sample and return the new tier if it should change, else None"""
+        self._latencies.append(latency_ms)
+        self._frames_since_downgrade += 1
+        if len(self._latencies) < self._latencies.maxlen:
+            return None
+
+        latency = statistics.median(self._latencies)
+        index = self.tiers.index(self.tier)
+        if latency > self.budget_ms and index > 0:
+            self._frames_since_downgrade = 0
+            return self._switch(self.tiers[index - 1])
+        if (latency < self.budget_ms * self.upgrade_ratio and index < len(self.tiers) - 1
+                and self._frames_since_downgrade >= self.cooldown_frames):
+            return self._switch(self.tiers[index + 1])
+        return None
+
+    def get_rolling_latency(self):
+        return statistics.median(self._latencies) if self._latencies else None
+
+    def _switch(self, tier):
+        self.tier = tier
+        self.history.append(tier)
+        # The first frames of a new model are not representative
+        self._latencies.clear()
+        return tier
@@ -1,153 +1,462 @@
 import cv2
+import dataclasses
 import mediapipe as mp
 import os
+import threading
+import time
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 from src.utils.file_utils import download_file
+from src.core.model_tier_controller import ModelTierController
+from src.utils.frame_buffers import FrameBufferPool, frame_counter
+from src.utils.instrumentation import instrumentation
+from src.utils.roi import square_roi, crop_roi, roi_to_frame
+from src.config.landmarks import LEFT_LANDMARKS, RIGHT_LANDMARKS
+from src.core.landmark_frame import LandmarkFrame, HAND_SIDES, NUM_HAND_LANDMARKS
 from src.config import settings
 
+# Hand landmark index of each fingertip -> pose landmark it replaces
+HAND_TIP_LANDMARKS = (
+    (20, "PINKY"),
+    (4, "THUMB"),
+    (8, "INDEX")
+)
+
 class PoseDetector:
-    def __init__(self, model_path=settings.MODEL_PATH):
-        self.model_path = model_path
+    RUNNING_MODES = {
+        "IMAGE": vision.RunningMode.IMAGE,
+        "VIDEO": vision.RunningMode.VIDEO,
+        "LIVE_STREAM": vision.RunningMode.LIVE_STREAM
+    }
+
+    def __init__(self, model_path=None, running_mode=None, model_tier=None, adaptive_tier=None):
+        self.model_tier = model_tier or settings.POSE_MODEL_TIER
+        if self.model_tier not in settings.POSE_MODEL_TIERS:
+            raise ValueError(f"model_tier must be one of {', '.join(settings.POSE_MODEL_TIERS)}")
+        # An explicit model path pins the model, so it cannot adapt
+        self.model_path = model_path or settings.POSE_MODEL_TIERS[self.model_tier]["path"]
+        if adaptive_tier is None:
+            adaptive_tier = settings.ADAPTIVE_MODEL_TIER
+        self.tier_controller = None
+        if adaptive_tier and model_path is None:
+            self.tier_controller = ModelTierController(
+                settings.POSE_MODEL_TIERS,
+                self.model_tier,
+                settings.FRAME_TIME_BUDGET_MS,
+                window=settings.MODEL_TIER_WINDOW,
+                upgrade_ratio=settings.MODEL_TIER_UPGRADE_RATIO,
+                cooldown_frames=settings.MODEL_TIER_COOLDOWN_FRAMES)
+        self.running_mode = (running_mode or settings.POSE_RUNNING_MODE).upper()
+        if self.running_mode not in self.RUNNING_MODES:
+            raise ValueError(f"running_mode must be one of {', '.join(self.RUNNING_MODES)}")
         self.detector = None
         self.hand_recognizer = None
+        self._hand_lock = threading.Lock()
+        self._preload_thread = None
+        self._hand_load_failed = False
+        self._last_timestamp_ms = -1
+        # Latest results delivered by the LIVE_STREAM callbacks
+        self._result_lock = threading.Lock()
+        self._latest_pose_result = None
+        self._latest_gesture_result = None
+        self._pending_hand_rois = {}
+        self._pose_submit_times = {}
+        self._pending_pose_rois = {}
+        self._pose_roi = None
+        self._buffers = FrameBufferPool()
+        self._live_latencies = []
         
     def initialize(self):
-        model_url = settings.MODEL_URL
-        hand_model_url = settings.HAND_MODEL_URL
-        
-        if not self._model_exists(model_url) or not self._model_exists(hand_model_url):
+        """
+        Load the pose model. The gesture recognizer is only needed by the hand
+        exercises, so it is loaded on demand (see load_hand_recognizer).
+        """
+        tier_url = settings.POSE_MODEL_TIERS[self.model_tier]["url"]
+        if not self._model_exists(tier_url, self.model_path):
             return False
         
+        # Download every tier up front so switching never blocks on the network
+        if self.tier_controller:
+            for tier in settings.POSE_MODEL_TIERS.values():
+                if not self._model_exists(tier["url"], tier["path"]):
+                    print("Adaptive model tiers disabled: not all tiers are available")
+                    self.tier_controller = None
+                    break
+        
         try:
-            # Initialize pose detector
-            base_options = python.BaseOptions(model_asset_path=self.model_path)
-            options = vision.PoseLandmarkerOptions(
-                base_options=base_options,
-                output_segmentation_masks=False,  # Disable segmentation for better performance
-                running_mode=vision.RunningMode.IMAGE,  # Use image mode instead of video
-                num_poses=1)  # Only detect one person
-            self.detector = vision.PoseLandmarker.create_from_options(options)
-            
-            # Initialize hand gesture recognizer
-            hand_base_options = python.BaseOptions(model_asset_path=settings.HAND_MODEL_PATH)
-            hand_options = vision.GestureRecognizerOptions(
-                base_options=hand_base_options,
-                running_mode=vision.RunningMode.IMAGE,
-                num_hands=2)  # Detect up to 2 hands
-            self.hand_recognizer = vision.GestureRecognizer.create_from_options(hand_options)
-            
+            self.detector = self._create_pose_landmarker(self.model_path)
             return True
         except Exception as e:
             print(f"Couldn't start the Mediapipe detectors: {e}")
             return False
+    
+    def _create_pose_landmarker(self, model_path):
+        base_options = python.BaseOptions(model_asset_path=model_path)
+        options = vision.PoseLandmarkerOptions(
+            base_options=base_options,
+            output_segmentation_masks=False,  # Disable segmentation for better performance
+            running_mode=self.RUNNING_MODES[self.running_mode],
+            num_poses=1,  # Only detect one person
+            min_pose_detection_confidence=settings.MIN_POSE_DETECTION_CONFIDENCE,
+            min_pose_presence_confidence=settings.MIN_POSE_PRESENCE_CONFIDENCE,
+            min_tracking_confidence=settings.MIN_TRACKING_CONFIDENCE,
+            result_callback=self._on_pose_result if self.running_mode == "LIVE_STREAM" else None)
+        return vision.PoseLandmarker.create_from_options(options)
+    
+    def set_model_tier(self, tier):
+        """Swap the pose model for another tier"""
+        tier_path = settings.POSE_MODEL_TIERS[tier]["path"]
+        try:
+            new_detector = self._create_pose_landmarker(tier_path)
+        except Exception as e:
+            print(f"Couldn't switch to the {tier} pose model: {e}")
+            return False
+        old_detector, self.detector = self.detector, new_detector
+        if old_detector is not None:
+            old_detector.close()
+        print(f"Pose model switched from {self.model_tier} to {tier}")
+        self.model_tier = tier
+        self.model_path = tier_path
+        return True
+    
+    def load_hand_recognizer(self):
+        """Load the gesture recognizer if needed, blocking until it is ready"""
+        with self._hand_lock:
+            if self.hand_recognizer is not None:
+                return True
+            if not self._model_exists(settings.HAND_MODEL_URL, settings.HAND_MODEL_PATH):
+                self._hand_load_failed = True
+                return False
+            try:
+                hand_base_options = python.BaseOptions(model_asset_path=settings.HAND_MODEL_PATH)
+                hand_options = vision.GestureRecognizerOptions(
+                    base_options=hand_base_options,
+                    running_mode=self.RUNNING_MODES[self.running_mode],
+                    # A hand ROI only ever contains the assessed hand
+                    num_hands=1 if settings.HAND_ROI_ENABLED else 2,
+                    min_tracking_confidence=settings.MIN_TRACKING_CONFIDENCE,
+                    result_callback=self._on_gesture_result if self.running_mode == "LIVE_STREAM" else None)
+                self.hand_recognizer = vision.GestureRecognizer.create_from_options(hand_options)
+                return True
+            except Exception as e:
+                print(f"Couldn't start the gesture recognizer: {e}")
+                self._hand_load_failed = True
+                return False
+    
+    def preload_hand_recognizer(self):
+        """Start loading the gesture recognizer on a background thread"""
+        if self.hand_recognizer is not None or self._hand_load_failed:
+            return
+        if self._preload_thread is not None and self._preload_thread.is_alive():
+            return
+        self._preload_thread = threading.Thread(
+            target=self.load_hand_recognizer, name="fma-hand-preload", daemon=True)
+        self._preload_thread.start()
+    
+    def release_hand_recognizer(self):
+        """Close the gesture recognizer to free its memory"""
+        if self._preload_thread is not None:
+            self._preload_thread.join()
+            self._preload_thread = None
+        with self._hand_lock:
+            if self.hand_recognizer is not None:
+                self.hand_recognizer.close()
+                self.hand_recognizer = None
+        with self._result_lock:
+            self._latest_gesture_result = None
+    
+    def reset_stream(self):
+        """
+        Prepare for a new video. The VIDEO and LIVE_STREAM graphs keep tracking
+        state and require increasing timestamps, so they are recreated and the
+        timestamps start over; the gesture recognizer is reloaded on demand.
+        """
+        self.release_hand_recognizer()
+        if self.detector is not None and self.running_mode != "IMAGE":
+            old_detector, self.detector = self.detector, self._create_pose_landmarker(self.model_path)
+            old_detector.close()
+        self._last_timestamp_ms = -1
+        self._pose_roi = None
+        with self._result_lock:
+            self._latest_pose_result = None
+            self._pending_hand_rois = {}
+            self._pose_submit_times = {}
+            self._pending_pose_rois = {}
+            self._live_latencies = []
+    
+    def close(self):
+        """Release the MediaPipe graphs"""
+        self.release_hand_recognizer()
+        if self.detector is not None:
+            self.detector.close()
+            self.detector = None
             
-    def process_frame(self, frame, detect_gestures=False):
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def process_frame(self, frame, detect_gestures=False, timestamp_ms=None, hand_side=None):
+        """
+        Run pose (and optionally gesture) detection on a BGR frame.
+        
+        Returns (rgb_frame, landmark_frame). landmark_frame is a LandmarkFrame,
+        or None when no pose was found. The RGB frame is a buffer reused by the
+        next call.
+        
+        In VIDEO and LIVE_STREAM mode frames must carry increasing timestamps;
+        when timestamp_ms is omitted the monotonic clock is used. In LIVE_STREAM
+        mode the landmarks are the newest ones the callbacks have delivered,
+        which may belong to an earlier frame.
+        
+        hand_side ("left"/"right") is the side being assessed. With
+        settings.HAND_ROI_ENABLED the gesture recognizer only looks at a crop
+        around that hand, located from the pose landmarks.
+        """
+        # Hand model is loaded the first time a gesture exercise needs it
+        if detect_gestures and self.hand_recognizer is None:
+            detect_gestures = not self._hand_load_failed and self.load_hand_recognizer()
+        
+        # Single color conversion into a reused buffer; mp.Image takes its own copy
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB,
+                                 dst=self._buffers.get("rgb", frame.shape))
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        frame_counter.count_copy(rgb_frame.nbytes)
+        if self.running_mode != "IMAGE":
+            timestamp_ms = self._next_timestamp(timestamp_ms)
         
         # Get pose detection results
-        detection_result = self.detector.detect(mp_image)
+        pose_start = time.perf_counter()
+        detection_result = self._detect_pose(rgb_frame, mp_image, timestamp_ms)
+        if self.tier_controller:
+            self._update_model_tier((time.perf_counter() - pose_start) * 1000)
+        instrumentation.add("pose", pose_start)
         
         # Get hand gesture results if requested
+        gesture_results = None
         if detect_gestures and self.hand_recognizer:
-            gesture_results = self.hand_recognizer.recognize(mp_image)
-            
-            
-            # Enhance pose landmarks with gesture information and hand landmarks
-            if detection_result.pose_landmarks and gesture_results:
-                enhanced_landmarks = self._enhance_landmarks_with_gestures(
-                    detection_result.pose_landmarks[0], 
-                    gesture_results
-                )
-                # Create a new detection result with enhanced landmarks
-                detection_result.pose_landmarks = [enhanced_landmarks]
-        
-        return rgb_frame, detection_result
-            
+            gesture_start = instrumentation.time()
+            gesture_results = self._recognize_gestures(rgb_frame, mp_image, detection_result, timestamp_ms, hand_side)
+            instrumentation.add("gesture", gesture_start)
         
+        if not detection_result or not detection_result.pose_landmarks:
+            return rgb_frame, None
+        
+        timestamp = time.monotonic() if timestamp_ms is None else timestamp_ms / 1000
+        landmark_frame = LandmarkFrame.from_pose_landmarks(detection_result.pose_landmarks[0], timestamp)
+        
+        # Enhance pose landmarks with gesture information and hand landmarks
+        if gesture_results:
+            self._enhance_landmarks_with_gestures(landmark_frame, gesture_results)
+        
+        return rgb_frame, landmark_frame
     
-    def _enhance_landmarks_with_gestures(self, pose_landmarks, gesture_results):
+    def _detect_pose(self, rgb_frame, mp_image, timestamp_ms):
         """
-        Enhance pose landmarks with gesture information and hand landmarks.
-        Adds right_gesture, left_gesture, and updates hand landmarks with gesture detector data.
+        Pose detection on the full frame or, with settings.POSE_ROI_ENABLED, on
+        a crop around the previous frame's pose scaled to the model input size.
+        Landmarks are always returned in full-frame normalized coordinates.
         """
-        # Create a copy of pose landmarks to avoid modifying the original
-        enhanced_landmarks = list(pose_landmarks)
+        height, width = rgb_frame.shape[:2]
+        roi = self._pose_roi if settings.POSE_ROI_ENABLED else None
+        if roi is None:
+            detection_result = self._run_pose_model(mp_image, timestamp_ms)
+        else:
+            x0, y0, x1, y1 = roi
+            input_size = settings.POSE_ROI_INPUT_SIZE
+            roi_frame = cv2.resize(rgb_frame[y0:y1, x0:x1], (input_size, input_size), interpolation=cv2.INTER_AREA)
+            roi_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=roi_frame)
+            detection_result = self._run_pose_model(roi_image, timestamp_ms, (roi, width, height))
+            
+            lost = detection_result is None or not detection_result.pose_landmarks
+            if lost and self.running_mode != "LIVE_STREAM":
+                # Tracking lost, search the whole frame again. The second
+                # call needs its own timestamp, kept on the caller's time base
+                if self.running_mode == "VIDEO":
+                    timestamp_ms = self._next_timestamp(timestamp_ms + 1)
+                detection_result = self._run_pose_model(mp_image, timestamp_ms)
         
-        # Initialize gesture information
-        right_gesture = None
-        left_gesture = None
+        if settings.POSE_ROI_ENABLED:
+            self._pose_roi = self._pose_roi_from_result(detection_result, width, height)
+        return detection_result
+    
+    def _run_pose_model(self, mp_image, timestamp_ms, roi_info=None):
+        """roi_info is (roi, frame_width, frame_height) when mp_image is a crop"""
+        if self.running_mode == "IMAGE":
+            detection_result = self.detector.detect(mp_image)
+        elif self.running_mode == "VIDEO":
+            detection_result = self.detector.detect_for_video(mp_image, timestamp_ms)
+        else:
+            with self._result_lock:
+                if self.tier_controller:
+                    self._pose_submit_times[timestamp_ms] = time.perf_counter()
+                if roi_info is not None:
+                    self._pending_pose_rois[timestamp_ms] = roi_info
+            self.detector.detect_async(mp_image, timestamp_ms)
+            # The callback already mapped the result out of the ROI
+            with self._result_lock:
+                return self._latest_pose_result
         
-        enhanced_landmarks.extend([None, None])
-
-        # Process gesture results
-        if gesture_results.gestures and gesture_results.handedness:
-            for i, (gesture, handedness) in enumerate(zip(gesture_results.gestures, gesture_results.handedness)):
-                if handedness[0].category_name == "Right":
-                    right_gesture = gesture[0].category_name
-                    enhanced_landmarks[33] = right_gesture
-                elif handedness[0].category_name == "Left":
-                    left_gesture = gesture[0].category_name
-                    enhanced_landmarks[34] = left_gesture
-
+        if roi_info is not None:
+            detection_result = self._map_pose_result(detection_result, *roi_info)
+        return detection_result
+    
+    def _pose_roi_from_result(self, detection_result, width, height):
+        """Square around the visible landmarks, None when tracking is lost"""
+        if not detection_result or not detection_result.pose_landmarks:
+            return None
+        points = [(landmark.x, landmark.y) for landmark in detection_result.pose_landmarks[0][:33]
+                  if landmark.visibility is None or landmark.visibility >= settings.POSE_ROI_MIN_VISIBILITY]
+        if len(points) < 2:
+            return None
+        return square_roi(points, width, height,
+                          scale=settings.POSE_ROI_SCALE, min_size=settings.POSE_ROI_INPUT_SIZE)
+    
+    def _map_pose_result(self, detection_result, roi, width, height):
+        """Un-project pose landmarks from the ROI back into the full frame"""
+        return vision.PoseLandmarkerResult(
+            pose_landmarks=[self._map_landmarks(pose, roi, width, height)
+                            for pose in detection_result.pose_landmarks],
+            # World landmarks are metric and hip-centred, not image based
+            pose_world_landmarks=detection_result.pose_world_landmarks,
+            segmentation_masks=detection_result.segmentation_masks)
+    
+    def _map_landmarks(self, landmarks, roi, width, height):
+        """Map normalized landmarks from ROI to full-frame coordinates"""
+        crop_width = roi[2] - roi[0]
+        mapped = []
+        for landmark in landmarks:
+            x, y = roi_to_frame(landmark.x, landmark.y, roi, width, height)
+            # z shares the scale of x
+            mapped.append(dataclasses.replace(landmark, x=x, y=y, z=landmark.z * crop_width / width))
+        return mapped
+    
+    def _recognize_gestures(self, rgb_frame, mp_image, detection_result, timestamp_ms, hand_side):
+        height, width = rgb_frame.shape[:2]
+        roi = None
+        if settings.HAND_ROI_ENABLED and hand_side is not None:
+            roi = self._hand_roi(detection_result, hand_side, width, height)
+            if roi is None:
+                # No pose, so there is no hand position to crop around
+                return None
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=crop_roi(rgb_frame, roi))
         
-        # Update hand landmarks with gesture detector data if available
-        if gesture_results.hand_landmarks and gesture_results.handedness:
-            for i, (hand_landmarks, handedness) in enumerate(zip(gesture_results.hand_landmarks, gesture_results.handedness)):
-                if handedness[0].category_name == "Right" and len(enhanced_landmarks) > 32:
-                    # Right hand landmarks (indices 16-22 in MediaPipe pose model)
-                    if len(hand_landmarks) >= 21:
-                        # Update pinky tip (landmark 20 -> pose landmark 18)
-                        enhanced_landmarks[18] = type(enhanced_landmarks[0])(
-                            x=hand_landmarks[20].x,
-                            y=hand_landmarks[20].y,
-                            z=hand_landmarks[20].z,
-                            visibility=1.0
-                        )
-                        # Update thumb tip (landmark 4 -> pose landmark 22)
-                        enhanced_landmarks[22] = type(enhanced_landmarks[0])(
-                            x=hand_landmarks[4].x,
-                            y=hand_landmarks[4].y,
-                            z=hand_landmarks[4].z,
-                            visibility=1.0
-                        )
-                        # Update index finger tip (landmark 8 -> pose landmark 23)
-                        enhanced_landmarks[20] = type(enhanced_landmarks[0])(
-                            x=hand_landmarks[8].x,
-                            y=hand_landmarks[8].y,
-                            z=hand_landmarks[8].z,
-                            visibility=1.0
-                        )
-                
-                elif handedness[0].category_name == "Left" and len(enhanced_landmarks) > 20:
-                    # Left hand landmarks (indices 15-21 in MediaPipe pose model)
-                    if len(hand_landmarks) >= 21:
-                        # Update pinky tip (landmark 20 -> pose landmark 17)
-                        enhanced_landmarks[17] = type(enhanced_landmarks[0])(
-                            x=hand_landmarks[20].x,
-                            y=hand_landmarks[20].y,
-                            z=hand_landmarks[20].z,
-                            visibility=1.0
-                        )
-                        # Update thumb tip (landmark 4 -> pose landmark 21)
-                        enhanced_landmarks[21] = type(enhanced_landmarks[0])(
-                            x=hand_landmarks[4].x,
-                            y=hand_landmarks[4].y,
-                            z=hand_landmarks[4].z,
-                            visibility=1.0
-                        )
-                        # Update index finger tip (landmark 8 -> pose landmark 23)
-                        enhanced_landmarks[19] = type(enhanced_landmarks[0])(
-                            x=hand_landmarks[8].x,
-                            y=hand_landmarks[8].y,
-                            z=hand_landmarks[8].z,
-                            visibility=1.0
-                        )
-        
-        return enhanced_landmarks
-    
-    def _model_exists(self, model_url):
-        if not os.path.exists(self.model_path):
-            return download_file(model_url, self.model_path)
+        if self.running_mode == "IMAGE":
+            gesture_results = self.hand_recognizer.recognize(mp_image)
+        elif self.running_mode == "VIDEO":
+            gesture_results = self.hand_recognizer.recognize_for_video(mp_image, timestamp_ms)
+        else:
+            # The callback maps the result back once it arrives
+            with self._result_lock:
+                if roi is not None:
+                    self._pending_hand_rois[timestamp_ms] = (roi, hand_side, width, height)
+            self.hand_recognizer.recognize_async(mp_image, timestamp_ms)
+            with self._result_lock:
+                return self._latest_gesture_result
+        
+        if roi is not None:
+            gesture_results = self._map_gesture_result(gesture_results, roi, hand_side, width, height)
+        return gesture_results
+    
+    def _hand_roi(self, detection_result, hand_side, width, height):
+        """Padded square around the wrist, pinky, index and thumb pose landmarks"""
+        if not detection_result or not detection_result.pose_landmarks:
+            return None
+        landmarks = detection_result.pose_landmarks[0]
+        side_dict = LEFT_LANDMARKS if hand_side == "left" else RIGHT_LANDMARKS
+        points = [(landmarks[side_dict[name]].x, landmarks[side_dict[name]].y)
+                  for name in ("WRIST", "PINKY", "INDEX", "THUMB")]
+        return square_roi(points, width, height,
+                          scale=settings.HAND_ROI_SCALE, min_size=settings.HAND_ROI_MIN_SIZE)
+    
+    def _map_gesture_result(self, gesture_results, roi, hand_side, width, height):
+        """
+        Map hand landmarks from ROI to full-frame coordinates. The crop only
+        contains the assessed hand, so its handedness is set to that side.
+        """
+        label = "Right" if hand_side == "right" else "Left"
+        hand_landmarks = [self._map_landmarks(hand, roi, width, height)
+                          for hand in gesture_results.hand_landmarks]
+        handedness = [[dataclasses.replace(category, category_name=label, display_name=label)
+                       for category in hand] for hand in gesture_results.handedness]
+        return vision.GestureRecognizerResult(
+            gestures=gesture_results.gestures,
+            handedness=handedness,
+            hand_landmarks=hand_landmarks,
+            hand_world_landmarks=gesture_results.hand_world_landmarks)
+    
+    def _next_timestamp(self, timestamp_ms=None):
+        """MediaPipe rejects timestamps that do not strictly increase"""
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+        timestamp_ms = max(int(timestamp_ms), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+    
+    def _update_model_tier(self, latency_ms):
+        if self.running_mode == "LIVE_STREAM":
+            # detect_async returns immediately, the callbacks measure latency
+            with self._result_lock:
+                latencies, self._live_latencies = self._live_latencies, []
+        else:
+            latencies = [latency_ms]
+        for latency in latencies:
+            new_tier = self.tier_controller.record(latency)
+            if new_tier is not None and not self.set_model_tier(new_tier):
+                # Keep the controller in sync with the model actually running
+                self.tier_controller.tier = self.model_tier
+    
+    def _on_pose_result(self, result, output_image, timestamp_ms):
+        with self._result_lock:
+            roi_info = self._pending_pose_rois.pop(timestamp_ms, None)
+            for stale in [ts for ts in self._pending_pose_rois if ts < timestamp_ms]:
+                del self._pending_pose_rois[stale]
+        if roi_info is not None and result.pose_landmarks:
+            result = self._map_pose_result(result, *roi_info)
+        with self._result_lock:
+            self._latest_pose_result = result
+            submit_time = self._pose_submit_times.pop(timestamp_ms, None)
+            for stale in [ts for ts in self._pose_submit_times if ts < timestamp_ms]:
+                del self._pose_submit_times[stale]
+            if submit_time is not None:
+                self._live_latencies.append((time.perf_counter() - submit_time) * 1000)
+    
+    def _on_gesture_result(self, result, output_image, timestamp_ms):
+        with self._result_lock:
+            roi_info = self._pending_hand_rois.pop(timestamp_ms, None)
+            # Frames MediaPipe dropped never get a callback
+            for stale in [ts for ts in self._pending_hand_rois if ts < timestamp_ms]:
+                del self._pending_hand_rois[stale]
+        if roi_info is not None:
+            result = self._map_gesture_result(result, *roi_info)
+        with self._result_lock:
+            self._latest_gesture_result = result
+    
+    def _enhance_landmarks_with_gestures(self, landmark_frame, gesture_results):
+        """
+        Enhance the frame with gesture information and hand landmarks.
+        Sets the gesture of each hand, fills the hand landmark array and
+        replaces the pose pinky, index and thumb landmarks with the more
+        precise fingertips from the gesture recognizer.
+        """
+        hands = landmark_frame.empty_hands()
+        
+        for i, handedness in enumerate(gesture_results.handedness):
+            side = handedness[0].category_name.lower()
+            if side not in HAND_SIDES:
+                continue
+            
+            if i < len(gesture_results.gestures) and gesture_results.gestures[i]:
+                gesture = gesture_results.gestures[i][0]
+                landmark_frame.set_gesture(side, gesture.category_name, gesture.score)
+            
+            if i >= len(gesture_results.hand_landmarks) or len(gesture_results.hand_landmarks[i]) < NUM_HAND_LANDMARKS:
+                continue
+            hand = hands[HAND_SIDES.index(side)]
+            hand[:] = [(landmark.x, landmark.y, landmark.z)
+                       for landmark in gesture_results.hand_landmarks[i][:NUM_HAND_LANDMARKS]]
+            
+            side_dict = RIGHT_LANDMARKS if side == "right" else LEFT_LANDMARKS
+            for hand_index, name in HAND_TIP_LANDMARKS:
+                landmark_frame.pose[side_dict[name], :3] = hand[hand_index]
+                landmark_frame.pose[side_dict[name], 3] = 1.0
+    
+    def _model_exists(self, model_url, model_path):
+        if not os.path.exists(model_path):
+            return download_file(model_url, model_path)
         return True
\ No newline at end of file
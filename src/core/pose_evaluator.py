@@ -2,7 +2,7 @@ from src.config.landmarks import *
 from src.exercises.factory.exercise_factory import ExerciseFactory
 
 class PoseEvaluator:
-    def __init__(self, non_affected_side):
+    def __init__(self, non_affected_side, clock=None):
         if non_affected_side not in ["left", "right"]:
             raise ValueError("non_affected_side must be 'left' or 'right'")
             
@@ -10,6 +10,7 @@ class PoseEvaluator:
         self.affected_side = "right" if non_affected_side == "left" else "left"
         self.current_assessment_side = "unaffected"
         self.current_exercise = None
+        self.clock = clock
         self._last_evaluation = None
         
     def set_assessment_side(self, side):
@@ -19,20 +20,19 @@ class PoseEvaluator:
         
     def set_current_exercise(self, exercise_config):
         if self.current_exercise is None or self.current_exercise.id != exercise_config.get("id"):
-            self.current_exercise = ExerciseFactory.create_exercise(exercise_config)
+            self.current_exercise = ExerciseFactory.create_exercise(exercise_config, self.clock)
         
     def reset_current_exercise(self):
         self.current_exercise.reset()
         
-    def evaluate_exercise(self, exercise_config, detection_result):
-        if detection_result is None or not detection_result.pose_landmarks:
+    def evaluate_exercise(self, exercise_config, landmark_frame):
+        if landmark_frame is None:
             return None
             
-        landmarks = detection_result.pose_landmarks[0]
         self.set_current_exercise(exercise_config)
             
         side_to_assess = self.get_actual_side()
-        self._last_evaluation = self.current_exercise.evaluate(landmarks, side_to_assess)
+        self._last_evaluation = self.current_exercise.evaluate(landmark_frame, side_to_assess)
         
         return self._last_evaluation[0] if self._last_evaluation else None
 
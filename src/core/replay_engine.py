@@ -0,0 +1,96 @@
+from src.core.pose_evaluator import PoseEvaluator
+from src.core.score_tracker import ScoreTracker
+from src.core.session_recorder import SessionArchive
+from src.utils.clock import ReplayClock
+from src.utils.file_utils import load_fugl_meyer_tests
+
+
+class ReplayEngine:
+    """
+    Re-scores recorded sessions without a camera or the pose model.
+
+    The landmark frames of each recorded exercise side are fed, in order,
+    through exercises created by ExerciseFactory and a PoseEvaluator, with a
+    ReplayClock following the recorded timestamps. The exercise ends like a
+    live one: when its duration has passed on the recorded clock or the
+    maximum score has been held long enough. Replay runs as fast as the
+    criteria evaluate, so changed thresholds or exercise settings can be
+    checked against whole archives of past sessions.
+    """
+    def __init__(self, exercises=None, overrides=None):
+        """
+        exercises: exercise configurations (the Fugl Meyer configuration by
+        default). overrides: {exercise_id: {setting: value}} applied on top,
+        e.g. {"a_2_flexor": {"stabilization_ms": 800}}.
+        """
+        if exercises is None:
+            tests = load_fugl_meyer_tests() or {}
+            exercises = tests.get("exercises", [])
+        overrides = overrides or {}
+        self.exercises = {exercise["id"]: dict(exercise, **overrides.get(exercise["id"], {}))
+                          for exercise in exercises}
+
+    def rescore_archive(self, archive, exercise_ids=None):
+        """
+        Re-score every recorded segment of a SessionArchive (or archive path),
+        optionally only those of `exercise_ids`. Returns one result per segment.
+        """
+        if not isinstance(archive, SessionArchive):
+            with SessionArchive(archive) as opened:
+                return self.rescore_archive(opened, exercise_ids)
+
+        non_affected_side = archive.metadata.get("non_affected_side")
+        results = []
+        for info in archive.segments:
+            if exercise_ids and info["exercise_id"] not in exercise_ids:
+                continue
+            if info["exercise_id"] not in self.exercises:
+                print(f"Skipping unknown exercise {info['exercise_id']} in {archive.path}")
+                continue
+            results.append(self.rescore_segment(archive.decode(info), non_affected_side))
+        return results
+
+    def rescore_segment(self, segment, non_affected_side):
+        """Replay one SessionSegment and compare with the recorded scores"""
+        exercise = self.exercises[segment.exercise_id]
+        max_score = exercise.get("max_score", 2)
+        duration = exercise.get("duration", 30)
+
+        clock = ReplayClock()
+        evaluator = PoseEvaluator(non_affected_side, clock)
+        evaluator.set_assessment_side(segment.phase)
+        evaluator.set_current_exercise(exercise)
+
+        # Frames without a score were recorded as -1
+        recorded_scores = [None if score < 0 else score for score in segment.scores.tolist()]
+        timestamps = (segment.timestamps_ms / 1000).tolist()
+        recorded = ScoreTracker.for_exercise(exercise)
+        for timestamp, score in zip(timestamps, recorded_scores):
+            recorded.update(score, timestamp)
+
+        replayed = ScoreTracker.for_exercise(exercise)
+        evaluated_frames = 0
+        changed_frames = 0
+        start_time = segment.timestamps_ms[0] / 1000 if len(segment) else 0.0
+        for timestamp_ms, landmark_frame, recorded_score in zip(segment.timestamps_ms, segment.landmark_frames(),
+                                                                recorded_scores):
+            clock.set_ms(timestamp_ms)
+            if clock.time() - start_time >= duration or replayed.best_score >= max_score:
+                break
+            score = evaluator.evaluate_exercise(exercise, landmark_frame)
+            replayed.update(score, clock.time())
+            evaluated_frames += 1
+            if score != recorded_score:
+                changed_frames += 1
+
+        return {
+            "exercise_id": segment.exercise_id,
+            "phase": segment.phase,
+            "side": segment.side,
+            "frames": len(segment),
+            "evaluated_frames": evaluated_frames,
+            "changed_frames": changed_frames,
+            "recorded_score": recorded.best_score,
+            "score": replayed.best_score,
+            "max_score": max_score
+        }
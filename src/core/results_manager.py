@@ -9,6 +9,18 @@ class ResultsManager:
        self.max_possible_score = 0
        self.affected_scores = {}
        self.unaffected_scores = {}
+       self.model_tiers = {
+           "affected": {},
+           "unaffected": {}
+       }
+       self.performance = {
+           "affected": {},
+           "unaffected": {}
+       }
+       self.frame_rates = {
+           "affected": {},
+           "unaffected": {}
+       }
        
    def add_exercise_score(self, exercise_id, score, max_score=2, side="affected"):
        # Store scores by side
@@ -20,6 +32,18 @@ class ResultsManager:
        else:  # unaffected
            self.unaffected_scores[exercise_id] = score
        
+   def add_model_tier(self, exercise_id, tier, side="affected"):
+       # Pose model tier in use when the exercise finished
+       self.model_tiers[side][exercise_id] = tier
+       
+   def add_performance(self, exercise_id, summary, side="affected"):
+       # Frame rate, stage latencies and detection misses while the exercise ran
+       self.performance[side][exercise_id] = summary
+       
+   def add_frame_rates(self, exercise_id, summary, side="affected"):
+       # Target and achieved rates of display, pose, gesture and evaluation
+       self.frame_rates[side][exercise_id] = summary
+       
    def generate_report(self):
        # Calculate totals
        affected_total = sum(self.affected_scores.values())
@@ -37,6 +61,9 @@ class ResultsManager:
            "affected_side_scores": self.affected_scores,
            "unaffected_side_scores": self.unaffected_scores,
            "asymmetry_index": asymmetry_index,
+           "pose_model_tiers": self.model_tiers,
+           "performance": self.performance,
+           "frame_rates": self.frame_rates,
            "timestamp": time.strftime("%Y%m%d-%H%M%S")
        }
        
@@ -47,7 +74,8 @@ class ResultsManager:
            timestamp = time.strftime("%Y%m%d-%H%M%S")
            filepath = f"data/assessment_reports/report_{timestamp}.json"
            
-       os.makedirs(os.path.dirname(filepath), exist_ok=True)
+       if os.path.dirname(filepath):
+           os.makedirs(os.path.dirname(filepath), exist_ok=True)
        
        with open(filepath, 'w') as f:
            json.dump(self.generate_report(), f, indent=2)
@@ -0,0 +1,71 @@
+from collections import deque
+
+from src.config import settings
+
+
+class ScoreTracker:
+    """
+    Best score of one exercise side. A score only counts once it has been held
+    (or beaten) for `stabilization_ms` of clock time, checked over a
+    timestamped ring buffer of the recent scores, so the hold a patient needs
+    is the same at any frame rate. Frames without a score (detection dropouts)
+    are bridged when the gap between scored frames is at most
+    `dropout_tolerance_ms`; a longer gap starts the hold again.
+
+    Configurations without `stabilization_ms` keep the older frame count: the
+    score must be held for `required_stable_frames` consecutive scored frames,
+    and frames without a score leave the count unchanged.
+    """
+    def __init__(self, stabilization_ms=None, dropout_tolerance_ms=None, required_stable_frames=None):
+        if stabilization_ms is None and required_stable_frames is None:
+            raise ValueError("stabilization_ms or required_stable_frames is required")
+        self.stabilization_ms = stabilization_ms
+        if dropout_tolerance_ms is None:
+            dropout_tolerance_ms = settings.STABILIZATION_DROPOUT_TOLERANCE_MS
+        self.dropout_tolerance_ms = dropout_tolerance_ms
+        self.required_stable_frames = required_stable_frames
+        self.best_score = 0
+        self.stabilization_frames = 0
+        # (timestamp in seconds, score) of the scored frames in the window
+        self._recent = deque()
+
+    @classmethod
+    def for_exercise(cls, exercise):
+        """Tracker with the stabilization settings of an exercise configuration"""
+        if "stabilization_ms" in exercise:
+            return cls(exercise["stabilization_ms"], exercise.get("dropout_tolerance_ms"))
+        return cls(required_stable_frames=exercise.get("required_stable_frames", 30))
+
+    def update(self, score, timestamp=None):
+        """Add the score of a frame captured at timestamp (seconds), returns the best score"""
+        if score is None:
+            return self.best_score
+        if self.stabilization_ms is None:
+            return self._update_frames(score)
+        if timestamp is None:
+            raise ValueError("time based stabilization needs the frame timestamp")
+
+        recent = self._recent
+        if recent and (timestamp - recent[-1][0]) * 1000 > self.dropout_tolerance_ms:
+            recent.clear()
+        recent.append((timestamp, score))
+        # Keep the newest sample at or before the window start, it shows the
+        # window is fully covered
+        window_start = timestamp - self.stabilization_ms / 1000
+        while len(recent) > 1 and recent[1][0] <= window_start:
+            recent.popleft()
+        if recent[0][0] <= window_start:
+            # Lowest score over the window is the one held throughout
+            held = min(score for _, score in recent)
+            if held > self.best_score:
+                self.best_score = held
+        return self.best_score
+
+    def _update_frames(self, score):
+        if score >= self.best_score:
+            self.stabilization_frames += 1
+            if self.stabilization_frames >= self.required_stable_frames:
+                self.best_score = score
+        else:
+            self.stabilization_frames = 0
+        return self.best_score
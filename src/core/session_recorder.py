@@ -0,0 +1,407 @@
+import json
+import mmap
+import queue
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from src.config import settings
+from src.core.landmark_frame import LandmarkFrame, NUM_POSE_LANDMARKS, NUM_HAND_LANDMARKS, HAND_SIDES
+
+# Archive layout:
+#   header   MAGIC, format version
+#   chunks   CHUNK_TAG, frame count, payload length, zlib payload; each chunk
+#            holds up to chunk_frames consecutive frames of one segment and
+#            decodes on its own
+#   index    JSON: metadata, gesture labels and, per (exercise, phase)
+#            segment, the byte ranges of its chunks
+#   footer   index offset, index length, END_MAGIC
+MAGIC = b"FMASESS\0"
+END_MAGIC = b"FMAINDEX"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sI")
+CHUNK_HEADER = struct.Struct("<4sII")
+CHUNK_TAG = b"CHNK"
+FOOTER = struct.Struct("<QQ8s")
+
+# Landmarks are stored as int16 on a 1/4096 grid (normalized coordinates
+# within +-8, about a quarter pixel at 1080p, finer than the detector's own
+# jitter); the lowest int16 marks a missing value
+COORDINATE_SCALE = 4096
+MISSING = -32768
+SCORE_SCALE = 10000
+NO_SCORE = -1
+
+# Sections of a chunk payload, in order
+SECTIONS = ("timestamps", "detected", "pose", "hands_ran", "hands", "gestures", "gesture_scores",
+            "scores", "metrics")
+SECTION_TABLE = struct.Struct("<I" + "I" * len(SECTIONS))
+
+
+def _quantize(values):
+    """float array -> int16, NaN -> MISSING"""
+    quantized = np.rint(np.nan_to_num(values, nan=0.0) * COORDINATE_SCALE)
+    quantized = np.clip(quantized, -32767, 32767).astype(np.int16)
+    quantized[np.isnan(values)] = MISSING
+    return quantized
+
+
+def _dequantize(quantized):
+    values = quantized.astype(np.float32) / COORDINATE_SCALE
+    values[quantized == MISSING] = np.nan
+    return values
+
+
+def _encode_deltas(quantized):
+    """
+    Delta-encode int16 values along the time axis (wrapping, so it is exactly
+    reversible), zig-zag the deltas so small changes of either sign become
+    small unsigned numbers, and split them into byte planes: the high bytes
+    of small deltas are almost all zero, which zlib compresses very well.
+    """
+    deltas = np.diff(quantized, axis=0, prepend=np.zeros_like(quantized[:1]))
+    zigzag = ((deltas.astype(np.uint16) << 1) ^ (deltas >> 15).astype(np.uint16))
+    return zigzag.reshape(-1).view(np.uint8).reshape(-1, 2).T.tobytes()
+
+
+def _decode_deltas(data, shape):
+    zigzag = np.frombuffer(data, dtype=np.uint8).reshape(2, -1).T.copy().view(np.uint16).reshape(shape)
+    deltas = ((zigzag >> 1) ^ (0 - (zigzag & 1))).view(np.int16)
+    return np.cumsum(deltas, axis=0, dtype=np.int16)
+
+
+def _round_metrics(value):
+    """Metrics are rounded to 4 decimals, which is plenty for display and analysis"""
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, dict):
+        return {key: _round_metrics(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_round_metrics(item) for item in value]
+    if isinstance(value, np.generic):
+        return _round_metrics(value.item())
+    return value
+
+
+class SessionRecorder:
+    """
+    Records every frame of an assessment into a compact session archive.
+
+    The frame loop only appends small per-frame records to the open segment;
+    full chunks are quantized, compressed and written by a background thread,
+    so recording never waits on the disk. Call begin_segment() before each
+    exercise side, record() for every frame, end_segment() afterwards and
+    close() at the end of the session to write the index.
+    """
+    def __init__(self, path, metadata=None, chunk_frames=settings.SESSION_CHUNK_FRAMES):
+        self.path = path
+        self.metadata = metadata or {}
+        self.chunk_frames = chunk_frames
+        self.error = None
+        self._queue = queue.Queue()
+        self._pending = []
+        self._segment = None
+        self._file = None
+        self._thread = None
+        # Owned by the writer thread
+        self._segments = []
+        self._gesture_codes = {None: 0}
+
+    def start(self):
+        try:
+            self._file = open(self.path, "wb")
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+        except OSError as e:
+            print(f"Could not create session recording {self.path}: {e}")
+            return False
+        self._thread = threading.Thread(target=self._write_loop, name="fma-recorder", daemon=True)
+        self._thread.start()
+        return True
+
+    def begin_segment(self, exercise_id, phase, side):
+        """Start the frames of one exercise on one side ("affected"/"unaffected", "left"/"right")"""
+        self.end_segment()
+        self._segment = {"exercise_id": exercise_id, "phase": phase, "side": side}
+        self._queue.put(("segment", dict(self._segment)))
+
+    def record(self, landmark_frame, timestamp_ms, score=None, metrics=None):
+        """Append one frame; landmark_frame is None when no pose was detected"""
+        if self._segment is None or self._thread is None:
+            return
+        if landmark_frame is None:
+            self._pending.append((timestamp_ms, None, None, None, None, 0.0, 0.0, score, metrics))
+        else:
+            self._pending.append((
+                timestamp_ms,
+                landmark_frame.pose.copy(),
+                None if landmark_frame.hands is None else landmark_frame.hands.copy(),
+                landmark_frame.right_gesture, landmark_frame.left_gesture,
+                landmark_frame.right_gesture_score, landmark_frame.left_gesture_score,
+                score, None if metrics is None else dict(metrics)
+            ))
+        if len(self._pending) >= self.chunk_frames:
+            self._flush()
+
+    def end_segment(self):
+        if self._segment is not None:
+            self._flush()
+            self._segment = None
+
+    def close(self):
+        """Flush the remaining frames, write the index and wait for the writer"""
+        if self._thread is None:
+            return
+        self.end_segment()
+        self._queue.put(("close", None))
+        self._thread.join()
+        self._thread = None
+
+    def _flush(self):
+        if self._pending:
+            self._queue.put(("chunk", self._pending))
+            self._pending = []
+
+    def _write_loop(self):
+        segment = None
+        while True:
+            kind, payload = self._queue.get()
+            if kind == "close":
+                break
+            if self.error is not None:
+                continue
+            try:
+                if kind == "segment":
+                    segment = dict(payload, frames=0, start_ms=None, end_ms=None, chunks=[])
+                    self._segments.append(segment)
+                else:
+                    self._write_chunk(segment, payload)
+            except Exception as e:
+                self.error = e
+                print(f"Session recording failed: {e}")
+        try:
+            # An index over a partly written file would make it look complete,
+            # so a failed recording is left without one and cannot be opened
+            if self.error is None:
+                self._write_index()
+        except Exception as e:
+            self.error = e
+            print(f"Session recording failed: {e}")
+        finally:
+            self._file.close()
+
+    def _write_chunk(self, segment, records):
+        payload = zlib.compress(self._encode(records), 6)
+        offset = self._file.tell()
+        self._file.write(CHUNK_HEADER.pack(CHUNK_TAG, len(records), len(payload)))
+        self._file.write(payload)
+        segment["chunks"].append([offset, CHUNK_HEADER.size + len(payload), len(records)])
+        segment["frames"] += len(records)
+        if segment["start_ms"] is None:
+            segment["start_ms"] = records[0][0]
+        segment["end_ms"] = records[-1][0]
+
+    def _gesture_code(self, label):
+        code = self._gesture_codes.get(label)
+        if code is None:
+            code = len(self._gesture_codes)
+            self._gesture_codes[label] = code
+        return code
+
+    def _encode(self, records):
+        count = len(records)
+        timestamps = np.array([round(record[0] * 1000) for record in records], dtype=np.int64)
+        detected = np.zeros(count, dtype=np.uint8)
+        pose = np.full((count, NUM_POSE_LANDMARKS, 4), np.nan, dtype=np.float32)
+        hands_ran = np.zeros(count, dtype=np.uint8)
+        hands = np.full((count, len(HAND_SIDES), NUM_HAND_LANDMARKS, 3), np.nan, dtype=np.float32)
+        gestures = np.zeros((count, len(HAND_SIDES)), dtype=np.uint8)
+        gesture_scores = np.zeros((count, len(HAND_SIDES)), dtype=np.uint16)
+        scores = np.full(count, NO_SCORE, dtype=np.int8)
+        metrics = []
+        for i, (_, frame_pose, frame_hands, right_gesture, left_gesture,
+                right_score, left_score, score, frame_metrics) in enumerate(records):
+            if frame_pose is not None:
+                detected[i] = 1
+                pose[i] = frame_pose
+            if frame_hands is not None:
+                hands_ran[i] = 1
+                hands[i] = frame_hands
+            # Same order as HAND_SIDES
+            gestures[i] = (self._gesture_code(right_gesture), self._gesture_code(left_gesture))
+            gesture_scores[i] = (round(right_score * SCORE_SCALE), round(left_score * SCORE_SCALE))
+            if score is not None:
+                scores[i] = score
+            metrics.append(_round_metrics(frame_metrics))
+
+        sections = [
+            np.diff(timestamps, prepend=0).tobytes(),
+            detected.tobytes(),
+            _encode_deltas(_quantize(pose)),
+            hands_ran.tobytes(),
+            # Only the frames the gesture recognizer ran on
+            _encode_deltas(_quantize(hands[hands_ran.astype(bool)])),
+            gestures.tobytes(),
+            gesture_scores.tobytes(),
+            scores.tobytes(),
+            json.dumps(metrics, separators=(",", ":")).encode()
+        ]
+        return SECTION_TABLE.pack(count, *(len(section) for section in sections)) + b"".join(sections)
+
+    def _write_index(self):
+        labels = [None] * len(self._gesture_codes)
+        for label, code in self._gesture_codes.items():
+            labels[code] = label
+        index = {
+            "version": FORMAT_VERSION,
+            "created": time.strftime("%Y%m%d-%H%M%S"),
+            "metadata": self.metadata,
+            "gesture_labels": labels,
+            "segments": self._segments
+        }
+        data = json.dumps(index).encode()
+        offset = self._file.tell()
+        self._file.write(data)
+        self._file.write(FOOTER.pack(offset, len(data), END_MAGIC))
+
+
+class SessionSegment:
+    """
+    Decoded frames of one exercise side.
+
+    timestamps_ms: (T,) float64. detected: (T,) bool, pose: (T, 33, 4) float32
+    (NaN where no pose was detected). hands_ran: (T,) bool, hands:
+    (T, 2, 21, 3) float32 in HAND_SIDES order. gestures: (T, 2) labels,
+    gesture_scores: (T, 2) float32. scores: (T,) int8, -1 where the frame was
+    not scored. metrics: list of per-frame metric dicts.
+    """
+    def __init__(self, info, timestamps_ms, detected, pose, hands_ran, hands, gestures, gesture_scores,
+                 scores, metrics):
+        self.exercise_id = info["exercise_id"]
+        self.phase = info["phase"]
+        self.side = info["side"]
+        self.timestamps_ms = timestamps_ms
+        self.detected = detected
+        self.pose = pose
+        self.hands_ran = hands_ran
+        self.hands = hands
+        self.gestures = gestures
+        self.gesture_scores = gesture_scores
+        self.scores = scores
+        self.metrics = metrics
+
+    def __len__(self):
+        return len(self.timestamps_ms)
+
+    def landmark_frames(self):
+        """LandmarkFrame per recorded frame, None where no pose was detected"""
+        for i in range(len(self)):
+            if not self.detected[i]:
+                yield None
+                continue
+            frame = LandmarkFrame(self.pose[i], timestamp=self.timestamps_ms[i] / 1000)
+            if self.hands_ran[i]:
+                frame.hands = self.hands[i]
+                for side_index, side in enumerate(HAND_SIDES):
+                    frame.set_gesture(side, self.gestures[i][side_index],
+                                      float(self.gesture_scores[i, side_index]))
+            yield frame
+
+
+class SessionArchive:
+    """
+    Read access to a session archive. The file is memory-mapped and only the
+    chunks of the requested segment are decompressed.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty")
+        magic, version = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or len(self._map) < HEADER.size + FOOTER.size:
+            self.close()
+            raise ValueError(f"{path} is not a session archive")
+        offset, length, end_magic = FOOTER.unpack_from(self._map, len(self._map) - FOOTER.size)
+        if end_magic != END_MAGIC:
+            self.close()
+            raise ValueError(f"{path} has no index, the recording was not closed or failed")
+        self.index = json.loads(bytes(self._map[offset:offset + length]))
+        self.metadata = self.index["metadata"]
+        self.gesture_labels = self.index["gesture_labels"]
+        self._labels = np.array(self.gesture_labels, dtype=object)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    @property
+    def segments(self):
+        """Index entries: exercise_id, phase, side, frames, start_ms, end_ms, chunks"""
+        return self.index["segments"]
+
+    def find_segment(self, exercise_id, phase):
+        for info in self.segments:
+            if info["exercise_id"] == exercise_id and info["phase"] == phase:
+                return info
+        return None
+
+    def read_segment(self, exercise_id, phase):
+        """Decode one segment, or return None if it was not recorded"""
+        info = self.find_segment(exercise_id, phase)
+        return None if info is None else self.decode(info)
+
+    def decode(self, info):
+        parts = [self._decode_chunk(offset, length) for offset, length, _ in info["chunks"]]
+        if not parts:
+            return SessionSegment(info, *self._empty_columns())
+        columns = list(zip(*parts))
+        arrays = [np.concatenate(column) for column in columns[:-1]]
+        metrics = [item for column in columns[-1] for item in column]
+        return SessionSegment(info, *arrays, metrics)
+
+    def _decode_chunk(self, offset, length):
+        tag, count, payload_length = CHUNK_HEADER.unpack_from(self._map, offset)
+        if tag != CHUNK_TAG:
+            raise ValueError(f"Corrupt chunk at byte {offset} of {self.path}")
+        start = offset + CHUNK_HEADER.size
+        raw = zlib.decompress(self._map[start:start + payload_length])
+        count, *lengths = SECTION_TABLE.unpack_from(raw, 0)
+        sections = {}
+        position = SECTION_TABLE.size
+        for name, section_length in zip(SECTIONS, lengths):
+            sections[name] = raw[position:position + section_length]
+            position += section_length
+
+        hands_ran = np.frombuffer(sections["hands_ran"], dtype=np.uint8).astype(bool)
+        hands = np.full((count, len(HAND_SIDES), NUM_HAND_LANDMARKS, 3), np.nan, dtype=np.float32)
+        hands[hands_ran] = _dequantize(_decode_deltas(sections["hands"], (int(hands_ran.sum()),) + hands.shape[1:]))
+        codes = np.frombuffer(sections["gestures"], dtype=np.uint8).reshape(count, len(HAND_SIDES))
+        return (
+            np.cumsum(np.frombuffer(sections["timestamps"], dtype=np.int64)) / 1000,
+            np.frombuffer(sections["detected"], dtype=np.uint8).astype(bool),
+            _dequantize(_decode_deltas(sections["pose"], (count, NUM_POSE_LANDMARKS, 4))),
+            hands_ran,
+            hands,
+            self._labels[codes],
+            np.frombuffer(sections["gesture_scores"], dtype=np.uint16).reshape(count, -1) / np.float32(SCORE_SCALE),
+            np.frombuffer(sections["scores"], dtype=np.int8).copy(),
+            json.loads(sections["metrics"])
+        )
+
+    def _empty_columns(self):
+        return (np.zeros(0), np.zeros(0, dtype=bool), np.zeros((0, NUM_POSE_LANDMARKS, 4), dtype=np.float32),
+                np.zeros(0, dtype=bool), np.zeros((0, len(HAND_SIDES), NUM_HAND_LANDMARKS, 3), dtype=np.float32),
+                np.zeros((0, len(HAND_SIDES)), dtype=object), np.zeros((0, len(HAND_SIDES)), dtype=np.float32),
+                np.zeros(0, dtype=np.int8), [])
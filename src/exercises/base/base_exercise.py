@@ -1,10 +1,13 @@
 import cv2
 import numpy as np
 import time
+from src.utils.clock import system_clock
 
 class Exercise:
-    def __init__(self, config):
+    def __init__(self, config, clock=None):
         self.config = config
+        # Source of time for timed exercises, replaced when replaying recordings
+        self.clock = clock or system_clock
         self.id = config.get("id", "unknown")
         self.name = config.get("name", "Unknown Exercise")
         self.description = config.get("description", "")
@@ -12,12 +15,14 @@ class Exercise:
         self.reference_image = config.get("reference_image", "")
         self.duration = config.get("duration", 60)
         self.required_stable_frames = config.get("required_stable_frames", 120)
+        self.stabilization_ms = config.get("stabilization_ms")
         self.feedback_prompts = config.get("feedback_prompts", {})
         self.max_score = config.get("max_score", 2)
         self.gesture_required = config.get("gesture_required", False)
 
     def reset(self):
-        self.__init__(self.config)
+        self.__init__(self.config, self.clock)
         
     def evaluate(self, landmarks, side_to_assess):
+        """Score a LandmarkFrame, returns (score, metrics)"""
         raise NotImplementedError("Subclasses must implement evaluate method") 
\ No newline at end of file
@@ -0,0 +1,145 @@
+import numpy as np
+from src.core.landmark_frame import X, Y, Z
+from src.exercises.criteria.kinematic_features import (
+    SIDES, SIDE_ROWS, SHOULDER, ELBOW, WRIST, INDEX, THUMB, PINKY, KNEE, OPPOSITE_SHOULDER, NOSE_ROW,
+    FLEXION_DEPTH_OFFSET, PRONATION_X_THRESHOLD, PRONATION_Y_THRESHOLD)
+
+# Array versions of the criteria for whole recordings.
+#
+# Every function takes a (T, 33, 4) array of x/y/z/visibility poses and a side:
+# "left" or "right" returns a (T,) column, "both" a (T, 2) array with the left
+# side first. The formulas mirror KinematicFeatures step by step, so the
+# results match the per-frame criteria up to the last bit of the angles
+# (NumPy's arccos and libm's acos round differently).
+
+
+def stack_poses(landmark_frames):
+    """(T, 33, 4) array from a sequence of LandmarkFrames"""
+    return np.stack([frame.pose for frame in landmark_frames])
+
+
+def _side_columns(side):
+    if side == "both":
+        return [0, 1]
+    if side not in SIDES:
+        raise ValueError(f"side must be 'left', 'right' or 'both', got {side!r}")
+    return [SIDES.index(side)]
+
+
+def _gather(poses, side):
+    """(T, S, len(ROWS), 3) float64 rows of the requested sides and their (S,) is-left mask"""
+    poses = np.asarray(poses)
+    if poses.ndim != 3 or poses.shape[1:] != (33, 4):
+        raise ValueError(f"poses must have shape (T, 33, 4), got {poses.shape}")
+    columns = _side_columns(side)
+    rows = poses[:, SIDE_ROWS[columns], :3].astype(np.float64)
+    return rows, np.array([SIDES[column] == "left" for column in columns])
+
+
+def _result(values, side):
+    return values if side == "both" else values[:, 0]
+
+
+def _acos_degrees(cosine):
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+def _angle_from_down(dx, dy):
+    """Angle between (dx, dy) and the downward axis (0, 1), and whether the vector is non-zero"""
+    norm = np.sqrt(dx * dx + dy * dy)
+    valid = norm != 0
+    return _acos_degrees(dy / np.where(valid, norm, 1.0)), valid
+
+
+def shoulder_abduction(poses, side="both"):
+    rows, is_left = _gather(poses, side)
+    dx = rows[..., ELBOW, X] - rows[..., SHOULDER, X]
+    dy = rows[..., ELBOW, Y] - rows[..., SHOULDER, Y]
+    angle, valid = _angle_from_down(dx, dy)
+    sign = np.where((dx < 0) == is_left, -1.0, 1.0)
+    return _result(np.where(valid, angle * sign, 0.0), side)
+
+
+def shoulder_flexion(poses, side="both"):
+    rows, _ = _gather(poses, side)
+    dz = rows[..., ELBOW, Z] - rows[..., SHOULDER, Z] + FLEXION_DEPTH_OFFSET
+    dy = rows[..., ELBOW, Y] - rows[..., SHOULDER, Y]
+    angle, valid = _angle_from_down(dz, dy)
+    return _result(np.where(valid, angle, 0.0), side)
+
+
+def shoulder_elevation(poses, side="both"):
+    rows, is_left = _gather(poses, side)
+    dx = rows[..., OPPOSITE_SHOULDER, X] - rows[..., SHOULDER, X]
+    dy = rows[..., OPPOSITE_SHOULDER, Y] - rows[..., SHOULDER, Y]
+    norm = np.sqrt(dx * dx + dy * dy)
+    valid = norm != 0
+    cosine = dx / np.where(valid, norm, 1.0)
+    angle = _acos_degrees(np.where(is_left, -cosine, cosine))
+    angle = np.where(rows[..., OPPOSITE_SHOULDER, Y] > rows[..., SHOULDER, Y], angle, -angle)
+    return _result(np.where(valid, angle, 0.0), side)
+
+
+def elbow_flexion(poses, side="both", plane="frontal"):
+    rows, _ = _gather(poses, side)
+    horizontal = X if plane == "frontal" else Z
+    ux = rows[..., SHOULDER, horizontal] - rows[..., ELBOW, horizontal]
+    uy = rows[..., SHOULDER, Y] - rows[..., ELBOW, Y]
+    vx = rows[..., WRIST, horizontal] - rows[..., ELBOW, horizontal]
+    vy = rows[..., WRIST, Y] - rows[..., ELBOW, Y]
+    u_norm = np.sqrt(ux * ux + uy * uy)
+    v_norm = np.sqrt(vx * vx + vy * vy)
+    valid = (u_norm != 0) & (v_norm != 0)
+    u_norm = np.where(valid, u_norm, 1.0)
+    v_norm = np.where(valid, v_norm, 1.0)
+    angle = _acos_degrees((ux / u_norm) * (vx / v_norm) + (uy / u_norm) * (vy / v_norm))
+    return _result(np.where(valid, angle, 0.0), side)
+
+
+def _planar_distance(rows, a, b):
+    dx = rows[..., a, X] - rows[..., b, X]
+    dy = rows[..., a, Y] - rows[..., b, Y]
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def index_knee_distance(poses, side="both"):
+    rows, _ = _gather(poses, side)
+    return _result(_planar_distance(rows, INDEX, KNEE), side)
+
+
+def index_nose_distance(poses, side="both"):
+    rows, _ = _gather(poses, side)
+    return _result(_planar_distance(rows, INDEX, NOSE_ROW), side)
+
+
+def forearm_pronation_x(poses, side="both"):
+    rows, is_left = _gather(poses, side)
+    thumb_x, index_x, pinky_x = rows[..., THUMB, X], rows[..., INDEX, X], rows[..., PINKY, X]
+    pronated = np.where(is_left, pinky_x < thumb_x, pinky_x > thumb_x)
+    classes = np.where(np.abs(index_x - thumb_x) < PRONATION_X_THRESHOLD, 1, np.where(pronated, 2, 0))
+    return _result(classes, side)
+
+
+def forearm_pronation_y(poses, side="both"):
+    rows, _ = _gather(poses, side)
+    thumb_y, pinky_y = rows[..., THUMB, Y], rows[..., PINKY, Y]
+    classes = np.where(np.abs(thumb_y - pinky_y) < PRONATION_Y_THRESHOLD, 1, np.where(thumb_y > pinky_y, 2, 0))
+    return _result(classes, side)
+
+
+BATCH_FEATURES = {
+    "shoulder_abduction": shoulder_abduction,
+    "shoulder_flexion": shoulder_flexion,
+    "shoulder_elevation": shoulder_elevation,
+    "elbow_flexion_frontal": lambda poses, side="both": elbow_flexion(poses, side, "frontal"),
+    "elbow_flexion_sagittal": lambda poses, side="both": elbow_flexion(poses, side, "sagittal"),
+    "index_knee_distance": index_knee_distance,
+    "index_nose_distance": index_nose_distance,
+    "forearm_pronation_x": forearm_pronation_x,
+    "forearm_pronation_y": forearm_pronation_y
+}
+
+
+def compute_features(poses, side="both", names=None):
+    """Feature columns of a recording, {name: (T,) or (T, 2) array}, for all features or `names`"""
+    return {name: BATCH_FEATURES[name](poses, side) for name in (names or BATCH_FEATURES)}
@@ -0,0 +1,184 @@
+import math
+import numpy as np
+from src.config.landmarks import LEFT_LANDMARKS, RIGHT_LANDMARKS, NOSE
+from src.core.landmark_frame import X, Y, Z
+
+# Side order of the gathered rows
+SIDES = ("left", "right")
+
+# Landmark rows the criteria read, per side
+ROWS = ("SHOULDER", "ELBOW", "WRIST", "INDEX", "THUMB", "PINKY", "KNEE", "OPPOSITE_SHOULDER", "NOSE")
+SHOULDER, ELBOW, WRIST, INDEX, THUMB, PINKY, KNEE, OPPOSITE_SHOULDER, NOSE_ROW = range(len(ROWS))
+
+
+def _side_rows(side_dict, opposite_dict):
+    return [side_dict[name] for name in ROWS[:OPPOSITE_SHOULDER]] + [opposite_dict["SHOULDER"], NOSE]
+
+
+# (2, len(ROWS)) pose indices, left side first
+SIDE_ROWS = np.array([_side_rows(LEFT_LANDMARKS, RIGHT_LANDMARKS),
+                      _side_rows(RIGHT_LANDMARKS, LEFT_LANDMARKS)], dtype=np.intp)
+
+# Offset that compensates MediaPipe's depth estimate of the elbow
+FLEXION_DEPTH_OFFSET = 0.07
+PRONATION_X_THRESHOLD = 0.0045
+PRONATION_Y_THRESHOLD = 0.005
+
+
+def _acos_degrees(cosine):
+    # Rounding can push the dot product of two unit vectors just past +-1
+    return math.degrees(math.acos(min(1.0, max(-1.0, cosine))))
+
+
+# Scalar features of one side. `rows` holds the ROWS landmarks as [x, y, z]
+# lists of Python floats: on 2- and 3-element vectors plain float math is an
+# order of magnitude cheaper than creating NumPy arrays.
+
+def shoulder_abduction(rows, side):
+    shoulder, elbow = rows[SHOULDER], rows[ELBOW]
+    dx = elbow[X] - shoulder[X]
+    dy = elbow[Y] - shoulder[Y]
+    if dx == 0 and dy == 0:
+        return 0
+    # Angle between the upper arm and the downward axis (0, 1)
+    angle = _acos_degrees(dy / math.sqrt(dx * dx + dy * dy))
+    # The cross product of the downward axis with the upper arm has the sign of -dx
+    if side == "left":
+        return -angle if dx < 0 else angle
+    return angle if dx < 0 else -angle
+
+
+def shoulder_flexion(rows, side):
+    shoulder, elbow = rows[SHOULDER], rows[ELBOW]
+    dz = elbow[Z] - shoulder[Z] + FLEXION_DEPTH_OFFSET
+    dy = elbow[Y] - shoulder[Y]
+    if dz == 0 and dy == 0:
+        return 0
+    return _acos_degrees(dy / math.sqrt(dz * dz + dy * dy))
+
+
+def shoulder_elevation(rows, side):
+    shoulder, opposite_shoulder = rows[SHOULDER], rows[OPPOSITE_SHOULDER]
+    dx = opposite_shoulder[X] - shoulder[X]
+    dy = opposite_shoulder[Y] - shoulder[Y]
+    if dx == 0 and dy == 0:
+        return 0
+    # Angle between the shoulder line and the horizontal pointing away from the side
+    cosine = dx / math.sqrt(dx * dx + dy * dy)
+    angle = _acos_degrees(-cosine if side == "left" else cosine)
+    return angle if opposite_shoulder[Y] > shoulder[Y] else -angle
+
+
+def elbow_flexion(rows, side, plane="frontal"):
+    shoulder, elbow, wrist = rows[SHOULDER], rows[ELBOW], rows[WRIST]
+    horizontal = X if plane == "frontal" else Z
+    ux = shoulder[horizontal] - elbow[horizontal]
+    uy = shoulder[Y] - elbow[Y]
+    vx = wrist[horizontal] - elbow[horizontal]
+    vy = wrist[Y] - elbow[Y]
+    u_norm = math.sqrt(ux * ux + uy * uy)
+    v_norm = math.sqrt(vx * vx + vy * vy)
+    if u_norm == 0 or v_norm == 0:
+        return 0
+    return _acos_degrees((ux / u_norm) * (vx / v_norm) + (uy / u_norm) * (vy / v_norm))
+
+
+def _planar_distance(a, b):
+    dx = a[X] - b[X]
+    dy = a[Y] - b[Y]
+    return math.sqrt(dx * dx + dy * dy)
+
+
+def index_knee_distance(rows, side):
+    return _planar_distance(rows[INDEX], rows[KNEE])
+
+
+def index_nose_distance(rows, side):
+    return _planar_distance(rows[INDEX], rows[NOSE_ROW])
+
+
+def forearm_pronation_x(rows, side):
+    thumb_x, index_x, pinky_x = rows[THUMB][X], rows[INDEX][X], rows[PINKY][X]
+    # Neutral when index and thumb are aligned, pronated when the pinky is on
+    # the outer side of the thumb, supinated otherwise
+    if abs(index_x - thumb_x) < PRONATION_X_THRESHOLD:
+        return 1
+    if side == "left":
+        return 2 if pinky_x < thumb_x else 0
+    return 2 if pinky_x > thumb_x else 0
+
+
+def forearm_pronation_y(rows, side):
+    thumb_y, pinky_y = rows[THUMB][Y], rows[PINKY][Y]
+    # Neutral when thumb and pinky are level, pronated when the thumb is lower in the image
+    if abs(thumb_y - pinky_y) < PRONATION_Y_THRESHOLD:
+        return 1
+    return 2 if thumb_y > pinky_y else 0
+
+
+FEATURES = {
+    "shoulder_abduction": shoulder_abduction,
+    "shoulder_flexion": shoulder_flexion,
+    "shoulder_elevation": shoulder_elevation,
+    "elbow_flexion_frontal": lambda rows, side: elbow_flexion(rows, side, "frontal"),
+    "elbow_flexion_sagittal": lambda rows, side: elbow_flexion(rows, side, "sagittal"),
+    "index_knee_distance": index_knee_distance,
+    "index_nose_distance": index_nose_distance,
+    "forearm_pronation_x": forearm_pronation_x,
+    "forearm_pronation_y": forearm_pronation_y
+}
+
+
+class KinematicFeatures:
+    """
+    Joint features of one frame for both sides, computed lazily and memoized.
+
+    The landmarks the criteria need are gathered from the pose array in one
+    indexing step. Each feature is computed for both sides on first access and
+    kept, so exercises that read several features of the same frame, or the
+    same feature twice, pay for the math once.
+    """
+    __slots__ = ("_rows", "_values")
+
+    def __init__(self, pose):
+        self._rows = pose[SIDE_ROWS, :3].tolist()
+        self._values = {}
+
+    def get(self, name, side):
+        values = self._values.get(name)
+        if values is None:
+            feature = FEATURES[name]
+            values = (feature(self._rows[0], "left"), feature(self._rows[1], "right"))
+            self._values[name] = values
+        return values[0 if side == "left" else 1]
+
+    def shoulder_abduction(self, side):
+        return self.get("shoulder_abduction", side)
+
+    def shoulder_flexion(self, side):
+        return self.get("shoulder_flexion", side)
+
+    def shoulder_elevation(self, side):
+        return self.get("shoulder_elevation", side)
+
+    def elbow_flexion(self, side, plane="frontal"):
+        return self.get("elbow_flexion_frontal" if plane == "frontal" else "elbow_flexion_sagittal", side)
+
+    def index_knee_distance(self, side):
+        return self.get("index_knee_distance", side)
+
+    def index_nose_distance(self, side):
+        return self.get("index_nose_distance", side)
+
+    def forearm_pronation_x(self, side):
+        return self.get("forearm_pronation_x", side)
+
+    def forearm_pronation_y(self, side):
+        return self.get("forearm_pronation_y", side)
+
+
+def kinematic_features(landmarks):
+    """KinematicFeatures of a LandmarkFrame, created on first use and kept on the frame"""
+    if landmarks.features is None:
+        landmarks.features = KinematicFeatures(landmarks.pose)
+    return landmarks.features
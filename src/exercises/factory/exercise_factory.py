@@ -7,42 +7,43 @@ from src.exercises.base.base_exercise import Exercise
 
 class ExerciseFactory:
     @staticmethod
-    def create_exercise(config):
+    def create_exercise(config, clock=None):
         """
-        Create an exercise instance based on the exercise ID
+        Create an exercise instance based on the exercise ID. Timed exercises
+        read the time from `clock` (the system clock by default).
         """
         exercise_id = config.get("id", "")
         
         # A2 exercises
         if exercise_id == "a_2_flexor":
-            return A2Flexor(config)
+            return A2Flexor(config, clock)
         elif exercise_id == "a_2_extensor":
-            return A2Extensor(config)
+            return A2Extensor(config, clock)
             
         # A3 exercises
         elif exercise_id == "a_3_shoulder-flexion-0-90":
-            return A3ShoulderFlexion090(config)
+            return A3ShoulderFlexion090(config, clock)
         elif exercise_id == "a_3_pronation-supination-elbow-90":
-            return A3PronationSupinationElbow90(config)
+            return A3PronationSupinationElbow90(config, clock)
             
         # A4 exercises
         elif exercise_id == "a_4_shoulder-abduction-0-90":
-            return A4ShoulderAbduction090(config)
+            return A4ShoulderAbduction090(config, clock)
         elif exercise_id == "a_4_shoulder-flexion-90-180":
-            return A4ShoulderFlexion90180(config)
+            return A4ShoulderFlexion90180(config, clock)
         elif exercise_id == "a_4_pronation-supination-elbow-0":
-            return A4PronationSupinationElbow0(config)
+            return A4PronationSupinationElbow0(config, clock)
         
         # C exercises
         elif exercise_id == "c_flexion":
-            return CFlexion(config)
+            return CFlexion(config, clock)
         elif exercise_id == "c_extension":
-            return CExtension(config)
+            return CExtension(config, clock)
             
         # D exercises
         elif exercise_id == "d_nose_knee":
-            return DNoseKnee(config)
+            return DNoseKnee(config, clock)
             
         # Default fallback - if we don't have a specific implementation,
         # use base class (though it will raise NotImplementedError when evaluated)
-        return Exercise(config) 
\ No newline at end of file
+        return Exercise(config, clock) 
\ No newline at end of file
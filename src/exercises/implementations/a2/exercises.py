@@ -1,9 +1,9 @@
 from src.exercises.base.base_exercise import Exercise
-from src.exercises.criteria.exercise_criteria import calculate_forearm_pronation_x_axis, calculate_shoulder_abduction_adduction, calculate_shoulder_elevation, calculate_shoulder_flexion_extension, calculate_forearm_pronation_y_axis
+from src.exercises.criteria.kinematic_features import kinematic_features
 
 class A2Flexor(Exercise):
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, clock=None):
+        super().__init__(config, clock)
         self.scores = {
             "shoulder_abduction": 0,
             "shoulder_flexion": 0
@@ -12,13 +12,14 @@ class A2Flexor(Exercise):
         self.measurements = {}
         
     def evaluate(self, landmarks, side_to_assess):
+        features = kinematic_features(landmarks)
         # Reset scores and measurements
         for key in self.scores:
             self.scores[key] = 0
         self.measurements = {}
             
         # Shoulder Abduction
-        abduction_angle = calculate_shoulder_abduction_adduction(landmarks, side_to_assess)
+        abduction_angle = features.shoulder_abduction(side_to_assess)
         self.measurements["abduction_angle"] = abduction_angle
         
         if abduction_angle >= 85:
@@ -27,7 +28,7 @@ class A2Flexor(Exercise):
             self.scores["shoulder_abduction"] = 1
             
         # Shoulder Elevation
-        shoulder_height_angle = calculate_shoulder_elevation(landmarks, side_to_assess)
+        shoulder_height_angle = features.shoulder_elevation(side_to_assess)
         self.measurements["shoulder_elevation"] = shoulder_height_angle
         
         if shoulder_height_angle >= 5:
@@ -39,7 +40,7 @@ class A2Flexor(Exercise):
             
 
         # Shoulder Flexion
-        flexion_angle = calculate_shoulder_flexion_extension(landmarks, side_to_assess)
+        flexion_angle = features.shoulder_flexion(side_to_assess)
         self.measurements["flexion_angle"] = flexion_angle
         
         if flexion_angle >= 90:
@@ -49,7 +50,7 @@ class A2Flexor(Exercise):
 
 
         # Forearm supination
-        forearm_pronation = calculate_forearm_pronation_y_axis(landmarks, side_to_assess)
+        forearm_pronation = features.forearm_pronation_y(side_to_assess)
         if forearm_pronation == 0:
             self.scores["forearm_supination"] = 2
         elif forearm_pronation == 1:
@@ -63,8 +64,8 @@ class A2Flexor(Exercise):
         return total_score, self.measurements
 
 class A2Extensor(Exercise):
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, clock=None):
+        super().__init__(config, clock)
         self.scores = {
             "shoulder_abduction": 0,
             "shoulder_flexion": 0
@@ -73,13 +74,14 @@ class A2Extensor(Exercise):
         self.measurements = {}
         
     def evaluate(self, landmarks, side_to_assess):
+        features = kinematic_features(landmarks)
         # Reset scores and measurements
         for key in self.scores:
             self.scores[key] = 0
         self.measurements = {}
         
         # Shoulder Abduction
-        abduction_angle = calculate_shoulder_abduction_adduction(landmarks, side_to_assess)
+        abduction_angle = features.shoulder_abduction(side_to_assess)
         self.measurements["abduction_angle"] = abduction_angle
         
         if abduction_angle < -20:
@@ -88,7 +90,7 @@ class A2Extensor(Exercise):
             self.scores["shoulder_abduction"] = 1
             
         # Shoulder Flexion
-        flexion_angle = calculate_shoulder_flexion_extension(landmarks, side_to_assess)
+        flexion_angle = features.shoulder_flexion(side_to_assess)
         self.measurements["flexion_angle"] = flexion_angle
         
         if flexion_angle <= 45:
@@ -97,7 +99,7 @@ class A2Extensor(Exercise):
             self.scores["shoulder_flexion"] = 1
 
         # Forearm supination
-        forearm_pronation = calculate_forearm_pronation_x_axis(landmarks, side_to_assess)
+        forearm_pronation = features.forearm_pronation_x(side_to_assess)
         self.measurements["forearm_pronation"] = forearm_pronation
 
         self.scores["forearm_pronation"] = forearm_pronation
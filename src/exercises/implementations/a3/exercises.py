@@ -1,15 +1,16 @@
 from src.exercises.base.base_exercise import Exercise
-from src.exercises.criteria.exercise_criteria import calculate_shoulder_flexion_extension, calculate_forearm_pronation_x_axis
+from src.exercises.criteria.kinematic_features import kinematic_features
 
 class A3ShoulderFlexion090(Exercise):
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, clock=None):
+        super().__init__(config, clock)
         
     def evaluate(self, landmarks, side_to_assess):
+        features = kinematic_features(landmarks)
         metrics = {}
         
         # Calculate shoulder flexion angle
-        angle = calculate_shoulder_flexion_extension(landmarks, side_to_assess)
+        angle = features.shoulder_flexion(side_to_assess)
         metrics["shoulder_flexion_angle"] = angle
         # All conditions met         
         if angle >= 85:
@@ -25,15 +26,16 @@ class A3ShoulderFlexion090(Exercise):
 
 
 class A3PronationSupinationElbow90(Exercise):
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, clock=None):
+        super().__init__(config, clock)
         self.pronation_reached = False
         self.supination_reached = False
         
     def evaluate(self, landmarks, side_to_assess):
+        features = kinematic_features(landmarks)
         metrics = {}
 
-        metrics["forearm_pronation_x_axis"] = calculate_forearm_pronation_x_axis(landmarks, side_to_assess)
+        metrics["forearm_pronation_x_axis"] = features.forearm_pronation_x(side_to_assess)
         total_score = 0
 
         if metrics["forearm_pronation_x_axis"] == 2:
@@ -1,15 +1,16 @@
 from src.exercises.base.base_exercise import Exercise
-from src.exercises.criteria.exercise_criteria import calculate_shoulder_abduction_adduction, calculate_shoulder_flexion_extension, calculate_forearm_pronation_x_axis
+from src.exercises.criteria.kinematic_features import kinematic_features
 
 class A4ShoulderAbduction090(Exercise):
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, clock=None):
+        super().__init__(config, clock)
         
     def evaluate(self, landmarks, side_to_assess):
+        features = kinematic_features(landmarks)
         metrics = {}
         
         # Calculate shoulder abduction angle
-        angle = calculate_shoulder_abduction_adduction(landmarks, side_to_assess)
+        angle = features.shoulder_abduction(side_to_assess)
         metrics["shoulder_abduction_angle"] = angle
 
         # All conditions met         
@@ -26,14 +27,15 @@ class A4ShoulderAbduction090(Exercise):
 
 
 class A4ShoulderFlexion90180(Exercise):
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, clock=None):
+        super().__init__(config, clock)
         
     def evaluate(self, landmarks, side_to_assess):
+        features = kinematic_features(landmarks)
         metrics = {}
         
         # Calculate shoulder flexion angle
-        angle = calculate_shoulder_flexion_extension(landmarks, side_to_assess)
+        angle = features.shoulder_flexion(side_to_assess)
         metrics["shoulder_flexion_angle"] = angle
 
         # All conditions met         
@@ -50,15 +52,16 @@ class A4ShoulderFlexion90180(Exercise):
 
 
 class A4PronationSupinationElbow0(Exercise):
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, clock=None):
+        super().__init__(config, clock)
         self.pronation_reached = False
         self.supination_reached = False
         
     def evaluate(self, landmarks, side_to_assess):
+        features = kinematic_features(landmarks)
         metrics = {}
 
-        metrics["forearm_pronation_x_axis"] = calculate_forearm_pronation_x_axis(landmarks, side_to_assess)
+        metrics["forearm_pronation_x_axis"] = features.forearm_pronation_x(side_to_assess)
         total_score = 0
 
         if metrics["forearm_pronation_x_axis"] == 2:
@@ -1,18 +1,19 @@
 from src.exercises.base.base_exercise import Exercise
 
 class CFlexion(Exercise):
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, clock=None):
+        super().__init__(config, clock)
         self.scores = {
             "is_flexed": 0
         }
 
     def evaluate(self, landmarks, side_to_assess):
         metrics = {}
-        if len(landmarks) <= 33:
+        # Gesture recognition did not run on this frame
+        if landmarks.hands is None:
             metrics["gesture"] = None
             return self.scores["is_flexed"], metrics
-        metrics["gesture"] = landmarks[33] if side_to_assess == "right" else landmarks[34]
+        metrics["gesture"] = landmarks.gesture(side_to_assess)
         if metrics["gesture"] == "Closed_Fist" or metrics["gesture"] == "Thumb_Down":
             self.scores["is_flexed"] = 2
         elif metrics["gesture"] == "Open_Palm":
@@ -24,19 +25,20 @@ class CFlexion(Exercise):
         return self.scores["is_flexed"], metrics   
 
 class CExtension(Exercise):
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, clock=None):
+        super().__init__(config, clock)
         self.scores = {
             "is_extended": 0
         }
         
     def evaluate(self, landmarks, side_to_assess):
         metrics = {}
-        if len(landmarks) <= 33:
+        # Gesture recognition did not run on this frame
+        if landmarks.hands is None:
             metrics["gesture"] = None
             return self.scores["is_extended"], metrics
         else:
-            metrics["gesture"] = landmarks[33] if side_to_assess == "right" else landmarks[34]
+            metrics["gesture"] = landmarks.gesture(side_to_assess)
             
         if metrics["gesture"] == "Closed_Fist" or metrics["gesture"] == "Thumb_Down":
             self.scores["is_extended"] = 0
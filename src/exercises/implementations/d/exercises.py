@@ -1,10 +1,9 @@
 from src.exercises.base.base_exercise import Exercise
-from src.exercises.criteria.exercise_criteria import calculate_index_nose_distance, calculate_index_knee_distance
-import time
+from src.exercises.criteria.kinematic_features import kinematic_features
 
 class DNoseKnee(Exercise):
-    def __init__(self, config):
-        super().__init__(config)
+    def __init__(self, config, clock=None):
+        super().__init__(config, clock)
         self.start_time = None
         self.current_state = "start"
         self.times_completed = 0
@@ -13,10 +12,11 @@ class DNoseKnee(Exercise):
         self.repetition_start_time = None
         
     def evaluate(self, landmarks, side_to_assess):
+        features = kinematic_features(landmarks)
         metrics = {}
 
         # Initialize time if not set or reset if 20 seconds have passed
-        current_time = time.time()
+        current_time = self.clock.time()
         if self.start_time is None or current_time - self.start_time > 20:
             self.start_time = current_time
             self.repetition_start_time = current_time
@@ -25,8 +25,8 @@ class DNoseKnee(Exercise):
             self.precision_scores = []
             self.time_scores = []
 
-        nose_distance = calculate_index_nose_distance(landmarks, side_to_assess)
-        knee_distance = calculate_index_knee_distance(landmarks, side_to_assess)
+        nose_distance = features.index_nose_distance(side_to_assess)
+        knee_distance = features.index_knee_distance(side_to_assess)
 
         # State machine for tracking nose-to-knee movement
         if self.current_state == "start":
@@ -1,21 +1,52 @@
 import cv2
 import numpy as np
 import os
+from collections import OrderedDict
+from src.utils.frame_buffers import FrameBufferPool, frame_counter
+from src.utils.instrumentation import instrumentation
+from src.config import settings
 
 
 class ExerciseInterface:
-    def __init__(self, window_name="Fugl Meyer Assessment"):
+    def __init__(self, window_name="Fugl Meyer Assessment", create_window=True):
+        """Without create_window the interface only composes frames (benchmarks, offscreen rendering)"""
         self.window_name = window_name
+        self._buffers = FrameBufferPool()
+        # Static instruction panel layers by (exercise, side, panel size)
+        self._static_layers = OrderedDict()
+        # Index of the canvas composed last, see get_canvas
+        self._canvas_index = 0
 
-        cv2.namedWindow(self.window_name, cv2.WINDOW_GUI_NORMAL)
-        cv2.resizeWindow(self.window_name, 1280, 480)
+        if create_window:
+            cv2.namedWindow(self.window_name, cv2.WINDOW_GUI_NORMAL)
+            cv2.resizeWindow(self.window_name, 1280, 480)
+        
+    def get_canvas(self, height, width):
+        """
+        Split-screen canvas reused across frames, and the camera view (right
+        half) inside it. Two canvases are used in turn, so the one returned
+        for the previous frame stays intact while the next is composed; both
+        are only reallocated when the size changes.
+        """
+        self._canvas_index ^= 1
+        canvas = self._buffers.get(f"canvas{self._canvas_index}", (height, width * 2, 3))
+        return canvas, canvas[:, width:]
         
     def create_split_screen(self, frame, exercise, evaluator, metrics=None, time_remaining=None):
+        """Compose frame and panels into the reusable canvas (valid until the next call)"""
         height, width = frame.shape[:2]
-        canvas = np.zeros((height, width * 2, 3), dtype=np.uint8)
+        canvas, camera_view = self.get_canvas(height, width)
         
         # Copy the frame to the right side
-        canvas[:, width:] = frame
+        np.copyto(camera_view, frame)
+        frame_counter.count_copy(frame.nbytes)
+        
+        self.draw_panels(canvas, exercise, evaluator, metrics, time_remaining)
+        return canvas
+    
+    def draw_panels(self, canvas, exercise, evaluator, metrics=None, time_remaining=None):
+        """Draw the instructions and camera overlay on a canvas whose right half holds the camera frame"""
+        width = canvas.shape[1] // 2
         
         current_side = evaluator.current_assessment_side
         actual_side = evaluator.get_actual_side()
@@ -25,16 +56,17 @@ class ExerciseInterface:
         
         # Add current side and timer to the camera view (right panel)
         self._draw_camera_overlay(canvas[:, width:], current_side, actual_side, time_remaining)
-        
-        return canvas
     
     def _draw_camera_overlay(self, camera_view, current_side, actual_side, time_remaining=None):
         height, width = camera_view.shape[:2]
         
-        overlay = camera_view.copy()
-        cv2.rectangle(overlay, (0, 0), (width, 45), (0, 0, 0), -1)
+        # Darken only the bar behind the text (rows 0-45, as drawn by a
+        # filled rectangle), blending it with a reused black buffer
+        bar = camera_view[:46]
+        overlay = self._buffers.get("overlay", bar.shape)
+        overlay.fill(0)
         alpha = 0.2
-        cv2.addWeighted(overlay, alpha, camera_view, 1 - alpha, 0, camera_view)
+        cv2.addWeighted(overlay, alpha, bar, 1 - alpha, 0, bar)
         
         # Draw side information
         side_color = (0, 255, 255) if current_side == "unaffected" else (0, 200, 255)
@@ -47,9 +79,60 @@ class ExerciseInterface:
             cv2.putText(camera_view, f"Time remaining: {time_remaining}s", (width - 250, 30), 
                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, time_color, 2)
         
+        # Frame rate and stage latencies, to tell a slow camera from a scoring problem
+        if settings.INSTRUMENTATION_OVERLAY and instrumentation.enabled:
+            cv2.putText(camera_view, instrumentation.readout(), (10, height - 12),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1)
+        
     def _draw_instructions(self, canvas, exercise, metrics=None, current_side="affected", actual_side="right"):
+        """
+        Blit the static layer of the panel, then draw the metrics block and the
+        reference image below it (its position follows the number of metrics)
+        """
         height, width = canvas.shape[:2]
+        static_layer, y_position, reference_image = self._static_instructions(
+            exercise, current_side, actual_side, height, width)
+        np.copyto(canvas, static_layer)
+        
+        if metrics:
+            cv2.putText(canvas, "Current Measurements:", (20, y_position), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 1)
+            y_position += 30
+            
+            for key, value in metrics.items():
+                if isinstance(value, float):
+                    metric_text = f"{key}: {value:.2f}"
+                elif isinstance(value, bool):
+                    metric_text = f"{key}: {'Yes' if value else 'No'}"
+                else:
+                    metric_text = f"{key}: {value}"
+                
+                cv2.putText(canvas, metric_text, (30, y_position), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 255), 1)
+                y_position += 25
+            
+            y_position += 15
+        
+        if reference_image is not None:
+            new_height, new_width = reference_image.shape[:2]
+            if y_position + new_height < height - 100:
+                canvas[y_position:y_position+new_height, 20:20+new_width] = reference_image
     
+    def _static_instructions(self, exercise, current_side, actual_side, height, width):
+        """
+        (layer, y below the instructions, resized reference image or None) of
+        an exercise side at a panel size, built once and kept in a small LRU
+        cache: the text layout and the reference image do not change between
+        frames
+        """
+        key = (exercise.get("id"), exercise.get("name"), current_side, actual_side, height, width)
+        cached = self._static_layers.get(key)
+        if cached is not None:
+            self._static_layers.move_to_end(key)
+            return cached
+        
+        canvas = np.empty((height, width, 3), dtype=np.uint8)
+        frame_counter.count_allocation(canvas.nbytes)
         canvas[:, :] = (50, 50, 50)
         
         cv2.putText(canvas, "Exercise Instructions", (20, 40), 
@@ -90,26 +173,7 @@ class ExerciseInterface:
                     cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
             y_position += 40
         
-        if metrics:
-            cv2.putText(canvas, "Current Measurements:", (20, y_position), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 1)
-            y_position += 30
-            
-            for key, value in metrics.items():
-                if isinstance(value, float):
-                    metric_text = f"{key}: {value:.2f}"
-                elif isinstance(value, bool):
-                    metric_text = f"{key}: {'Yes' if value else 'No'}"
-                else:
-                    metric_text = f"{key}: {value}"
-                
-                cv2.putText(canvas, metric_text, (30, y_position), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 255), 1)
-                y_position += 25
-            
-            y_position += 15
-        
-        reference_image_path = None
+        resized_img = None
         reference_images = exercise.get("reference_image", {})
         reference_image_path = reference_images.get(actual_side)
 
@@ -123,12 +187,14 @@ class ExerciseInterface:
                     new_height = int(new_width / aspect_ratio)
                     
                     resized_img = cv2.resize(ref_img, (new_width, new_height))
-                    
-                    y_start = y_position
-                    if y_start + new_height < height - 100:
-                        canvas[y_start:y_start+new_height, 20:20+new_width] = resized_img
             except Exception as e:
                 print(f"Error loading reference image: {e}")
         
+        cached = (canvas, y_position, resized_img)
+        self._static_layers[key] = cached
+        if len(self._static_layers) > settings.INSTRUCTION_PANEL_CACHE_SIZE:
+            self._static_layers.popitem(last=False)
+        return cached
+        
     def display(self, canvas):
         cv2.imshow(self.window_name, canvas) 
\ No newline at end of file
@@ -0,0 +1,25 @@
+import time
+
+
+class SystemClock:
+    """Wall-clock time in seconds, used for live assessments"""
+    def time(self):
+        return time.time()
+
+
+class ReplayClock:
+    """
+    Time in seconds that follows the timestamps of a recorded session, so
+    timed exercises behave the same when replayed faster than real time
+    """
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def set_ms(self, timestamp_ms):
+        self.now = timestamp_ms / 1000
+
+
+system_clock = SystemClock()
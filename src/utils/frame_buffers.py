@@ -0,0 +1,70 @@
+import threading
+import numpy as np
+
+
+class FrameAllocationCounter:
+    """
+    Counts full-frame buffer allocations and copies made on the frame path,
+    so regressions in the per-frame cost show up in the session log.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.frames = 0
+            self.allocations = 0
+            self.allocated_bytes = 0
+            self.copies = 0
+            self.copied_bytes = 0
+
+    def next_frame(self):
+        with self._lock:
+            self.frames += 1
+
+    def count_allocation(self, nbytes):
+        with self._lock:
+            self.allocations += 1
+            self.allocated_bytes += nbytes
+
+    def count_copy(self, nbytes):
+        with self._lock:
+            self.copies += 1
+            self.copied_bytes += nbytes
+
+    def get_stats(self):
+        """Totals and per-frame averages since the last reset"""
+        with self._lock:
+            frames = max(self.frames, 1)
+            return {
+                "frames": self.frames,
+                "allocations": self.allocations,
+                "copies": self.copies,
+                "allocations_per_frame": self.allocations / frames,
+                "copies_per_frame": self.copies / frames,
+                "allocated_bytes_per_frame": self.allocated_bytes / frames,
+                "copied_bytes_per_frame": self.copied_bytes / frames
+            }
+
+
+# Shared by the detector, the renderer and the interface
+frame_counter = FrameAllocationCounter()
+
+
+class FrameBufferPool:
+    """Named image buffers reused across frames, reallocated only when the shape changes"""
+    def __init__(self, counter=frame_counter):
+        self.counter = counter
+        self._buffers = {}
+
+    def get(self, name, shape, dtype=np.uint8):
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+            self.counter.count_allocation(buffer.nbytes)
+        return buffer
+
+    def clear(self):
+        self._buffers = {}
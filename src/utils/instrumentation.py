@@ -0,0 +1,127 @@
+import threading
+import time
+import numpy as np
+from src.config import settings
+
+STAGES = ("capture", "pose", "gesture", "evaluate", "render", "frame")
+
+
+class RollingWindow:
+    """The last `size` values, in a ring buffer"""
+    def __init__(self, size):
+        self._values = np.zeros(size)
+        self.count = 0
+
+    def add(self, value):
+        self._values[self.count % len(self._values)] = value
+        self.count += 1
+
+    def values(self):
+        """Values in the window, in no particular order"""
+        return self._values[:min(self.count, len(self._values))]
+
+
+class Instrumentation:
+    """
+    Per-stage timers of the frame loop. Each stage keeps a rolling window for
+    the live readout and every sample since reset() for the per-exercise
+    summary, together with the effective fps and the share of frames where
+    no pose was detected.
+
+    Stages are timed with `start = instrumentation.time()` followed by
+    `instrumentation.add(stage, start)`. When disabled both return at once,
+    so the calls can stay on the hot path. A tracer (see SessionProfiler)
+    receives every timed stage as a span, even while disabled.
+    """
+    def __init__(self, enabled=settings.INSTRUMENTATION_ENABLED, window=settings.INSTRUMENTATION_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.tracer = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._recent = {stage: RollingWindow(self.window) for stage in STAGES}
+            self._samples = {stage: [] for stage in STAGES}
+            self._frame_times = RollingWindow(self.window)
+            self._recent_misses = RollingWindow(self.window)
+            self.frames = 0
+            self.misses = 0
+            self._start = time.perf_counter()
+
+    def time(self):
+        return time.perf_counter() if self.enabled or self.tracer is not None else 0.0
+
+    def add(self, stage, start):
+        if not self.enabled and self.tracer is None:
+            return
+        end = time.perf_counter()
+        if self.tracer is not None:
+            self.tracer.span(stage, start, end)
+            if not self.enabled:
+                return
+        elapsed_ms = (end - start) * 1000
+        with self._lock:
+            self._recent[stage].add(elapsed_ms)
+            self._samples[stage].append(elapsed_ms)
+
+    def next_frame(self, detected):
+        """Count a finished frame and whether a pose was detected in it"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.frames += 1
+            self.misses += not detected
+            self._recent_misses.add(0.0 if detected else 1.0)
+            self._frame_times.add(time.perf_counter())
+
+    def fps(self):
+        """Effective frame rate over the rolling window"""
+        with self._lock:
+            times = self._frame_times.values()
+            if len(times) < 2 or times.max() <= times.min():
+                return 0.0
+            return (len(times) - 1) / (times.max() - times.min())
+
+    def readout(self):
+        """One-line summary of the rolling window for the camera overlay"""
+        fps = self.fps()
+        with self._lock:
+            parts = [f"{fps:.1f} fps"]
+            for stage in STAGES:
+                values = self._recent[stage].values()
+                if len(values):
+                    parts.append(f"{stage} {np.median(values):.1f}ms")
+            misses = self._recent_misses.values()
+            if len(misses):
+                parts.append(f"miss {misses.mean() * 100:.0f}%")
+        return " | ".join(parts)
+
+    def summary(self, dropped_frames=0):
+        """Performance of the frames since reset(), for the report"""
+        with self._lock:
+            elapsed = time.perf_counter() - self._start
+            stages = {}
+            for stage, samples in self._samples.items():
+                if not samples:
+                    continue
+                values = np.asarray(samples)
+                stages[stage] = {
+                    "samples": len(values),
+                    "mean_ms": round(float(values.mean()), 3),
+                    "p50_ms": round(float(np.percentile(values, 50)), 3),
+                    "p95_ms": round(float(np.percentile(values, 95)), 3),
+                    "max_ms": round(float(values.max()), 3)
+                }
+            return {
+                "frames": self.frames,
+                "fps": round(self.frames / elapsed, 2) if elapsed > 0 else 0.0,
+                "detection_miss_rate": round(self.misses / self.frames, 4) if self.frames else 0.0,
+                "dropped_frames": dropped_frames,
+                "stages": stages
+            }
+
+
+# Shared by the frame loop stages
+instrumentation = Instrumentation()
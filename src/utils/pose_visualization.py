@@ -1,32 +1,115 @@
-import mediapipe as mp
-from mediapipe import solutions
-from mediapipe.framework.formats import landmark_pb2
-
-def draw_landmarks(rgb_image, detection_result):
-    annotated_image = rgb_image.copy()
-    
-    if detection_result is None:
+import cv2
+import numpy as np
+from src.config.landmarks import (LEFT_LANDMARKS, RIGHT_LANDMARKS, LEFT_FACE_LANDMARKS,
+                                  RIGHT_FACE_LANDMARKS, POSE_CONNECTIONS)
+from src.core.landmark_frame import NUM_POSE_LANDMARKS
+from src.utils.frame_buffers import frame_counter
+
+VISIBILITY_THRESHOLD = 0.5
+
+# (35, 2) landmark index pairs, gathered in one go for all connections
+POSE_CONNECTION_INDEX = np.array(POSE_CONNECTIONS, dtype=np.intp)
+
+# BGR colors, matching MediaPipe's default pose style
+WHITE_COLOR = (224, 224, 224)
+LEFT_COLOR = (0, 138, 255)
+RIGHT_COLOR = (231, 217, 0)
+DIMMED_COLOR = (128, 128, 128)
+
+LEFT_INDICES = np.array(LEFT_FACE_LANDMARKS + tuple(LEFT_LANDMARKS.values()), dtype=np.intp)
+RIGHT_INDICES = np.array(RIGHT_FACE_LANDMARKS + tuple(RIGHT_LANDMARKS.values()), dtype=np.intp)
+
+# Landmarks grouped by fill color, so each color is drawn with a single call
+_left_mask = np.zeros(NUM_POSE_LANDMARKS, dtype=bool)
+_left_mask[LEFT_INDICES] = True
+_right_mask = np.zeros(NUM_POSE_LANDMARKS, dtype=bool)
+_right_mask[RIGHT_INDICES] = True
+LANDMARK_COLOR_GROUPS = (
+    (WHITE_COLOR, ~(_left_mask | _right_mask)),
+    (LEFT_COLOR, _left_mask),
+    (RIGHT_COLOR, _right_mask)
+)
+
+# Landmark dots are drawn as zero-length thick polylines: a white border
+# disc with a smaller colored disc on top
+BORDER_DIAMETER = 9
+FILL_DIAMETER = 7
+
+# Landmarks and connections that belong to one arm/leg side, for highlighting
+SIDE_LANDMARK_MASKS = {}
+SIDE_CONNECTION_MASKS = {}
+for _side, _side_dict in (("left", LEFT_LANDMARKS), ("right", RIGHT_LANDMARKS)):
+    _mask = np.zeros(NUM_POSE_LANDMARKS, dtype=bool)
+    _mask[list(_side_dict.values())] = True
+    SIDE_LANDMARK_MASKS[_side] = _mask
+    SIDE_CONNECTION_MASKS[_side] = _mask[POSE_CONNECTION_INDEX].all(axis=1)
+
+
+def landmarks_to_pixels(pose, width, height):
+    """
+    Convert an (N, 4) x/y/z/visibility landmark array to an (N, 2) int32 array
+    of pixel coordinates and an (N,) mask of landmarks that should be drawn
+    (visible and inside the image).
+    """
+    xy = pose[:, :2]
+    visible = ((pose[:, 3] >= VISIBILITY_THRESHOLD)
+               & (xy >= 0).all(axis=1) & (xy <= 1).all(axis=1))
+    points = np.empty((len(pose), 2), dtype=np.int32)
+    points[:, 0] = np.minimum(np.floor(xy[:, 0] * width), width - 1)
+    points[:, 1] = np.minimum(np.floor(xy[:, 1] * height), height - 1)
+    return points, visible
+
+
+def draw_pose(image, points, visible=None, style="default", side=None):
+    """
+    Draw the pose skeleton from pixel coordinates.
+
+    points: (33, 2) int32 pixel coordinates. visible: optional (33,) bool mask.
+    style "default" colors both sides like MediaPipe; "assessed_side" highlights
+    the arm and leg of `side` and dims everything else.
+    """
+    if visible is None:
+        visible = np.ones(len(points), dtype=bool)
+    connection_visible = visible[POSE_CONNECTION_INDEX].all(axis=1)
+    segments = points[POSE_CONNECTION_INDEX]
+
+    highlight = None
+    if style == "assessed_side" and side in SIDE_LANDMARK_MASKS:
+        highlight = SIDE_LANDMARK_MASKS[side]
+        side_connections = SIDE_CONNECTION_MASKS[side]
+        side_color = LEFT_COLOR if side == "left" else RIGHT_COLOR
+        cv2.polylines(image, segments[connection_visible & ~side_connections], False, DIMMED_COLOR, 1)
+        cv2.polylines(image, segments[connection_visible & side_connections], False, side_color, 3)
+    else:
+        cv2.polylines(image, segments[connection_visible], False, WHITE_COLOR, 2)
+
+    # Landmarks on top of the connections
+    dots = np.repeat(points[:, np.newaxis, :], 2, axis=1)
+    if highlight is not None:
+        cv2.polylines(image, dots[visible & ~highlight], False, DIMMED_COLOR, 5)
+        visible = visible & highlight
+    cv2.polylines(image, dots[visible], False, WHITE_COLOR, BORDER_DIAMETER)
+    for color, group in LANDMARK_COLOR_GROUPS:
+        cv2.polylines(image, dots[visible & group], False, color, FILL_DIAMETER)
+    return image
+
+
+def draw_landmarks(image, landmark_frame, in_place=False, style="default", side=None):
+    """
+    Draw the pose skeleton of a LandmarkFrame on a BGR image. With in_place the annotations go
+    straight into `image` (e.g. the display buffer) instead of a copy of it.
+    """
+    if in_place:
+        annotated_image = image
+    else:
+        annotated_image = image.copy()
+        frame_counter.count_allocation(annotated_image.nbytes)
+
+    if landmark_frame is None:
         return annotated_image
-    
-    if detection_result.pose_landmarks:
-        for pose_landmarks in detection_result.pose_landmarks:
-            pose_landmarks_proto = landmark_pb2.NormalizedLandmarkList()
-            # Always take exactly 33 landmarks (0-32), ignore any gesture strings after that
-            pose_landmarks_to_draw = pose_landmarks[:33]
-            
-            pose_landmarks_proto.landmark.extend([
-                landmark_pb2.NormalizedLandmark(
-                    x=landmark.x, 
-                    y=landmark.y, 
-                    z=landmark.z,
-                    visibility=landmark.visibility if hasattr(landmark, 'visibility') else 1.0
-                ) 
-                for landmark in pose_landmarks_to_draw
-            ])
-            solutions.drawing_utils.draw_landmarks(
-                annotated_image,
-                pose_landmarks_proto,
-                solutions.pose.POSE_CONNECTIONS,
-                solutions.drawing_styles.get_default_pose_landmarks_style())
-    
-    return annotated_image 
\ No newline at end of file
+
+    height, width = annotated_image.shape[:2]
+    points, visible = landmarks_to_pixels(landmark_frame.pose, width, height)
+    draw_pose(annotated_image, points, visible, style=style, side=side)
+
+    return annotated_image
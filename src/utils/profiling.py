@@ -0,0 +1,206 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from src.config import settings
+from src.utils.instrumentation import instrumentation
+
+# Environment variables that turn profiling on without code changes:
+#   FMA_TRACE=1 (or a file path)  Chrome trace-event JSON with a span per
+#                                 stage of every frame (chrome://tracing,
+#                                 ui.perfetto.dev)
+#   FMA_PROFILE=cprofile|sample   one profile per exercise side: cProfile
+#                                 .prof of the main thread, or stacks of all
+#                                 threads sampled every FMA_PROFILE_INTERVAL_MS
+#                                 as collapsed stacks (speedscope, flamegraph.pl)
+TRACE_ENV = "FMA_TRACE"
+PROFILE_ENV = "FMA_PROFILE"
+PROFILE_INTERVAL_ENV = "FMA_PROFILE_INTERVAL_MS"
+PROFILE_MODES = ("cprofile", "sample")
+
+
+class StackSampler:
+    """Samples the stacks of all threads on a background thread and counts them"""
+    def __init__(self, interval_ms=5.0):
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="fma-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop_event.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                calls = []
+                while frame is not None:
+                    code = frame.f_code
+                    calls.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                calls.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(calls))] += 1
+
+
+class SessionProfiler:
+    """
+    Deep profiling of a session: a Chrome trace of every timed stage (fed by
+    the instrumentation timers, labelled with the exercise and side) and an
+    optional cProfile or sampling profile per exercise side, written next to
+    the reports.
+    """
+    def __init__(self, trace_path=None, profile_mode=None, profile_interval_ms=5.0,
+                 output_directory=settings.ASSESSMENT_REPORTS_DIRECTORY):
+        if profile_mode not in (None,) + PROFILE_MODES:
+            raise ValueError(f"profile_mode must be one of {', '.join(PROFILE_MODES)}")
+        self.trace_path = trace_path
+        self.profile_mode = profile_mode
+        self.profile_interval_ms = profile_interval_ms
+        self.output_directory = output_directory
+        self.profile_paths = []
+        self._session = time.strftime("%Y%m%d-%H%M%S")
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._labels = {}
+        self._events = []
+        # span() is called from the pipeline threads while a flush swaps the list
+        self._events_lock = threading.Lock()
+        self._thread_names = {}
+        self._named_threads = set()
+        self._trace_file = None
+        self._profiler = None
+        self._current = None
+
+    @classmethod
+    def from_environment(cls):
+        """A profiler configured by FMA_TRACE / FMA_PROFILE, or None when neither is set"""
+        trace = os.environ.get(TRACE_ENV, "").strip()
+        profile_mode = os.environ.get(PROFILE_ENV, "").strip().lower() or None
+        if not trace and not profile_mode:
+            return None
+        if profile_mode not in (None,) + PROFILE_MODES:
+            print(f"Ignoring {PROFILE_ENV}={profile_mode}: expected one of {', '.join(PROFILE_MODES)}")
+            profile_mode = None
+        trace_path = None
+        if trace and trace != "0":
+            trace_path = trace if trace != "1" else os.path.join(
+                settings.ASSESSMENT_REPORTS_DIRECTORY, f"trace_{time.strftime('%Y%m%d-%H%M%S')}.json")
+        if trace_path is None and profile_mode is None:
+            return None
+        interval_ms = 5.0
+        if PROFILE_INTERVAL_ENV in os.environ:
+            try:
+                interval_ms = float(os.environ[PROFILE_INTERVAL_ENV])
+            except ValueError:
+                print(f"Ignoring {PROFILE_INTERVAL_ENV}={os.environ[PROFILE_INTERVAL_ENV]}: expected a number "
+                      f"of milliseconds, using {interval_ms}")
+        return cls(trace_path, profile_mode, interval_ms)
+
+    def start(self):
+        if self.trace_path:
+            self._trace_file = open(self.trace_path, "w")
+            # The JSON array format of trace events, which stays loadable
+            # even if the session dies before close() writes the final ]
+            self._trace_file.write("[\n")
+            self._write_events([self._metadata_event("process_name", {"name": "Fugl Meyer Assessment"})])
+            instrumentation.tracer = self
+        return self
+
+    def begin_exercise(self, exercise_id, phase):
+        self._labels = {"exercise": exercise_id, "side": phase}
+        self._current = (exercise_id, phase, time.perf_counter())
+        if self.profile_mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profile_mode == "sample":
+            self._profiler = StackSampler(self.profile_interval_ms)
+            self._profiler.start()
+
+    def end_exercise(self):
+        if self._current is None:
+            return
+        exercise_id, phase, start = self._current
+        self._current = None
+        if self._trace_file is not None:
+            self.span("exercise", start, time.perf_counter())
+            self._flush_trace()
+        if self._profiler is not None:
+            base = os.path.join(self.output_directory, f"profile_{self._session}_{exercise_id}_{phase}")
+            if self.profile_mode == "cprofile":
+                self._profiler.disable()
+                path = base + ".prof"
+                self._profiler.dump_stats(path)
+            else:
+                self._profiler.stop()
+                path = base + ".collapsed"
+                self._profiler.dump(path)
+            self.profile_paths.append(path)
+            self._profiler = None
+
+    def span(self, name, start, end):
+        """A complete event from perf_counter start to end, on the calling thread"""
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            # Named now, as the thread may have finished by the next flush
+            self._thread_names[thread_id] = threading.current_thread().name
+        with self._events_lock:
+            self._events.append((name, start, end, thread_id, self._labels))
+
+    def close(self):
+        self.end_exercise()
+        if self._trace_file is not None:
+            instrumentation.tracer = None
+            self._flush_trace()
+            self._trace_file.write(json.dumps(self._metadata_event("trace_end", {})) + "\n]\n")
+            self._trace_file.close()
+            self._trace_file = None
+
+    def _flush_trace(self):
+        with self._events_lock:
+            events, self._events = self._events, []
+        # Name the lanes of the threads that produced spans
+        for thread_id in {event[3] for event in events} - self._named_threads:
+            self._named_threads.add(thread_id)
+            event = self._metadata_event("thread_name", {"name": self._thread_names[thread_id]})
+            self._write_events([dict(event, tid=thread_id)])
+        self._write_events([{
+            "name": name,
+            "cat": "frame",
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": self._pid,
+            "tid": thread_id,
+            "args": labels
+        } for name, start, end, thread_id, labels in events])
+        self._trace_file.flush()
+
+    def _write_events(self, events):
+        for event in events:
+            self._trace_file.write(json.dumps(event) + ",\n")
+
+    def _metadata_event(self, name, args):
+        return {"name": name, "ph": "M", "pid": self._pid, "tid": threading.get_ident(), "args": args}
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def square_roi(points, frame_width, frame_height, scale=1.0, min_size=0):
+    """
+    Square pixel region (x0, y0, x1, y1) around a set of normalized (x, y) points.
+
+    The side of the square is the larger extent of the points multiplied by
+    `scale`, and at least `min_size` pixels. The square is shifted to stay
+    inside the frame and clipped when it is larger than the frame.
+    Returns None if there are no points.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if points.size == 0:
+        return None
+
+    xs = points[:, 0] * frame_width
+    ys = points[:, 1] * frame_height
+    x_min, x_max = xs.min(), xs.max()
+    y_min, y_max = ys.min(), ys.max()
+
+    side = max(x_max - x_min, y_max - y_min) * scale
+    side = int(round(min(max(side, min_size, 1), frame_width, frame_height)))
+    center_x = (x_min + x_max) / 2
+    center_y = (y_min + y_max) / 2
+
+    x0 = int(round(center_x - side / 2))
+    y0 = int(round(center_y - side / 2))
+    x0 = min(max(x0, 0), frame_width - side)
+    y0 = min(max(y0, 0), frame_height - side)
+    return x0, y0, x0 + side, y0 + side
+
+
+def crop_roi(image, roi):
+    """Contiguous copy of the region, as required by mp.Image"""
+    x0, y0, x1, y1 = roi
+    return np.ascontiguousarray(image[y0:y1, x0:x1])
+
+
+def roi_to_frame(x, y, roi, frame_width, frame_height):
+    """Map normalized coordinates inside the ROI to normalized frame coordinates"""
+    x0, y0, x1, y1 = roi
+    return (x0 + x * (x1 - x0)) / frame_width, (y0 + y * (y1 - y0)) / frame_height
+
+
+def letterbox_region(frame_width, frame_height, view_width, view_height):
+    """
+    Pixel region (x0, y0, x1, y1) of a view that shows a frame scaled to fit
+    without changing its aspect ratio, centered between black bars
+    """
+    scale = min(view_width / frame_width, view_height / frame_height)
+    width = min(view_width, int(round(frame_width * scale)))
+    height = min(view_height, int(round(frame_height * scale)))
+    x0 = (view_width - width) // 2
+    y0 = (view_height - height) // 2
+    return x0, y0, x0 + width, y0 + height
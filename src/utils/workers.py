@@ -0,0 +1,33 @@
+import os
+
+
+def available_memory_bytes():
+    """Memory available to new processes, or None when it cannot be determined"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def adaptive_worker_count(job_count, worker_memory_mb, requested=None):
+    """
+    Worker processes to start: one per usable core unless a count is
+    requested, limited by the available memory (worker_memory_mb per
+    worker) and the number of jobs
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cores = len(os.sched_getaffinity(0))
+    else:
+        cores = os.cpu_count() or 1
+    workers = requested or cores
+    memory = available_memory_bytes()
+    if memory is not None:
+        workers = min(workers, memory // (worker_memory_mb * 1024 * 1024))
+    return max(1, min(workers, job_count))
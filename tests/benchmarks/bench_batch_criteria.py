@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Throughput of the batch criteria over (T, 33, 4) pose arrays compared with
+scoring the same frames one LandmarkFrame at a time.
+
+Usage: python tests/benchmarks/bench_batch_criteria.py [--frames N] [--repeats N]
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import argparse
+import time
+import numpy as np
+from src.core.landmark_frame import LandmarkFrame
+from src.exercises.criteria import batch_criteria
+from src.exercises.criteria.kinematic_features import FEATURES, kinematic_features
+
+
+def synthetic_poses(frames, seed=0):
+    rng = np.random.default_rng(seed)
+    poses = np.empty((frames, 33, 4), dtype=np.float32)
+    poses[..., :3] = rng.uniform(0, 1, (frames, 33, 3))
+    poses[..., 3] = 1.0
+    return poses
+
+
+def best_time(function, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def per_frame(poses, names, side):
+    for pose in poses:
+        features = kinematic_features(LandmarkFrame(pose))
+        for name in names:
+            features.get(name, side)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    poses = synthetic_poses(args.frames)
+    # Per-frame scoring is slow enough that a slice gives a stable estimate
+    sample = poses[:min(len(poses), 2000)]
+    names = list(FEATURES)
+
+    rows = [
+        ("per-frame, all features, one side", len(sample),
+         best_time(lambda: per_frame(sample, names, "right"), args.repeats)),
+        ("batch, all features, one side", len(poses),
+         best_time(lambda: batch_criteria.compute_features(poses, "right"), args.repeats)),
+        ("batch, all features, both sides", len(poses),
+         best_time(lambda: batch_criteria.compute_features(poses, "both"), args.repeats)),
+        ("batch, shoulder abduction, one side", len(poses),
+         best_time(lambda: batch_criteria.shoulder_abduction(poses, "right"), args.repeats)),
+    ]
+
+    baseline = rows[0][1] / rows[0][2]
+    print(f"{'scoring':<40}{'frames/s':>14}{'speedup':>10}")
+    for name, frames, seconds in rows:
+        fps = frames / seconds
+        print(f"{name:<40}{fps:>14,.0f}{fps / baseline:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
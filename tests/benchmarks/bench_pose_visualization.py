@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the NumPy/OpenCV pose renderer against the previous
+protobuf + mediapipe.solutions.drawing_utils implementation.
+
+Usage: python tests/benchmarks/bench_pose_visualization.py [--iterations N]
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import argparse
+import time
+import numpy as np
+from mediapipe.tasks.python.components.containers import landmark as landmark_module
+from src.core.landmark_frame import LandmarkFrame
+from src.utils.pose_visualization import draw_landmarks, draw_pose, landmarks_to_pixels
+
+
+def legacy_draw_landmarks(image, pose_landmarks):
+    """The protobuf-based renderer this module replaced, kept for comparison"""
+    from mediapipe import solutions
+    from mediapipe.framework.formats import landmark_pb2
+
+    annotated_image = image.copy()
+    pose_landmarks_proto = landmark_pb2.NormalizedLandmarkList()
+    pose_landmarks_proto.landmark.extend([
+        landmark_pb2.NormalizedLandmark(x=landmark.x, y=landmark.y, z=landmark.z,
+                                        visibility=landmark.visibility)
+        for landmark in pose_landmarks[:33]
+    ])
+    solutions.drawing_utils.draw_landmarks(
+        annotated_image,
+        pose_landmarks_proto,
+        solutions.pose.POSE_CONNECTIONS,
+        solutions.drawing_styles.get_default_pose_landmarks_style())
+    return annotated_image
+
+
+def synthetic_pose_landmarks(seed=0):
+    """MediaPipe landmark objects for the legacy renderer"""
+    rng = np.random.default_rng(seed)
+    return [
+        landmark_module.NormalizedLandmark(x=float(x), y=float(y), z=float(z), visibility=float(v))
+        for x, y, z, v in zip(rng.uniform(0.2, 0.8, 33), rng.uniform(0.1, 0.9, 33),
+                              rng.uniform(-0.3, 0.3, 33), rng.uniform(0.6, 1.0, 33))
+    ]
+
+
+def time_call(function, iterations):
+    function()  # Warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    pose_landmarks = synthetic_pose_landmarks()
+    landmark_frame = LandmarkFrame.from_pose_landmarks(pose_landmarks)
+    points, visible = landmarks_to_pixels(landmark_frame.pose, 640, 480)
+
+    results = {
+        "legacy protobuf draw_landmarks": time_call(
+            lambda: legacy_draw_landmarks(image, pose_landmarks), args.iterations),
+        "draw_landmarks (copy)": time_call(
+            lambda: draw_landmarks(image, landmark_frame), args.iterations),
+        "draw_landmarks (in place)": time_call(
+            lambda: draw_landmarks(image, landmark_frame, in_place=True), args.iterations),
+        "draw_pose (pixel array)": time_call(
+            lambda: draw_pose(image, points, visible), args.iterations),
+        "draw_pose (assessed side)": time_call(
+            lambda: draw_pose(image, points, visible, style="assessed_side", side="right"), args.iterations),
+    }
+
+    baseline = results["legacy protobuf draw_landmarks"]
+    print(f"{'renderer':<34}{'us/frame':>12}{'speedup':>10}")
+    for name, microseconds in results.items():
+        print(f"{name:<34}{microseconds:>12.1f}{baseline / microseconds:>9.2f}x")
+
+    # Both renderers should produce (nearly) the same picture
+    legacy = legacy_draw_landmarks(np.zeros_like(image), pose_landmarks)
+    current = draw_landmarks(np.zeros_like(image), landmark_frame)
+    differing = np.count_nonzero((legacy != current).any(axis=2))
+    print(f"\nPixels differing from the legacy renderer: {differing} "
+          f"({differing / (640 * 480) * 100:.3f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
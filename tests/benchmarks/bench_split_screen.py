@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Per-frame allocations of the split-screen compositor against the previous
+implementation, which allocated a new canvas every frame and copied the whole
+camera view to blend the 45-pixel top bar.
+
+Reports the transient bytes allocated per frame (peak traced by tracemalloc
+above the steady state), the full-frame buffers counted by frame_counter and
+the time per frame at 480p, 720p and 1080p.
+
+Usage: python tests/benchmarks/bench_split_screen.py [--iterations N]
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import argparse
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+from src.gui.exercise_interface import ExerciseInterface
+from src.utils.file_utils import load_fugl_meyer_tests
+from src.utils.frame_buffers import frame_counter
+
+RESOLUTIONS = {"480p": (640, 480), "720p": (1280, 720), "1080p": (1920, 1080)}
+
+
+def legacy_create_split_screen(interface, frame, exercise, evaluator, metrics=None, time_remaining=None):
+    """The compositor before the canvases and the bar overlay were reused, kept for comparison"""
+    height, width = frame.shape[:2]
+    canvas = np.zeros((height, width * 2, 3), dtype=np.uint8)
+    frame_counter.count_allocation(canvas.nbytes)
+    canvas[:, width:] = frame
+    frame_counter.count_copy(frame.nbytes)
+
+    current_side = evaluator.current_assessment_side
+    interface._draw_instructions(canvas[:, :width], exercise, metrics, current_side, evaluator.get_actual_side())
+
+    camera_view = canvas[:, width:]
+    overlay = camera_view.copy()
+    frame_counter.count_allocation(overlay.nbytes)
+    cv2.rectangle(overlay, (0, 0), (width, 45), (0, 0, 0), -1)
+    cv2.addWeighted(overlay, 0.2, camera_view, 0.8, 0, camera_view)
+    cv2.putText(camera_view, f"Current side: right ({current_side})", (20, 30),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 200, 255), 2)
+    if time_remaining is not None:
+        cv2.putText(camera_view, f"Time remaining: {time_remaining}s", (width - 250, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    return canvas
+
+
+def measure(compose, iterations):
+    """(transient bytes per frame, frame_counter stats, ms per frame) over the iterations"""
+    # Warm-up: both canvases, the overlay buffer and the cached panel layer
+    # are allocated once
+    compose()
+    compose()
+    frame_counter.reset()
+    tracemalloc.start()
+    peaks = []
+    for _ in range(iterations):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        compose()
+        frame_counter.next_frame()
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    stats = frame_counter.get_stats()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        compose()
+    return float(np.mean(peaks)), stats, (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    exercise = load_fugl_meyer_tests()["exercises"][0]
+    evaluator = SimpleNamespace(current_assessment_side="affected", get_actual_side=lambda: "right")
+    metrics = {"abduction_angle": 95.2, "flexion_angle": 88.1, "forearm_supination": 2}
+    interface = ExerciseInterface(create_window=False)
+
+    print(f"{'resolution':<12}{'compositor':<10}{'traced bytes/frame':>20}{'counted allocs/frame':>22}"
+          f"{'alloc bytes/frame':>19}{'ms/frame':>10}")
+    for name, (width, height) in RESOLUTIONS.items():
+        frame = np.random.default_rng(0).integers(0, 255, (height, width, 3), dtype=np.uint8)
+        compositors = {
+            "legacy": lambda: legacy_create_split_screen(interface, frame, exercise, evaluator, metrics, 20),
+            "current": lambda: interface.create_split_screen(frame, exercise, evaluator, metrics, 20)
+        }
+        for label, compose in compositors.items():
+            traced, stats, ms = measure(compose, args.iterations)
+            print(f"{name:<12}{label:<10}{traced:>20,.0f}{stats['allocations_per_frame']:>22.2f}"
+                  f"{stats['allocated_bytes_per_frame']:>19,.0f}{ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Per-stage latency of the frame path: color conversion, pose detection,
+gesture recognition, gesture merging, exercise evaluation, landmark drawing
+and split-screen composition, over the test images and synthetic frames at
+480p, 720p and 1080p.
+
+Reports p50/p95/p99 latency and throughput per stage, writes them as JSON
+and, given a baseline JSON from an earlier run, exits with status 1 when a
+stage got slower than the allowed regression.
+
+Usage: python tests/benchmarks/bench_stages.py [--iterations N] [--output results.json]
+           [--baseline baseline.json] [--max-regression 0.2] [--metric p95_ms]
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import argparse
+import json
+import os
+import platform
+import time
+from types import SimpleNamespace
+
+import cv2
+import mediapipe as mp
+import numpy as np
+from src.core.frame_sources import SyntheticSource
+from src.core.landmark_frame import LandmarkFrame
+from src.core.pose_detector import PoseDetector
+from src.core.pose_evaluator import PoseEvaluator
+from src.exercises.factory.exercise_factory import ExerciseFactory
+from src.gui.exercise_interface import ExerciseInterface
+from src.utils.file_utils import load_fugl_meyer_tests
+from src.utils.pose_visualization import draw_landmarks
+
+RESOLUTIONS = {"480p": (640, 480), "720p": (1280, 720), "1080p": (1920, 1080)}
+TEST_IMAGES_DIRECTORY = Path(__file__).resolve().parents[1] / "test_images"
+
+
+def latency_stats(samples_ms):
+    samples = np.asarray(samples_ms)
+    mean = float(samples.mean())
+    return {
+        "samples": len(samples),
+        "mean_ms": round(mean, 4),
+        "p50_ms": round(float(np.percentile(samples, 50)), 4),
+        "p95_ms": round(float(np.percentile(samples, 95)), 4),
+        "p99_ms": round(float(np.percentile(samples, 99)), 4),
+        "fps": round(1000 / mean, 1) if mean > 0 else None
+    }
+
+
+def measure(function, iterations, setup=None):
+    """Latency in ms of each call after one warm-up call; setup runs untimed before every call"""
+    if setup:
+        setup()
+    function()
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter_ns()
+        function()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+    return samples
+
+
+def synthetic_landmark_frame(seed=0):
+    """A plausible pose with both hands, used when no person was detected in the input"""
+    rng = np.random.default_rng(seed)
+    pose = np.empty((33, 4), dtype=np.float32)
+    pose[:, 0] = rng.uniform(0.3, 0.7, 33)
+    pose[:, 1] = rng.uniform(0.1, 0.9, 33)
+    pose[:, 2] = rng.uniform(-0.3, 0.3, 33)
+    pose[:, 3] = rng.uniform(0.6, 1.0, 33)
+    frame = LandmarkFrame(pose)
+    frame.empty_hands()
+    frame.hands[:] = rng.uniform(0.2, 0.8, frame.hands.shape)
+    return frame
+
+
+def synthetic_gesture_result(seed=0):
+    """Duck-typed GestureRecognizerResult with both hands, as read by _enhance_landmarks_with_gestures"""
+    rng = np.random.default_rng(seed)
+    category = lambda name, score=0.9: SimpleNamespace(category_name=name, display_name=name, score=score)
+    point = lambda x, y, z: SimpleNamespace(x=float(x), y=float(y), z=float(z))
+    return SimpleNamespace(
+        handedness=[[category("Right")], [category("Left")]],
+        gestures=[[category("Open_Palm")], [category("Closed_Fist")]],
+        hand_landmarks=[[point(*xyz) for xyz in rng.uniform(0, 1, (21, 3))] for _ in range(2)])
+
+
+def load_inputs(images_directory):
+    """(name, [BGR frames]) for the test image set and one synthetic frame per resolution"""
+    inputs = []
+    if images_directory.is_dir():
+        images = [cv2.imread(str(path)) for path in sorted(images_directory.glob("*.png"))]
+        images = [image for image in images if image is not None]
+        if images:
+            inputs.append(("test_images", images))
+    else:
+        print(f"No test images in {images_directory}, using synthetic frames only")
+    for name, (width, height) in RESOLUTIONS.items():
+        source = SyntheticSource(width, height, frame_count=1, prefetch=0)
+        source.open()
+        _, frame, _ = source.read()
+        source.release()
+        inputs.append((name, [frame]))
+    return inputs
+
+
+def load_detector():
+    """PoseDetector in IMAGE mode, and whether its pose and gesture models could be loaded"""
+    detector = PoseDetector(running_mode="IMAGE", adaptive_tier=False)
+    models_loaded = detector.initialize() and detector.load_hand_recognizer()
+    if not models_loaded:
+        print("Models unavailable, skipping the MediaPipe stages (pose_detect, hand_recognize)")
+    return detector, models_loaded
+
+
+def benchmark_input(frames, detector, models_loaded, exercises, interface, iterations):
+    """Latency samples per stage over the frames of one input"""
+    samples = {}
+
+    def add(stage, values):
+        samples.setdefault(stage, []).extend(values)
+
+    for index, frame in enumerate(frames):
+        rgb = np.empty_like(frame)
+        add("cvtColor", measure(lambda: cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb), iterations))
+
+        landmark_frame = gesture_result = None
+        if models_loaded:
+            image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+            add("pose_detect", measure(lambda: detector.detector.detect(image), iterations))
+            add("hand_recognize", measure(lambda: detector.hand_recognizer.recognize(image), iterations))
+            detection = detector.detector.detect(image)
+            if detection.pose_landmarks:
+                landmark_frame = LandmarkFrame.from_pose_landmarks(detection.pose_landmarks[0])
+            result = detector.hand_recognizer.recognize(image)
+            if result.handedness:
+                gesture_result = result
+        # Inputs without a person still time the stages after detection
+        landmark_frame = landmark_frame or synthetic_landmark_frame(index)
+        gesture_result = gesture_result or synthetic_gesture_result(index)
+
+        target = landmark_frame.copy()
+        add("enhance_gestures", measure(lambda: detector._enhance_landmarks_with_gestures(target, gesture_result),
+                                        iterations))
+
+        evaluator = PoseEvaluator("left")
+        for config in exercises:
+            exercise = ExerciseFactory.create_exercise(config)
+            # Without the per-frame feature cache, as for every new frame
+            clear_cache = lambda: setattr(landmark_frame, "features", None)
+            add(f"evaluate[{config['id']}]", measure(lambda: exercise.evaluate(landmark_frame, "left"), iterations,
+                                                     setup=clear_cache))
+
+        canvas = frame.copy()
+        add("draw_landmarks", measure(lambda: draw_landmarks(canvas, landmark_frame, in_place=True), iterations))
+
+        config = exercises[0]
+        evaluator.set_current_exercise(config)
+        metrics = evaluator.current_exercise.evaluate(landmark_frame, "left")[1]
+        add("create_split_screen", measure(
+            lambda: interface.create_split_screen(frame, config, evaluator, metrics, time_remaining=20), iterations))
+    return samples
+
+
+def compare(results, baseline, metric, max_regression):
+    """Stages slower than the baseline by more than max_regression (a fraction)"""
+    regressions = []
+    for input_name, stages in results["inputs"].items():
+        for stage, stats in stages.items():
+            reference = baseline.get("inputs", {}).get(input_name, {}).get(stage)
+            if not reference or not reference.get(metric):
+                continue
+            ratio = stats[metric] / reference[metric]
+            stats["baseline_ratio"] = round(ratio, 3)
+            if ratio > 1 + max_regression:
+                regressions.append((input_name, stage, reference[metric], stats[metric], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50, help="timed calls per stage and frame")
+    parser.add_argument("--images", type=Path, default=TEST_IMAGES_DIRECTORY, help="directory of test images")
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare against")
+    parser.add_argument("--metric", default="p95_ms", choices=["mean_ms", "p50_ms", "p95_ms", "p99_ms"],
+                        help="latency compared against the baseline (default: %(default)s)")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="allowed slowdown against the baseline as a fraction (default: %(default)s)")
+    args = parser.parse_args()
+
+    exercises = load_fugl_meyer_tests()["exercises"]
+    interface = ExerciseInterface(create_window=False)
+    detector, models_loaded = load_detector()
+
+    results = {
+        "environment": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__
+        },
+        "iterations": args.iterations,
+        "inputs": {}
+    }
+    for input_name, frames in load_inputs(args.images):
+        samples = benchmark_input(frames, detector, models_loaded, exercises, interface, args.iterations)
+        results["inputs"][input_name] = {stage: latency_stats(values) for stage, values in samples.items()}
+    detector.close()
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.metric, args.max_regression)
+
+    for input_name, stages in results["inputs"].items():
+        print(f"\n{input_name}")
+        print(f"{'stage':<46}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'fps':>12}{'vs base':>9}")
+        for stage, stats in stages.items():
+            ratio = f"{stats['baseline_ratio']:.2f}x" if "baseline_ratio" in stats else "-"
+            print(f"{stage:<46}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+                  f"{stats['fps']:>12,.0f}{ratio:>9}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    for input_name, stage, reference, current, ratio in regressions:
+        print(f"REGRESSION {input_name}/{stage}: {args.metric} {reference:.3f} -> {current:.3f} ms ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
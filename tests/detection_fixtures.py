@@ -0,0 +1,172 @@
+"""
+Cached detection output of the test images, so criteria and exercise tests
+run against stored landmarks instead of the pose and gesture models.
+
+Each image gets one fixture, tests/fixtures/detections/<image hash>.npz,
+holding the LandmarkFrame the detector produced (or none when no person was
+found) and the hashes of the image and model files and the MediaPipe version
+it came from. A fixture is stale when a model file on disk no longer matches
+the hash it was made with; without the models the fixture is trusted as is.
+MediaPipe is only imported when a fixture has to be (re)generated.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from src.config import settings
+from src.core.landmark_frame import LandmarkFrame
+
+FIXTURES_DIRECTORY = Path(__file__).resolve().parent / "fixtures" / "detections"
+FIXTURE_VERSION = 1
+
+# Model files whose output the fixtures capture
+MODEL_FILES = {
+    "pose": settings.POSE_MODEL_TIERS[settings.POSE_MODEL_TIER]["path"],
+    "gesture": settings.HAND_MODEL_PATH
+}
+
+
+def file_hash(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def model_hashes():
+    """Hash of each model file, None for models not on disk"""
+    return {name: file_hash(path) if os.path.exists(path) else None for name, path in MODEL_FILES.items()}
+
+
+def mediapipe_version():
+    try:
+        from importlib.metadata import version
+        return version("mediapipe")
+    except Exception:
+        return None
+
+
+class DetectionFixture:
+    """Stored detection of one image: its LandmarkFrame (None if no pose was found) and provenance"""
+    def __init__(self, landmark_frame, metadata):
+        self.landmark_frame = landmark_frame
+        self.metadata = metadata
+
+    def is_stale(self, current_model_hashes):
+        """True when a model on disk differs from the one the fixture was made with"""
+        recorded = self.metadata.get("models", {})
+        return any(digest is not None and recorded.get(name) != digest
+                   for name, digest in current_model_hashes.items())
+
+
+class DetectionFixtureCache:
+    def __init__(self, directory=FIXTURES_DIRECTORY):
+        self.directory = Path(directory)
+        self._model_hashes = None
+
+    @property
+    def current_model_hashes(self):
+        # Hashing the heavy pose model takes a moment, so only once per cache
+        if self._model_hashes is None:
+            self._model_hashes = model_hashes()
+        return self._model_hashes
+
+    def path(self, image_hash):
+        return self.directory / f"{image_hash[:20]}.npz"
+
+    def load(self, image_path, check_models=True):
+        """The fixture of an image, or None when there is none or it is stale"""
+        image_hash = file_hash(image_path)
+        path = self.path(image_hash)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                metadata = json.loads(str(data["metadata"]))
+                landmark_frame = None
+                if metadata["detected"]:
+                    hands = data["hands"] if "hands" in data.files else None
+                    landmark_frame = LandmarkFrame(data["pose"], hands, timestamp=0.0)
+                    for side in ("right", "left"):
+                        landmark_frame.set_gesture(side, metadata["gestures"][side],
+                                                   metadata["gesture_scores"][side])
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Ignoring unreadable fixture {path}: {e}")
+            return None
+        fixture = DetectionFixture(landmark_frame, metadata)
+        if metadata.get("image") != image_hash or metadata.get("version") != FIXTURE_VERSION:
+            return None
+        if check_models and fixture.is_stale(self.current_model_hashes):
+            return None
+        return fixture
+
+    def save(self, image_path, landmark_frame):
+        """Store the detection of an image, returns the DetectionFixture"""
+        image_hash = file_hash(image_path)
+        metadata = {
+            "version": FIXTURE_VERSION,
+            "image": image_hash,
+            "image_name": Path(image_path).name,
+            "models": self.current_model_hashes,
+            "mediapipe": mediapipe_version(),
+            "detected": landmark_frame is not None
+        }
+        arrays = {}
+        if landmark_frame is not None:
+            arrays["pose"] = landmark_frame.pose
+            if landmark_frame.hands is not None:
+                arrays["hands"] = landmark_frame.hands
+            metadata["gestures"] = {side: landmark_frame.gesture(side) for side in ("right", "left")}
+            metadata["gesture_scores"] = {side: float(landmark_frame.gesture_score(side))
+                                          for side in ("right", "left")}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(self.path(image_hash), metadata=np.array(json.dumps(metadata)), **arrays)
+        return DetectionFixture(landmark_frame, metadata)
+
+
+def create_detector():
+    """Pose detector for still images with the gesture model, or None when it cannot be set up"""
+    try:
+        from src.core.pose_detector import PoseDetector
+    except ImportError as e:
+        print(f"Cannot detect without MediaPipe: {e}")
+        return None
+    detector = PoseDetector(running_mode="IMAGE", adaptive_tier=False)
+    if not detector.initialize():
+        return None
+    return detector
+
+
+def detect(detector, image_path):
+    """Run the detector on an image file as the exercise tests do"""
+    import cv2
+    frame = cv2.imread(str(image_path))
+    if frame is None:
+        raise ValueError(f"Could not load image: {image_path}")
+    _, landmark_frame = detector.process_frame(frame, detect_gestures=True, hand_side="right")
+    return None if landmark_frame is None else landmark_frame.copy()
+
+
+def landmark_deltas(old, new):
+    """How far a fresh detection moved from a stored one"""
+    if old is None or new is None:
+        return {"detection_changed": (old is None) != (new is None)}
+    pose_delta = np.abs(new.pose[:, :3] - old.pose[:, :3])
+    deltas = {
+        "detection_changed": False,
+        "pose_max": float(pose_delta.max()),
+        "pose_mean": float(pose_delta.mean()),
+        "gestures_changed": [side for side in ("right", "left") if old.gesture(side) != new.gesture(side)]
+    }
+    if old.hands is not None and new.hands is not None:
+        hand_delta = np.abs(new.hands - old.hands)
+        found = ~np.isnan(hand_delta)
+        deltas["hands_max"] = float(hand_delta[found].max()) if found.any() else 0.0
+        deltas["hands_found_changed"] = bool((np.isnan(old.hands) != np.isnan(new.hands)).any())
+    return deltas
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Detector drift check: runs the pose and gesture models on the test images
+again and reports how far the landmarks moved from the stored detection
+fixtures. Meant for MediaPipe or model upgrades; by default it only runs
+when the installed MediaPipe version or a model file differs from the one
+the fixtures were made with.
+
+Exits with status 1 when an image's detection appeared or disappeared, its
+gesture changed, or a pose landmark moved further than --tolerance
+(normalized image units), unless --update rewrites the fixtures.
+
+Usage: python tests/detector_drift.py [--images DIR] [--tolerance 0.02] [--force] [--update]
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import argparse
+
+from detection_fixtures import (DetectionFixtureCache, create_detector, detect, landmark_deltas,
+                                mediapipe_version)
+
+TEST_IMAGES_DIRECTORY = Path(__file__).resolve().parent / "test_images"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", type=Path, default=TEST_IMAGES_DIRECTORY, help="directory of test images")
+    parser.add_argument("--tolerance", type=float, default=0.02,
+                        help="largest accepted pose landmark movement (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="check even if MediaPipe and the models are unchanged")
+    parser.add_argument("--update", action="store_true", help="replace the fixtures with the new detections")
+    args = parser.parse_args()
+
+    images = sorted(args.images.glob("*.png"))
+    if not images:
+        print(f"No test images in {args.images}")
+        return 1
+
+    cache = DetectionFixtureCache()
+    version = mediapipe_version()
+    fixtures = {image: cache.load(image, check_models=False) for image in images}
+    changed = [image for image, fixture in fixtures.items()
+               if fixture is None or fixture.metadata.get("mediapipe") != version
+               or fixture.is_stale(cache.current_model_hashes)]
+    if not changed and not args.force:
+        print(f"All {len(images)} fixtures match MediaPipe {version} and the model files, nothing to check")
+        return 0
+
+    detector = create_detector()
+    if detector is None:
+        print("Could not initialize the pose detector")
+        return 1
+
+    drifted = []
+    print(f"{'image':<24}{'fixture mp':>12}{'pose max':>10}{'pose mean':>11}{'hands max':>11}  notes")
+    try:
+        for image in images:
+            fixture = fixtures[image]
+            landmark_frame = detect(detector, image)
+            if fixture is None:
+                print(f"{image.name:<24}{'-':>12}{'':>10}{'':>11}{'':>11}  new fixture")
+            else:
+                deltas = landmark_deltas(fixture.landmark_frame, landmark_frame)
+                notes = []
+                if deltas["detection_changed"]:
+                    notes.append("detection appeared" if landmark_frame is not None else "detection lost")
+                if deltas.get("gestures_changed"):
+                    notes.append(f"gesture changed ({', '.join(deltas['gestures_changed'])})")
+                if deltas.get("hands_found_changed"):
+                    notes.append("hands found changed")
+                if deltas.get("pose_max", 0.0) > args.tolerance:
+                    notes.append("pose moved")
+                print(f"{image.name:<24}{str(fixture.metadata.get('mediapipe')):>12}"
+                      f"{deltas.get('pose_max', float('nan')):>10.4f}{deltas.get('pose_mean', float('nan')):>11.4f}"
+                      f"{deltas.get('hands_max', float('nan')):>11.4f}  {', '.join(notes)}")
+                if notes and notes != ["hands found changed"]:
+                    drifted.append(image.name)
+            if args.update:
+                cache.save(image, landmark_frame)
+    finally:
+        detector.close()
+
+    if args.update:
+        print(f"\nFixtures of {len(images)} images updated for MediaPipe {version}")
+        return 0
+    if drifted:
+        print(f"\n{len(drifted)} images drifted beyond the tolerance; check their scores and rerun with --update")
+        return 1
+    print(f"\nNo drift beyond {args.tolerance} on {len(images)} images")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
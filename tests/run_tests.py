@@ -1,129 +1,186 @@
 #!/usr/bin/env python3
 """
-Script para ejecutar tests de ejercicios con imágenes de test
+Runs the exercise test images in parallel worker processes, each with its own
+TestExercises instance (and so at most one pose detector, loaded the first
+time an image has no detection fixture). Prints a line per image and writes
+the per-image score, metric deltas and timing as JSON and JUnit XML.
+
+Usage: python tests/run_tests.py [--exercise ID ...] [--images GLOB] [--workers N]
+           [--json results.json] [--junit results.xml]
 """
 
 import sys
-import os
 from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import argparse
+import fnmatch
+import json
+import multiprocessing
+import time
+import unittest
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.utils.workers import adaptive_worker_count
 from test_exercises import TestExercises
 
-def main():
-    print("=== Fugl-Meyer Exercise Test Suite ===\n")
-    
-    # Check if test images directory exists
-    test_images_dir = Path(__file__).parent / "test_images"
-    if not test_images_dir.exists():
-        print("❌ Error: 'test_images' directory not found")
-        return 1
-    
-    # Count available images
-    image_files = list(test_images_dir.glob("*.png"))
-    print(f"📁 Found {len(image_files)} test images")
-    
-    # Initialize detector
-    print("\n🔧 Initializing pose detector...")
+TEST_IMAGES_DIRECTORY = Path(__file__).resolve().parent / "test_images"
+# Roughly what a worker needs with the pose and gesture models loaded
+WORKER_MEMORY_MB = 768
+
+# TestExercises of a worker process, set up once by _init_worker
+_tests = None
+
+
+def _init_worker():
+    global _tests
+    TestExercises.setUpClass()
+    _tests = TestExercises()
+
+
+def metric_deltas(expected, metrics):
+    """
+    How far each checked metric is from its expected value: 0 inside a
+    numeric range, otherwise the signed distance to the nearest bound (or to
+    the exact value); True/False for labels
+    """
+    deltas = {}
+    for name, expected_value in expected.items():
+        actual = metrics.get(name)
+        if actual is None and expected_value is not None:
+            deltas[name] = None
+        elif isinstance(expected_value, tuple) and all(isinstance(v, (int, float)) for v in expected_value):
+            low, high = expected_value
+            deltas[name] = actual - low if actual < low else actual - high if actual > high else 0
+        elif isinstance(expected_value, (int, float)) and isinstance(actual, (int, float)):
+            deltas[name] = actual - expected_value
+        else:
+            allowed = expected_value if isinstance(expected_value, tuple) else (expected_value,)
+            deltas[name] = actual in allowed
+    return deltas
+
+
+def run_image(image_path):
+    """Evaluate one image in a worker, returns its result"""
+    image_path = Path(image_path)
+    exercise_id = _tests.image_to_exercise[image_path.name]
+    result = {"image": image_path.name, "exercise": exercise_id, "status": "error", "score": None,
+              "metrics": {}, "metric_deltas": {}, "errors": []}
+    if image_path.name not in _tests.expected_metrics:
+        result.update(status="skipped", errors=["No expected metrics defined"], seconds=0.0)
+        return result
+    start = time.perf_counter()
     try:
-        # Create test instance and initialize
-        test_instance = TestExercises()
-        test_instance.setUpClass()
+        score, metrics = _tests.process_image_and_evaluate(image_path, exercise_id)
+        if score is None:
+            result.update(status="failed", errors=[f"{metrics}"])
+        else:
+            # Checked on the metrics as evaluated, so None values (e.g. no gesture) are compared too
+            metrics_ok, errors = _tests.check_metrics(image_path.name, metrics)
+            # Plain values only, numpy scalars included, for the JSON output
+            metrics = {name: value.item() if isinstance(value, np.generic) else value for name, value in metrics.items()}
+            result.update(status="passed" if metrics_ok else "failed", score=score, errors=errors or [],
+                          metric_deltas=metric_deltas(_tests.expected_metrics[image_path.name], metrics),
+                          metrics={name: value for name, value in metrics.items()
+                                   if value is None or isinstance(value, (int, float, str, bool))})
+    except unittest.SkipTest as e:
+        result.update(status="skipped", errors=[str(e)])
     except Exception as e:
-        print(f"❌ Error initializing detector: {e}")
-        return 1
-    
-    print("✅ Detector initialized successfully")
-    
-    # Run tests
-    print("\n🧪 Running tests...\n")
-    
-    results = {
-        'passed': 0,
-        'failed': 0,
-        'skipped': 0,
-        'errors': []
-    }
-    
-    for image_file in image_files:
-        image_name = image_file.name
-        
-        # Check mapping
-        if image_name not in test_instance.image_to_exercise:
-            print(f"⚠️  {image_name}: No exercise mapping")
-            results['skipped'] += 1
+        result["errors"] = [f"{type(e).__name__}: {e}"]
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def select_images(images_directory, exercises, pattern):
+    """Mapped test images matching the exercise ids and file name glob"""
+    selected = []
+    for image in sorted(images_directory.glob("*.png")):
+        exercise_id = TestExercises.image_to_exercise.get(image.name)
+        if exercise_id is None:
+            print(f"⚠️  {image.name}: No exercise mapping")
+            continue
+        if exercises and exercise_id not in exercises:
             continue
-        
-        # Check if expected metrics are defined
-        if image_name not in test_instance.expected_metrics:
-            print(f"⚠️  {image_name}: No expected metrics defined")
-            results['skipped'] += 1
+        if pattern and not fnmatch.fnmatch(image.name, pattern):
             continue
-        
-        exercise_id = test_instance.image_to_exercise[image_name]
-        
-        try:
-            # Process image
-            score, metrics = test_instance.process_image_and_evaluate(
-                image_file, exercise_id
-            )
-            
-            if score is None:
-                print(f"❌ {image_name}: No landmarks detected")
-                results['failed'] += 1
-                results['errors'].append(f"{image_name}: No landmarks detected")
-            else:
-                # Check specific metrics if defined
-                metrics_ok, metric_errors = test_instance.check_metrics(image_name, metrics)
-                
-                if metrics_ok:
-                    print(f"✅ {image_name}: {exercise_id}")
-                    results['passed'] += 1
-                else:
-                    print(f"❌ {image_name}: {exercise_id}")
-                    print(f"   📊 Metrics: {metrics}")
-                    print(f"   ⚠️  Metric errors: {metric_errors}")
-                    results['failed'] += 1
-                    error_msg = f"{image_name}: Score {score} | Metrics: {metrics} | Errors: {metric_errors}"
-                    results['errors'].append(error_msg)
-                
-        except Exception as e:
-            print(f"💥 {image_name}: Error - {str(e)}")
-            results['failed'] += 1
-            results['errors'].append(f"{image_name}: {str(e)}")
-    
-    # Final summary
-    print(f"\n{'='*50}")
-    print("📊 TEST SUMMARY")
-    print(f"{'='*50}")
-    print(f"✅ Passed: {results['passed']}")
-    print(f"❌ Failed: {results['failed']}")
-    print(f"⚠️  Skipped: {results['skipped']}")
-    print(f"📈 Total: {results['passed'] + results['failed'] + results['skipped']}")
-    
-    if results['errors']:
-        print(f"\n🔍 Detailed errors:")
-        for error in results['errors']:
-            print(f"   • {error}")
-        
-        print(f"\n📋 Exercise metrics summary:")
-        # Group errors by exercise type
-        exercise_errors = {}
-        for error in results['errors']:
-            # Extract exercise name from error
-            if " - " in error:
-                exercise_part = error.split(" - ")[1].split(" |")[0]
-                if exercise_part not in exercise_errors:
-                    exercise_errors[exercise_part] = []
-                exercise_errors[exercise_part].append(error)
-        
-        for exercise, errors in exercise_errors.items():
-            print(f"\n   {exercise}:")
-            for error in errors:
-                print(f"     {error}")
-    
-    success_rate = (results['passed'] / (results['passed'] + results['failed'])) * 100 if (results['passed'] + results['failed']) > 0 else 0
-    print(f"\n🎯 Success rate: {success_rate:.1f}%")
-    
-    return 0 if results['failed'] == 0 else 1
+        selected.append(image)
+    return selected
+
+
+def write_junit(results, seconds, path):
+    counts = {status: sum(result["status"] == status for result in results)
+              for status in ("failed", "error", "skipped")}
+    suite = ET.Element("testsuite", name="fugl_meyer_exercises", tests=str(len(results)),
+                       failures=str(counts["failed"]), errors=str(counts["error"]),
+                       skipped=str(counts["skipped"]), time=f"{seconds:.3f}")
+    for result in results:
+        case = ET.SubElement(suite, "testcase", classname=result["exercise"], name=result["image"],
+                             time=f"{result['seconds']:.3f}")
+        message = "; ".join(result["errors"])
+        if result["status"] == "failed":
+            ET.SubElement(case, "failure", message=message).text = json.dumps(result["metrics"])
+        elif result["status"] == "error":
+            ET.SubElement(case, "error", message=message)
+        elif result["status"] == "skipped":
+            ET.SubElement(case, "skipped", message=message)
+        ET.SubElement(case, "system-out").text = json.dumps(
+            {"score": result["score"], "metrics": result["metrics"], "metric_deltas": result["metric_deltas"]})
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the exercise test images in parallel")
+    parser.add_argument("--images-dir", type=Path, default=TEST_IMAGES_DIRECTORY, help="directory of test images")
+    parser.add_argument("--exercise", action="append", help="only images of this exercise id (repeatable)")
+    parser.add_argument("--images", help="only images whose file name matches this glob, e.g. 'C-*'")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core, limited by memory)")
+    parser.add_argument("--json", help="write the results as JSON to this path")
+    parser.add_argument("--junit", help="write the results as JUnit XML to this path")
+    args = parser.parse_args()
+
+    print("=== Fugl-Meyer Exercise Test Suite ===\n")
+    if not args.images_dir.exists():
+        print(f"❌ Error: '{args.images_dir}' directory not found")
+        return 1
+    TestExercises.setUpClass()
+    images = select_images(args.images_dir, set(args.exercise or ()), args.images)
+    if not images:
+        print("No test images selected")
+        return 1
+
+    workers = adaptive_worker_count(len(images), WORKER_MEMORY_MB, args.workers)
+    print(f"📁 Running {len(images)} test images on {workers} worker processes\n")
+    start = time.perf_counter()
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker) as pool:
+        for result in pool.map(run_image, [str(image) for image in images]):
+            results.append(result)
+            symbol = {"passed": "✅", "failed": "❌", "skipped": "⚠️ ", "error": "💥"}[result["status"]]
+            print(f"{symbol} {result['image']}: {result['exercise']} score={result['score']} "
+                  f"({result['seconds'] * 1000:.0f} ms)")
+            for error in result["errors"]:
+                print(f"   {error}")
+    seconds = time.perf_counter() - start
+
+    counts = {status: sum(result["status"] == status for result in results)
+              for status in ("passed", "failed", "skipped", "error")}
+    print(f"\n{'=' * 50}")
+    print(" ".join(f"{status}: {count}" for status, count in counts.items()) + f" in {seconds:.1f} s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"seconds": round(seconds, 3), "counts": counts, "results": results}, f, indent=2)
+        print(f"Results saved to {args.json}")
+    if args.junit:
+        write_junit(results, seconds, args.junit)
+        print(f"JUnit XML saved to {args.junit}")
+    return 0 if counts["failed"] == 0 and counts["error"] == 0 else 1
+
 
 if __name__ == "__main__":
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
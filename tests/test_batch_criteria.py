@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import unittest
+import numpy as np
+from src.core.landmark_frame import LandmarkFrame
+from src.config.landmarks import LEFT_LANDMARKS, RIGHT_LANDMARKS
+from src.exercises.criteria import batch_criteria
+from src.exercises.criteria.kinematic_features import KinematicFeatures, FEATURES
+
+# NumPy's arccos and math.acos may differ in the last bit
+ANGLE_TOLERANCE = 1e-9
+
+
+def random_poses(count, seed=0):
+    """Random poses plus the edge cases the criteria branch on"""
+    rng = np.random.default_rng(seed)
+    poses = np.concatenate([rng.uniform(0, 1, (count, 33, 3)), np.ones((count, 33, 1))], axis=2)
+    poses = poses.astype(np.float32)
+    for side_dict in (LEFT_LANDMARKS, RIGHT_LANDMARKS):
+        # Index and thumb aligned (neutral pronation)
+        poses[::7, side_dict["INDEX"], 0] = poses[::7, side_dict["THUMB"], 0]
+        # Elbow on top of the shoulder (degenerate angles)
+        poses[::11, side_dict["ELBOW"]] = poses[::11, side_dict["SHOULDER"]]
+    return poses
+
+
+class TestBatchCriteria(unittest.TestCase):
+    def setUp(self):
+        self.poses = random_poses(500)
+
+    def test_matches_per_frame_features(self):
+        columns = batch_criteria.compute_features(self.poses)
+        for name in FEATURES:
+            expected = np.array([[KinematicFeatures(pose).get(name, side) for side in ("left", "right")]
+                                 for pose in self.poses])
+            with self.subTest(feature=name):
+                self.assertEqual(columns[name].shape, (len(self.poses), 2))
+                np.testing.assert_allclose(columns[name], expected, rtol=0, atol=ANGLE_TOLERANCE)
+
+    def test_single_side_matches_per_frame_features(self):
+        for name in ("shoulder_elevation", "forearm_pronation_x"):
+            expected = np.array([KinematicFeatures(pose).get(name, "right") for pose in self.poses])
+            np.testing.assert_allclose(batch_criteria.compute_features(self.poses, "right", [name])[name],
+                                       expected, rtol=0, atol=ANGLE_TOLERANCE)
+
+    def test_single_side_is_column_of_both(self):
+        both = batch_criteria.shoulder_abduction(self.poses, "both")
+        np.testing.assert_array_equal(batch_criteria.shoulder_abduction(self.poses, "left"), both[:, 0])
+        np.testing.assert_array_equal(batch_criteria.shoulder_abduction(self.poses, "right"), both[:, 1])
+
+    def test_stack_poses(self):
+        frames = [LandmarkFrame(pose) for pose in self.poses[:3]]
+        np.testing.assert_array_equal(batch_criteria.stack_poses(frames), self.poses[:3])
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            batch_criteria.shoulder_flexion(self.poses[0])
+        with self.assertRaises(ValueError):
+            batch_criteria.shoulder_flexion(self.poses, "middle")
+
+
+if __name__ == "__main__":
+    unittest.main()
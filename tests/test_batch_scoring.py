@@ -0,0 +1,147 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import json
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from src.core import batch_scoring
+from src.core.assessment_session import FuglMeyerAssessment
+from src.core.batch_scoring import load_manifest, CompletedJobsLedger
+from src.core.frame_sources import ClockedSource, SyntheticSource
+from src.utils.clock import ReplayClock
+
+
+class FakeDetector:
+    """Finds no pose, so every exercise runs for its whole duration; logs frame timestamps and stream resets"""
+    model_tier = "heavy"
+
+    def __init__(self):
+        self.log = []
+
+    def process_frame(self, frame, detect_gestures=False, timestamp_ms=None, hand_side=None):
+        self.log.append(timestamp_ms)
+        return None, None
+
+    def reset_stream(self):
+        self.log.append("reset")
+
+    def load_hand_recognizer(self):
+        return True
+
+    def preload_hand_recognizer(self):
+        pass
+
+    def release_hand_recognizer(self):
+        pass
+
+
+class TestBatchScoring(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as f:
+            f.write(content if isinstance(content, str) else json.dumps(content))
+        return path
+
+    def test_manifests(self):
+        path = self.write("manifest.json", {"videos": [
+            {"video": "p001.mp4", "affected_side": "left"},
+            {"video": "/videos/p002.mp4", "affected_side": "right", "id": "second",
+             "segments": [{"exercise": "c_flexion", "phase": "affected", "start": 1, "end": 20}]}]})
+        jobs = load_manifest(path)
+        self.assertEqual([job["id"] for job in jobs], ["p001", "second"])
+        self.assertEqual(jobs[0]["video"], os.path.join(self.directory.name, "p001.mp4"))
+        self.assertEqual(jobs[1]["video"], "/videos/p002.mp4")
+        self.assertEqual(len(jobs[1]["segments"]), 1)
+
+        csv_jobs = load_manifest(self.write("manifest.csv", "video,affected_side\na.mp4,left\nb.mp4,right\n"))
+        self.assertEqual([(job["id"], job["affected_side"]) for job in csv_jobs], [("a", "left"), ("b", "right")])
+
+        self.assertIsNone(load_manifest(self.write("bad.json", [{"video": "a.mp4", "affected_side": "up"}])))
+        self.assertIsNone(load_manifest(self.write("dup.csv", "video,affected_side\nx/a.mp4,left\ny/a.mp4,left\n")))
+
+    def test_ledger_resumes_completed_jobs_only(self):
+        path = os.path.join(self.directory.name, "ledger.jsonl")
+        ledger = CompletedJobsLedger(path)
+        ledger.record({"id": "a", "status": "ok"})
+        ledger.record({"id": "b", "status": "failed"})
+        with open(path, "a") as f:
+            f.write('{"id": "c", "sta')  # Interrupted mid-write
+
+        resumed = CompletedJobsLedger(path)
+        self.assertTrue(resumed.is_completed("a"))
+        self.assertFalse(resumed.is_completed("b"))
+        self.assertFalse(resumed.is_completed("c"))
+
+    def test_clocked_source_follows_timestamps_until_end(self):
+        clock = ReplayClock()
+        source = SyntheticSource(32, 24, fps=10, frame_count=10, prefetch=0)
+        source.open()
+        clocked = ClockedSource(source, clock, end_ms=500)
+        times = []
+        while clocked.read()[0]:
+            times.append(clock.time())
+        clocked.release()
+        self.assertEqual(times, [0.1, 0.2, 0.3, 0.4, 0.5])
+
+    def write_video(self, name, frames=30, fps=10):
+        path = os.path.join(self.directory.name, name)
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (32, 24))
+        for _ in range(frames):
+            writer.write(np.zeros((24, 32, 3), dtype=np.uint8))
+        writer.release()
+        return path
+
+    def test_every_video_and_segment_is_timed_from_its_first_frame(self):
+        clock = ReplayClock()
+        assessment = FuglMeyerAssessment(clock=clock)
+        assessment.detector = FakeDetector()
+        exercise = {"id": "a_3_shoulder-flexion-0-90", "name": "Shoulder flexion", "description": "",
+                    "duration": 2, "stabilization_ms": 1000, "max_score": 2}
+        frames = []
+        run_exercise = assessment.run_exercise
+
+        def counted_run_exercise(source, exercise, phase="affected"):
+            start = len(assessment.detector.log)
+            result = run_exercise(source, exercise, phase)
+            frames.append((phase, [t for t in assessment.detector.log[start:] if t != "reset"]))
+            return result
+
+        assessment.run_exercise = counted_run_exercise
+        batch_scoring._worker = (assessment, [exercise], clock)
+        try:
+            # 3 s videos at 10 fps: the first side of the 2 s exercise sees 20
+            # frames (0 to 1.9 s), the second side the 10 left after it
+            for name in ("first.avi", "second.avi"):
+                job = {"id": name, "video": self.write_video(name), "affected_side": "left", "segments": []}
+                batch_scoring._score_video(job, os.path.join(self.directory.name, f"{name}.json"))
+            self.assertEqual([(phase, len(timestamps)) for phase, timestamps in frames],
+                             [("unaffected", 20), ("affected", 10)] * 2)
+
+            # The affected side recorded after the unaffected one, scored first
+            frames.clear()
+            assessment.detector.log.clear()
+            job = {"id": "segments", "video": self.write_video("segments.avi"), "affected_side": "left",
+                   "segments": [{"exercise": exercise["id"], "phase": "affected", "start": 1.5, "end": 2.5},
+                                {"exercise": exercise["id"], "phase": "unaffected", "start": 0.0, "end": 3.0}]}
+            batch_scoring._score_video(job, os.path.join(self.directory.name, "segments.json"))
+        finally:
+            batch_scoring._worker = None
+        self.assertEqual([(phase, timestamps[0], len(timestamps)) for phase, timestamps in frames],
+                         [("affected", 1500.0, 10), ("unaffected", 0.0, 20)])
+        # Seeking back to an earlier segment starts a new detector stream
+        self.assertEqual(assessment.detector.log.count("reset"), 2)
+        self.assertEqual(assessment.detector.log.index("reset", 1), 1 + 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
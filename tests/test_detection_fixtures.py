@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import tempfile
+import unittest
+import numpy as np
+from detection_fixtures import DetectionFixtureCache, landmark_deltas
+from src.core.landmark_frame import LandmarkFrame
+
+
+class TestDetectionFixtures(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.cache = DetectionFixtureCache(self.root / "fixtures")
+        self.cache._model_hashes = {"pose": "aaa", "gesture": None}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def image(self, name, content):
+        path = self.root / name
+        path.write_bytes(content)
+        return path
+
+    def test_round_trip_keyed_by_image_content(self):
+        frame = LandmarkFrame(np.random.default_rng(0).uniform(0, 1, (33, 4)))
+        frame.empty_hands()[0] = 0.5
+        frame.set_gesture("right", "Open_Palm", 0.8)
+        image = self.image("C-E_1.png", b"first image")
+        self.cache.save(image, frame)
+
+        loaded = self.cache.load(image).landmark_frame
+        np.testing.assert_array_equal(loaded.pose, frame.pose)
+        np.testing.assert_array_equal(loaded.hands, frame.hands)
+        self.assertEqual((loaded.right_gesture, loaded.left_gesture), ("Open_Palm", None))
+        self.assertAlmostEqual(loaded.right_gesture_score, 0.8)
+        self.assertEqual(landmark_deltas(frame, loaded)["pose_max"], 0.0)
+
+        # Same name, different content
+        self.assertIsNone(self.cache.load(self.image("C-E_1.png", b"edited image")))
+
+    def test_no_detection_and_stale_models(self):
+        image = self.image("empty.png", b"nobody here")
+        self.cache.save(image, None)
+        fixture = self.cache.load(image)
+        self.assertIsNotNone(fixture)
+        self.assertIsNone(fixture.landmark_frame)
+
+        # A different gesture model on disk makes the fixture stale, a missing one does not
+        self.cache._model_hashes = {"pose": "aaa", "gesture": "bbb"}
+        self.assertIsNone(self.cache.load(image))
+        self.assertIsNotNone(self.cache.load(image, check_models=False))
+        self.cache._model_hashes = {"pose": None, "gesture": None}
+        self.assertIsNotNone(self.cache.load(image))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import cv2
+import numpy as np
+from src.config import settings
+from src.core.assessment_session import FuglMeyerAssessment
+from src.core.landmark_frame import LandmarkFrame
+from src.gui.exercise_interface import ExerciseInterface
+from src.utils.frame_buffers import frame_counter
+
+
+class TestInstructionPanel(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        reference = os.path.join(self.directory.name, "reference.png")
+        cv2.imwrite(reference, np.full((20, 300, 3), 123, dtype=np.uint8))
+        self.exercise = {"id": "c_flexion", "name": "C. Flexion", "description": "Hand",
+                         "instructions": "Close your hand into a fist " * 3,
+                         "reference_image": {"right": reference, "left": reference}}
+        self.interface = ExerciseInterface(create_window=False)
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def render(self, side="affected", actual_side="right", metrics=None):
+        evaluator = SimpleNamespace(current_assessment_side=side, get_actual_side=lambda: actual_side)
+        return self.interface.create_split_screen(self.frame, self.exercise, evaluator, metrics, 20).copy()
+
+    def test_reference_image_read_once_per_side(self):
+        with mock.patch("src.gui.exercise_interface.cv2.imread", wraps=cv2.imread) as imread:
+            first = self.render(metrics={"angle": 10.0})
+            self.render(metrics={"angle": 20.0, "ok": True})
+            self.render("unaffected", "left")
+            again = self.render(metrics={"angle": 10.0})
+        self.assertEqual(imread.call_count, 2)
+        np.testing.assert_array_equal(first, again)
+
+    def test_metrics_move_the_reference_image(self):
+        without = self.render()
+        with_metrics = self.render(metrics={"angle": 10.0, "ok": True})
+        # The reference image sits below the metrics block
+        column = 20 + 40
+        rows = lambda canvas: np.flatnonzero((canvas[:, column] == 123).all(axis=1))
+        self.assertGreater(rows(with_metrics)[0], rows(without)[0])
+
+    def test_least_recently_used_layers_are_dropped(self):
+        for number in range(settings.INSTRUCTION_PANEL_CACHE_SIZE + 2):
+            self.exercise = dict(self.exercise, id=f"exercise_{number}")
+            self.render()
+        self.assertEqual(len(self.interface._static_layers), settings.INSTRUCTION_PANEL_CACHE_SIZE)
+
+    def test_canvases_alternate_without_allocating(self):
+        first = self.interface.create_split_screen(self.frame, self.exercise, SimpleNamespace(
+            current_assessment_side="affected", get_actual_side=lambda: "right"), None, 20)
+        rendered = first.copy()
+        self.frame = np.full_like(self.frame, 255)
+        self.render()
+        # The previous frame's canvas is untouched by the next one
+        np.testing.assert_array_equal(first, rendered)
+        frame_counter.reset()
+        self.assertIs(self.interface.get_canvas(480, 640)[0], first)
+        self.render()
+        self.render()
+        self.assertEqual(frame_counter.get_stats()["allocations"], 0)
+
+
+class TestCameraView(unittest.TestCase):
+    def render(self, frame, landmark_frame=None):
+        """Camera half of the canvas shown for a frame"""
+        assessment = FuglMeyerAssessment()
+        assessment.interface = ExerciseInterface(create_window=False)
+        assessment.evaluator = SimpleNamespace(current_assessment_side="affected", get_actual_side=lambda: "left")
+        shown = []
+        with mock.patch.object(assessment.interface, "draw_panels"), \
+                mock.patch.object(assessment.interface, "display", shown.append), \
+                mock.patch("src.core.assessment_session.cv2.waitKey", return_value=-1):
+            self.assertTrue(assessment._render_frame(frame, landmark_frame, {}, {}, 10))
+        return shown[0][:, settings.CAMERA_WIDTH:]
+
+    def test_wide_frames_are_letterboxed(self):
+        view = self.render(np.full((720, 1280, 3), 200, dtype=np.uint8))
+        # 640 x 360 picture between 60-pixel bars
+        self.assertTrue((view[60:420] == 200).all())
+        self.assertTrue((view[:60] == 0).all() and (view[420:] == 0).all())
+
+    def test_tall_frames_are_pillarboxed(self):
+        view = self.render(np.full((480, 480, 3), 200, dtype=np.uint8))
+        self.assertTrue((view[:, 80:560] == 200).all())
+        self.assertTrue((view[:, :80] == 0).all() and (view[:, 560:] == 0).all())
+
+    def test_landmarks_are_drawn_on_the_picture(self):
+        pose = np.zeros((33, 4), dtype=np.float32)
+        pose[:, :2] = (0.5, 0.1)
+        pose[:, 3] = 1.0
+        view = self.render(np.zeros((720, 1280, 3), dtype=np.uint8), LandmarkFrame(pose))
+        # A tenth of the way down the picture, not of the whole view
+        self.assertTrue(view[96, 320].any())
+        self.assertFalse(view[:60].any())
+
+
+if __name__ == "__main__":
+    unittest.main()
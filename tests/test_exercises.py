@@ -3,19 +3,20 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import unittest
-import cv2
 import os
 from pathlib import Path
-from src.core.pose_detector import PoseDetector
 from src.exercises.factory.exercise_factory import ExerciseFactory
 from src.config import settings
+from detection_fixtures import DetectionFixtureCache, create_detector, detect
 
 class TestExercises(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.detector = PoseDetector()
-        if not cls.detector.initialize():
-            raise Exception("Could not initialize pose detector")
+        # Detections come from the fixture cache; the models only load for
+        # images without an up to date fixture
+        cls.fixtures = DetectionFixtureCache()
+        cls.detector = None
+        cls.detector_failed = False
         
         from src.utils.file_utils import load_fugl_meyer_tests
         tests = load_fugl_meyer_tests()
@@ -111,22 +112,35 @@ class TestExercises(unittest.TestCase):
             
         }
 
+    @classmethod
+    def tearDownClass(cls):
+        if cls.detector is not None:
+            cls.detector.close()
+
+    def detect_landmarks(self, image_path):
+        """LandmarkFrame of an image from its fixture, detecting and storing it when missing or stale"""
+        fixture = self.fixtures.load(image_path)
+        if fixture is not None:
+            return fixture.landmark_frame
+        cls = type(self)
+        if cls.detector is None and not cls.detector_failed:
+            # Test images are unrelated stills, so each one is detected from scratch
+            cls.detector = create_detector()
+            cls.detector_failed = cls.detector is None
+        if cls.detector is None:
+            self.skipTest(f"No detection fixture for {Path(image_path).name} and no pose detector to make one")
+        return self.fixtures.save(image_path, detect(cls.detector, image_path)).landmark_frame
+
     def process_image_and_evaluate(self, image_path, exercise_id):
-        frame = cv2.imread(str(image_path))
-        if frame is None:
-            raise ValueError(f"Could not load image: {image_path}")
-        
         exercise_config = self.exercises_config[exercise_id]
         exercise = ExerciseFactory.create_exercise(exercise_config)
         
-        rgb_frame, detection_result = self.detector.process_frame(frame, detect_gestures=True)
+        landmark_frame = self.detect_landmarks(image_path)
         
-        if detection_result is None or not detection_result.pose_landmarks:
+        if landmark_frame is None:
             return None, "No landmarks detected"
         
-        landmarks = detection_result.pose_landmarks[0]
-        
-        score, metrics = exercise.evaluate(landmarks, "right")
+        score, metrics = exercise.evaluate(landmark_frame, "right")
         
         return score, metrics
     
@@ -178,6 +192,8 @@ class TestExercises(unittest.TestCase):
                         f"Metrics: {metrics}"
                     )
                     print(f"✓ {image_name}: {score}/{expected_score} - {exercise_id}")
+                except unittest.SkipTest:
+                    raise
                 except Exception as e:
                     self.fail(f"Error processing {image_name}: {str(e)}")
 
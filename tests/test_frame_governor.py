@@ -0,0 +1,103 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from src.core.assessment_session import FuglMeyerAssessment
+from src.core.frame_governor import FrameRateGovernor, extrapolate_landmarks
+from src.core.landmark_frame import LandmarkFrame
+from src.utils.clock import ReplayClock
+
+
+def pose_at(x, timestamp):
+    pose = np.full((33, 4), 0.5, dtype=np.float32)
+    pose[:, 0] = x
+    return LandmarkFrame(pose, timestamp=timestamp)
+
+
+class FakeDetector:
+    """Returns a pose moving right by 0.01 per frame, with a gesture when recognition runs"""
+    def __init__(self):
+        self.calls = []
+
+    def process_frame(self, frame, detect_gestures=False, timestamp_ms=None, hand_side=None):
+        self.calls.append(detect_gestures)
+        landmark_frame = pose_at(0.01 * len(self.calls), timestamp_ms / 1000)
+        if detect_gestures:
+            landmark_frame.empty_hands()[:] = 0.5
+            landmark_frame.set_gesture("right", f"gesture_{len(self.calls)}", 0.9)
+        return None, landmark_frame
+
+
+class TestFrameRateGovernor(unittest.TestCase):
+    def test_stages_follow_their_target_rates(self):
+        governor = FrameRateGovernor({"display": 30, "pose": 15, "gesture": 5, "evaluate": 10})
+        rng = np.random.default_rng(0)
+        for frame in range(300):
+            # A 30 fps camera with a few milliseconds of jitter
+            now = frame / 30 + rng.uniform(-0.004, 0.004)
+            governor.frame(now)
+            for stage in ("display", "pose", "gesture", "evaluate"):
+                governor.due(stage, now)
+        summary = governor.summary()
+        self.assertEqual(summary["frames"], 300)
+        for stage, target in summary["target"].items():
+            with self.subTest(stage=stage):
+                self.assertAlmostEqual(summary["achieved"][stage], target, delta=target * 0.05)
+
+    def test_unlimited_stages_run_every_frame_and_late_stages_do_not_catch_up(self):
+        governor = FrameRateGovernor.from_preset("full")
+        self.assertFalse(governor.limited)
+        self.assertTrue(all(governor.due("pose", frame / 30) for frame in range(10)))
+        governor = FrameRateGovernor({"pose": 10})
+        self.assertTrue(governor.due("pose", 0.0))
+        # A stall of a second runs the stage once, not ten times
+        self.assertEqual([governor.due("pose", 1.0 + frame / 30) for frame in range(4)], [True, False, False, True])
+        with self.assertRaises(ValueError):
+            FrameRateGovernor({"camera": 30})
+
+    def test_extrapolation(self):
+        previous, last = pose_at(0.40, 1.0), pose_at(0.50, 1.1)
+        ahead = extrapolate_landmarks(previous, last, 1.15, max_ms=150)
+        np.testing.assert_allclose(ahead.pose[:, 0], 0.55, atol=1e-6)
+        np.testing.assert_allclose(ahead.pose[:, 3], 0.5)
+        # Never further than max_ms past the last inference
+        far = extrapolate_landmarks(previous, last, 2.0, max_ms=100)
+        np.testing.assert_allclose(far.pose[:, 0], 0.60, atol=1e-6)
+        self.assertIs(extrapolate_landmarks(None, last, 1.2), last)
+
+    def test_session_reuses_landmarks_and_gestures_between_inferences(self):
+        clock = ReplayClock()
+        assessment = FuglMeyerAssessment(clock=clock)
+        assessment.detector = FakeDetector()
+        evaluated = []
+        assessment.evaluator = SimpleNamespace(
+            get_actual_side=lambda: "right",
+            evaluate_exercise=lambda exercise, landmark_frame: evaluated.append(landmark_frame) or 1,
+            get_last_metrics=lambda: {"frames": len(evaluated)})
+        assessment.set_governor(FrameRateGovernor({"pose": 10, "gesture": 5, "evaluate": 10}))
+        assessment._reset_inference_state()
+
+        exercise = {"id": "c_flexion", "gesture_required": True}
+        results = []
+        for frame in range(30):
+            clock.set_ms(frame * 1000 / 30)
+            results.append(assessment._infer_frame(None, exercise, frame * 1000 / 30))
+
+        self.assertEqual(assessment.detector.calls, [True, False] * 5)
+        self.assertEqual(len(evaluated), 10)
+        inferred = [landmark_frame for landmark_frame, score, _ in results if score is not None]
+        self.assertEqual(len(inferred), 10)
+        # Frames in between show the last inferred landmarks with the last metrics
+        self.assertIs(results[1][0], results[0][0])
+        self.assertEqual(results[2][2], {"frames": 1})
+        # Pose-only inferences keep the last recognized gesture
+        self.assertEqual(inferred[1].right_gesture, inferred[0].right_gesture)
+        self.assertNotEqual(inferred[2].right_gesture, inferred[0].right_gesture)
+        self.assertEqual(assessment.governor.summary()["achieved"]["pose"], 10.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import threading
+import unittest
+from src.core.frame_pipeline import DropOldestQueue, FramePipeline
+
+
+class FakeSource:
+    """Minimal FrameSource stand-in returning integer 'frames'"""
+    def __init__(self, frame_count):
+        self.frame_count = frame_count
+        self.position = 0
+
+    def read(self):
+        if self.position >= self.frame_count:
+            return False, None, None
+        self.position += 1
+        return True, self.position, self.position * 10
+
+
+class TestDropOldestQueue(unittest.TestCase):
+    def test_put_drops_oldest_when_full(self):
+        q = DropOldestQueue(maxsize=2)
+        for item in range(5):
+            q.put(item)
+        self.assertEqual(q.dropped, 3)
+        self.assertEqual(q.get(timeout=0), 3)
+        self.assertEqual(q.get(timeout=0), 4)
+        self.assertIsNone(q.get(timeout=0))
+
+    def test_close_unblocks_consumer(self):
+        q = DropOldestQueue()
+        threading.Timer(0.05, q.close).start()
+        self.assertIsNone(q.get(timeout=2))
+        self.assertTrue(q.closed)
+        self.assertFalse(q.put(1))
+
+
+class TestFramePipeline(unittest.TestCase):
+    def test_every_frame_is_accounted_for(self):
+        pipeline = FramePipeline(FakeSource(200), lambda frame, timestamp_ms: timestamp_ms)
+        pipeline.start()
+        rendered = []
+        while True:
+            item = pipeline.get_result(timeout=0.5)
+            if item is None:
+                if pipeline.finished:
+                    break
+                continue
+            frame, result = item
+            self.assertEqual(result, frame * 10)
+            rendered.append(frame)
+        pipeline.stop()
+
+        stats = pipeline.get_stats()
+        self.assertEqual(stats["capture"]["frames"], 200)
+        self.assertEqual(stats["inference"]["frames"] + stats["inference"]["dropped"], 200)
+        self.assertEqual(stats["render"]["frames"] + stats["render"]["dropped"], stats["inference"]["frames"])
+        self.assertEqual(rendered, sorted(rendered))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,158 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import cv2
+import numpy as np
+from src.core.frame_sources import (FrameSource, PrefetchBuffer, SyntheticSource, VideoFileSource,
+                                    ImageDirectorySource, open_frame_source)
+
+
+def read_all(source, recycle=True):
+    frames, timestamps = [], []
+    frame = None
+    while True:
+        ok, frame, timestamp_ms = source.read(frame if recycle else None)
+        if not ok:
+            return frames, timestamps
+        frames.append(frame.copy())
+        timestamps.append(timestamp_ms)
+
+
+class TestPrefetchBuffer(unittest.TestCase):
+    def test_drop_oldest_recycles_dropped_frame(self):
+        buffer = PrefetchBuffer(2, drop_oldest=True)
+        frames = [np.zeros(1) for _ in range(3)]
+        for index, frame in enumerate(frames):
+            self.assertTrue(buffer.put(frame, index))
+        self.assertEqual(buffer.dropped, 1)
+        self.assertIs(buffer.take_free(), frames[0])
+        self.assertEqual(buffer.get()[1], 1)
+
+    def test_close_drains_then_ends(self):
+        buffer = PrefetchBuffer(2)
+        buffer.put("frame", 0)
+        buffer.close()
+        self.assertFalse(buffer.put("late", 1))
+        self.assertEqual(buffer.get(), ("frame", 0))
+        self.assertIsNone(buffer.get())
+
+
+class TestSyntheticSource(unittest.TestCase):
+    def test_prefetched_frames_match_direct_reads(self):
+        direct = SyntheticSource(64, 48, fps=25, frame_count=20, prefetch=0)
+        prefetched = SyntheticSource(64, 48, fps=25, frame_count=20, prefetch=3)
+        self.assertTrue(direct.open() and prefetched.open())
+        direct_frames, direct_timestamps = read_all(direct)
+        prefetched_frames, prefetched_timestamps = read_all(prefetched)
+        direct.release()
+        prefetched.release()
+
+        self.assertEqual(len(direct_frames), 20)
+        self.assertEqual(direct_timestamps, [index * 40 for index in range(20)])
+        self.assertEqual(prefetched_timestamps, direct_timestamps)
+        for a, b in zip(direct_frames, prefetched_frames):
+            np.testing.assert_array_equal(a, b)
+
+    def test_recycled_buffers_bound_allocations(self):
+        source = SyntheticSource(64, 48, frame_count=50, prefetch=2)
+        source.open()
+        buffers = set()
+        frame = None
+        while True:
+            ok, frame, _ = source.read(frame)
+            if not ok:
+                break
+            buffers.add(id(frame))
+        source.release()
+        # Queued frames, the one being decoded and the one held by the reader
+        self.assertLessEqual(len(buffers), 4)
+
+
+class BlockingSource(FrameSource):
+    """A source whose second read hangs until it is let go, like a stalled camera"""
+    def __init__(self):
+        super().__init__(prefetch=1)
+        self.reading = threading.Event()
+        self.let_go = threading.Event()
+        self.events = []
+
+    def _open(self):
+        return True
+
+    def _grab(self, buffer):
+        if self.reading.is_set():
+            self.let_go.wait()
+            self.events.append("read returned")
+            return False, None, None
+        self.reading.set()
+        return True, np.zeros((4, 4, 3), np.uint8), 0.0
+
+    def _close(self):
+        self.events.append("closed")
+
+
+class TestFrameSourceRelease(unittest.TestCase):
+    def test_source_is_closed_after_a_hung_read_returns(self):
+        source = BlockingSource()
+        self.assertTrue(source.open())
+        self.assertTrue(source.read()[0])
+        with mock.patch("src.core.frame_sources.DECODE_STOP_TIMEOUT_S", 0.05):
+            source.release()
+        self.assertFalse(source.isOpened())
+        self.assertEqual(source.events, [])
+        self.assertFalse(source.open())
+
+        decode_thread = source._decode_thread
+        source.let_go.set()
+        decode_thread.join()
+        self.assertEqual(source.events, ["read returned", "closed"])
+        self.assertTrue(source.open())
+        source.release()
+
+
+class TestRecordedSources(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.frames = [np.full((48, 64, 3), value, dtype=np.uint8) for value in (0, 80, 160, 240)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_image_directory_in_name_order(self):
+        for index, frame in enumerate(self.frames):
+            cv2.imwrite(os.path.join(self.directory.name, f"frame_{index}.png"), frame)
+        source = ImageDirectorySource(self.directory.name, fps=10)
+        self.assertTrue(source.open())
+        frames, timestamps = read_all(source)
+        source.release()
+        self.assertEqual(timestamps, [0, 100, 200, 300])
+        self.assertEqual([int(frame[0, 0, 0]) for frame in frames], [0, 80, 160, 240])
+
+    def test_video_file_seek(self):
+        path = os.path.join(self.directory.name, "clip.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 20, (64, 48))
+        for frame in self.frames * 3:
+            writer.write(frame)
+        writer.release()
+
+        source = open_frame_source(path)
+        self.assertIsInstance(source, VideoFileSource)
+        _, timestamps = read_all(source)
+        self.assertEqual(len(timestamps), 12)
+        self.assertEqual(timestamps[:3], [0, 50, 100])
+
+        self.assertTrue(source.seek(10))
+        frames, timestamps = read_all(source)
+        source.release()
+        self.assertEqual(timestamps, [500, 550])
+        self.assertAlmostEqual(int(frames[0][0, 0, 0]), 160, delta=8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import time
+import unittest
+from src.utils.instrumentation import Instrumentation, RollingWindow
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        instrumentation = Instrumentation(enabled=False)
+        instrumentation.add("pose", instrumentation.time())
+        instrumentation.next_frame(False)
+        summary = instrumentation.summary()
+        self.assertEqual(summary["frames"], 0)
+        self.assertEqual(summary["stages"], {})
+
+    def test_summary_and_readout(self):
+        instrumentation = Instrumentation(enabled=True, window=4)
+        for index in range(10):
+            start = instrumentation.time()
+            time.sleep(0.002)
+            instrumentation.add("pose", start)
+            instrumentation.next_frame(detected=index not in (0, 8))
+
+        summary = instrumentation.summary(dropped_frames=3)
+        self.assertEqual(summary["frames"], 10)
+        self.assertEqual(summary["detection_miss_rate"], 0.2)
+        self.assertEqual(summary["dropped_frames"], 3)
+        self.assertEqual(summary["stages"]["pose"]["samples"], 10)
+        self.assertGreaterEqual(summary["stages"]["pose"]["p50_ms"], 2.0)
+        self.assertNotIn("render", summary["stages"])
+        self.assertGreater(instrumentation.fps(), 0)
+
+        readout = instrumentation.readout()
+        self.assertIn("fps", readout)
+        self.assertIn("pose", readout)
+        # The window only holds the last 4 frames, one of them a miss
+        self.assertIn("miss 25%", readout)
+
+    def test_rolling_window_keeps_latest_values(self):
+        window = RollingWindow(3)
+        for value in range(5):
+            window.add(value)
+        self.assertEqual(sorted(window.values()), [2, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
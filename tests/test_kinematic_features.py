@@ -0,0 +1,169 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import math
+import unittest
+from unittest import mock
+import numpy as np
+from src.config.landmarks import LEFT_LANDMARKS, RIGHT_LANDMARKS, NOSE
+from src.core.landmark_frame import LandmarkFrame, X, Y, Z
+from src.exercises.criteria import exercise_criteria, kinematic_features as features_module
+from src.exercises.criteria.kinematic_features import FEATURES, KinematicFeatures, kinematic_features
+
+# The per-frame criteria as they were before KinematicFeatures, kept as the
+# reference the memoized features must reproduce exactly
+
+
+def _rows(landmarks, side, *names):
+    side_dict = LEFT_LANDMARKS if side == "left" else RIGHT_LANDMARKS
+    return [landmarks.pose[side_dict[name]].tolist() for name in names]
+
+
+def reference_shoulder_abduction(landmarks, side):
+    shoulder, elbow = _rows(landmarks, side, "SHOULDER", "ELBOW")
+    v1 = np.array([0, 1])
+    v2 = np.array([elbow[X] - shoulder[X], elbow[Y] - shoulder[Y]])
+    if np.all(v2 == 0):
+        return 0
+    v1 = v1 / np.linalg.norm(v1)
+    v2 = v2 / np.linalg.norm(v2)
+    angle = math.degrees(math.acos(np.dot(v1, v2)))
+    if side == "left":
+        sign = -1 if np.cross(v1, v2) > 0 else 1
+    else:
+        sign = 1 if np.cross(v1, v2) > 0 else -1
+    return angle * sign
+
+
+def reference_shoulder_flexion(landmarks, side):
+    shoulder, elbow = _rows(landmarks, side, "SHOULDER", "ELBOW")
+    v1 = np.array([0, 1])
+    v2 = np.array([elbow[Z] - shoulder[Z] + 0.07, elbow[Y] - shoulder[Y]])
+    if np.all(v2 == 0):
+        return 0
+    v1 = v1 / np.linalg.norm(v1)
+    v2 = v2 / np.linalg.norm(v2)
+    return math.degrees(math.acos(np.dot(v1, v2)))
+
+
+def reference_shoulder_elevation(landmarks, side):
+    shoulder, = _rows(landmarks, side, "SHOULDER")
+    opposite_shoulder, = _rows(landmarks, "right" if side == "left" else "left", "SHOULDER")
+    v1 = np.array([opposite_shoulder[X] - shoulder[X], opposite_shoulder[Y] - shoulder[Y]])
+    v2 = np.array([-1 if side == "left" else 1, 0])
+    sign = 1 if opposite_shoulder[Y] > shoulder[Y] else -1
+    v1 = v1 / np.linalg.norm(v1)
+    return math.degrees(math.acos(np.dot(v1, v2))) * sign
+
+
+def reference_elbow_flexion(landmarks, side, plane):
+    shoulder, elbow, wrist = _rows(landmarks, side, "SHOULDER", "ELBOW", "WRIST")
+    horizontal = X if plane == "frontal" else Z
+    v1 = np.array([shoulder[horizontal] - elbow[horizontal], shoulder[Y] - elbow[Y]])
+    v2 = np.array([wrist[horizontal] - elbow[horizontal], wrist[Y] - elbow[Y]])
+    v1 = v1 / np.linalg.norm(v1)
+    v2 = v2 / np.linalg.norm(v2)
+    return math.degrees(math.acos(np.dot(v1, v2)))
+
+
+def reference_distance(landmarks, side, target):
+    index, = _rows(landmarks, side, "INDEX")
+    other = landmarks.pose[NOSE].tolist() if target == "NOSE" else _rows(landmarks, side, target)[0]
+    dx = index[X] - other[X]
+    dy = index[Y] - other[Y]
+    return math.sqrt(dx * dx + dy * dy)
+
+
+def reference_pronation_x(landmarks, side):
+    thumb, index, pinky = _rows(landmarks, side, "THUMB", "INDEX", "PINKY")
+    if abs(index[X] - thumb[X]) < 0.0045:
+        return 1
+    if side == "right":
+        return 2 if pinky[X] > thumb[X] else 0
+    return 2 if pinky[X] < thumb[X] else 0
+
+
+def reference_pronation_y(landmarks, side):
+    thumb, pinky = _rows(landmarks, side, "THUMB", "PINKY")
+    if abs(thumb[Y] - pinky[Y]) < 0.005:
+        return 1
+    return 2 if thumb[Y] > pinky[Y] else 0
+
+
+REFERENCES = {
+    "shoulder_abduction": (reference_shoulder_abduction, exercise_criteria.calculate_shoulder_abduction_adduction),
+    "shoulder_flexion": (reference_shoulder_flexion, exercise_criteria.calculate_shoulder_flexion_extension),
+    "shoulder_elevation": (reference_shoulder_elevation, exercise_criteria.calculate_shoulder_elevation),
+    "elbow_flexion_frontal": (
+        lambda landmarks, side: reference_elbow_flexion(landmarks, side, "frontal"),
+        lambda landmarks, side: exercise_criteria.calculate_elbow_flexion_extension(landmarks, side, "frontal")),
+    "elbow_flexion_sagittal": (
+        lambda landmarks, side: reference_elbow_flexion(landmarks, side, "sagittal"),
+        lambda landmarks, side: exercise_criteria.calculate_elbow_flexion_extension(landmarks, side, "sagittal")),
+    "index_knee_distance": (lambda landmarks, side: reference_distance(landmarks, side, "KNEE"),
+                            exercise_criteria.calculate_index_knee_distance),
+    "index_nose_distance": (lambda landmarks, side: reference_distance(landmarks, side, "NOSE"),
+                            exercise_criteria.calculate_index_nose_distance),
+    "forearm_pronation_x": (reference_pronation_x, exercise_criteria.calculate_forearm_pronation_x_axis),
+    "forearm_pronation_y": (reference_pronation_y, exercise_criteria.calculate_forearm_pronation_y_axis)
+}
+
+
+def random_pose(rng):
+    return np.concatenate([rng.uniform(0, 1, (33, 3)), np.ones((33, 1))], axis=1).astype(np.float32)
+
+
+class TestKinematicFeatures(unittest.TestCase):
+    def test_matches_previous_criteria_exactly(self):
+        self.assertEqual(set(REFERENCES), set(FEATURES))
+        rng = np.random.default_rng(0)
+        for _ in range(1000):
+            pose = random_pose(rng)
+            for side in ("left", "right"):
+                for name, (reference, criterion) in REFERENCES.items():
+                    expected = reference(LandmarkFrame(pose), side)
+                    # Bit for bit, through the memoized frame and the criteria functions alike
+                    self.assertEqual(KinematicFeatures(pose).get(name, side), expected, (name, side))
+                    self.assertEqual(criterion(LandmarkFrame(pose), side), expected, (name, side))
+
+    def test_features_are_computed_once_per_frame(self):
+        landmark_frame = LandmarkFrame(random_pose(np.random.default_rng(1)))
+        self.assertIsNone(landmark_frame.features)
+        calls = []
+        shoulder_flexion = FEATURES["shoulder_flexion"]
+
+        def counted(rows, side):
+            calls.append(side)
+            return shoulder_flexion(rows, side)
+
+        with mock.patch.dict(features_module.FEATURES, {"shoulder_flexion": counted}):
+            first = exercise_criteria.calculate_shoulder_flexion_extension(landmark_frame, "left")
+            self.assertIs(kinematic_features(landmark_frame), landmark_frame.features)
+            self.assertEqual(exercise_criteria.calculate_shoulder_flexion_extension(landmark_frame, "left"), first)
+            exercise_criteria.calculate_shoulder_flexion_extension(landmark_frame, "right")
+        # Both sides on first access, nothing after
+        self.assertEqual(calls, ["left", "right"])
+        # A new frame starts without features
+        self.assertIsNone(LandmarkFrame(landmark_frame.pose.copy()).features)
+
+    def test_coincident_landmarks(self):
+        pose = random_pose(np.random.default_rng(2))
+        pose[RIGHT_LANDMARKS["SHOULDER"]] = pose[LEFT_LANDMARKS["SHOULDER"]]
+        for side_dict in (LEFT_LANDMARKS, RIGHT_LANDMARKS):
+            pose[side_dict["ELBOW"]] = pose[side_dict["SHOULDER"]]
+        features = KinematicFeatures(pose)
+        for side in ("left", "right"):
+            # NaN before KinematicFeatures, 0 now
+            with np.errstate(invalid="ignore"):
+                self.assertTrue(math.isnan(reference_shoulder_elevation(LandmarkFrame(pose), side)))
+                self.assertTrue(math.isnan(reference_elbow_flexion(LandmarkFrame(pose), side, "frontal")))
+            self.assertEqual(features.shoulder_elevation(side), 0)
+            self.assertEqual(features.elbow_flexion(side, "frontal"), 0)
+            self.assertEqual(features.elbow_flexion(side, "sagittal"), 0)
+            # Unchanged: the upper arm has no direction
+            self.assertEqual(features.shoulder_abduction(side), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
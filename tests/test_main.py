@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+import main
+from src.core.assessment_session import FuglMeyerAssessment
+from src.core.frame_sources import ClockedSource, open_frame_source
+from src.core.pose_evaluator import PoseEvaluator
+from src.core.results_manager import ResultsManager
+from test_batch_scoring import FakeDetector
+
+
+class TestHeadlessTiming(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_fast_recorded_exercise_runs_on_video_time(self):
+        path = os.path.join(self.directory.name, "session.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+        for _ in range(50):
+            writer.write(np.zeros((24, 32, 3), dtype=np.uint8))
+        writer.release()
+
+        clock = main.exercise_clock(path, "fast")
+        self.assertIsNotNone(clock)
+        source = ClockedSource(open_frame_source(path), clock)
+        assessment = FuglMeyerAssessment(clock=clock)
+        assessment.detector = FakeDetector()
+        assessment.set_components(None, PoseEvaluator("left", clock), ResultsManager())
+        exercise = {"id": "a_3_shoulder-flexion-0-90", "name": "Shoulder flexion", "description": "",
+                    "duration": 2, "stabilization_ms": 1000, "max_score": 2}
+        for phase in ("unaffected", "affected"):
+            start = len(assessment.detector.log)
+            assessment.run_exercise(source, exercise, phase)
+            # duration * fps frames, whatever the decode speed
+            self.assertEqual(len(assessment.detector.log) - start, 20)
+        source.release()
+        self.assertEqual(assessment.detector.log, [index * 100.0 for index in range(40)])
+
+    def test_live_and_realtime_sources_keep_the_system_clock(self):
+        self.assertIsNone(main.exercise_clock("0", "fast"))
+        self.assertIsNone(main.exercise_clock("session.mp4", "realtime"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import unittest
+from src.core.model_tier_controller import ModelTierController
+
+TIERS = ["lite", "full", "heavy"]
+
+
+class TestModelTierController(unittest.TestCase):
+    def controller(self, initial_tier="heavy", cooldown_frames=20):
+        return ModelTierController(TIERS, initial_tier, budget_ms=100, window=5, upgrade_ratio=0.4,
+                                   cooldown_frames=cooldown_frames)
+
+    def feed(self, controller, latency_ms, frames):
+        """Tier changes while feeding a constant latency"""
+        return [tier for tier in (controller.record(latency_ms) for _ in range(frames)) if tier]
+
+    def test_steps_down_once_the_window_is_over_budget(self):
+        controller = self.controller()
+        # A single slow frame does not move the median
+        self.assertEqual(self.feed(controller, 50, 4) + self.feed(controller, 300, 1), [])
+        self.assertEqual(self.feed(controller, 150, 2), ["full"])
+        # The window starts over on the new model, a full window over budget steps down again
+        self.assertEqual(self.feed(controller, 150, 4), [])
+        self.assertEqual(self.feed(controller, 150, 1), ["lite"])
+        self.assertEqual(self.feed(controller, 150, 10), [])
+        self.assertEqual(controller.history, ["heavy", "full", "lite"])
+
+    def test_no_step_up_during_cooldown(self):
+        controller = self.controller()
+        self.assertEqual(self.feed(controller, 150, 5), ["full"])
+        # Fast enough to step up, but within 20 frames of the step down
+        self.assertEqual(self.feed(controller, 20, 19), [])
+        self.assertEqual(controller.tier, "full")
+        self.assertEqual(self.feed(controller, 20, 1), ["heavy"])
+
+    def test_steps_up_only_with_enough_headroom(self):
+        controller = self.controller(initial_tier="lite", cooldown_frames=0)
+        # Within budget but above upgrade_ratio * budget
+        self.assertEqual(self.feed(controller, 60, 20), [])
+        self.assertEqual(self.feed(controller, 30, 10), ["full", "heavy"])
+        self.assertEqual(self.feed(controller, 30, 10), [])
+        with self.assertRaises(ValueError):
+            ModelTierController(TIERS, "medium", 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
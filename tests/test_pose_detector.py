@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import unittest
+from unittest import mock
+import numpy as np
+from mediapipe.tasks.python import vision
+from mediapipe.tasks.python.components.containers.category import Category
+from mediapipe.tasks.python.components.containers.landmark import NormalizedLandmark
+from src.config import settings
+from src.core.pose_detector import PoseDetector
+
+
+class StubLandmarker:
+    """VIDEO-mode landmarker that never finds a pose, logging image sizes and timestamps"""
+    def __init__(self):
+        self.calls = []
+
+    def detect_for_video(self, image, timestamp_ms):
+        self.calls.append((image.width, timestamp_ms))
+        return vision.PoseLandmarkerResult(pose_landmarks=[], pose_world_landmarks=[])
+
+
+class TestPoseRoiFallback(unittest.TestCase):
+    @mock.patch.object(settings, "POSE_ROI_ENABLED", True)
+    def test_full_frame_fallback_keeps_the_source_time_base(self):
+        detector = PoseDetector(running_mode="VIDEO", adaptive_tier=False)
+        detector.detector = StubLandmarker()
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        detector._pose_roi = (10, 10, 90, 90)
+
+        detector.process_frame(frame, timestamp_ms=1000)
+        # The crop lost the pose, so the next frame runs on the full frame
+        detector.process_frame(frame, timestamp_ms=1033)
+
+        input_size = settings.POSE_ROI_INPUT_SIZE
+        self.assertEqual(detector.detector.calls, [(input_size, 1000), (160, 1001), (160, 1033)])
+
+
+class TestHandRoiMapping(unittest.TestCase):
+    def test_gesture_result_is_mapped_to_the_frame(self):
+        detector = PoseDetector(running_mode="VIDEO", adaptive_tier=False)
+        roi = (320, 240, 480, 400)
+        result = vision.GestureRecognizerResult(
+            gestures=[[Category(index=0, score=0.9, display_name="", category_name="Closed_Fist")]],
+            # The recognizer cannot tell which hand a tight crop shows
+            handedness=[[Category(index=0, score=0.6, display_name="Left", category_name="Left")]],
+            hand_landmarks=[[NormalizedLandmark(x=0.0, y=0.0, z=0.1),
+                             NormalizedLandmark(x=0.5, y=1.0, z=-0.2)]],
+            hand_world_landmarks=[])
+
+        mapped = detector._map_gesture_result(result, roi, "right", 640, 480)
+
+        self.assertEqual([(landmark.x, landmark.y) for landmark in mapped.hand_landmarks[0]],
+                         [(0.5, 0.5), (0.625, 400 / 480)])
+        # z keeps the scale of x
+        self.assertAlmostEqual(mapped.hand_landmarks[0][0].z, 0.1 * 160 / 640)
+        self.assertEqual([(category.category_name, category.display_name, category.score)
+                          for category in mapped.handedness[0]], [("Right", "Right", 0.6)])
+        self.assertIs(mapped.gestures, result.gestures)
+        # The result from the recognizer is left as it was
+        self.assertEqual(result.handedness[0][0].category_name, "Left")
+        self.assertEqual(result.hand_landmarks[0][0].x, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
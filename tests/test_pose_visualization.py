@@ -0,0 +1,103 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import unittest
+import numpy as np
+from src.config.landmarks import LEFT_LANDMARKS, RIGHT_LANDMARKS, NOSE
+from src.core.landmark_frame import LandmarkFrame
+from src.utils.pose_visualization import (landmarks_to_pixels, draw_pose, draw_landmarks, DIMMED_COLOR,
+                                          LEFT_COLOR, RIGHT_COLOR, WHITE_COLOR)
+
+WIDTH, HEIGHT = 640, 480
+
+
+def circle_pose():
+    """
+    All 33 landmarks visible, spread around a circle: no dot touches another
+    and no connection passes over a landmark it does not join
+    """
+    angles = np.linspace(0, 2 * np.pi, 33, endpoint=False)
+    pose = np.ones((33, 4), dtype=np.float32)
+    pose[:, 0] = (WIDTH / 2 + 200 * np.cos(angles)) / WIDTH
+    pose[:, 1] = (HEIGHT / 2 + 200 * np.sin(angles)) / HEIGHT
+    return pose
+
+
+class TestLandmarksToPixels(unittest.TestCase):
+    def test_visibility_mask(self):
+        pose = circle_pose()
+        pose[0, 3] = 0.49  # Below the visibility threshold
+        pose[1, 3] = 0.5
+        pose[2, 0] = -0.01  # Outside the image
+        pose[3, 1] = 1.01
+        points, visible = landmarks_to_pixels(pose, WIDTH, HEIGHT)
+        self.assertEqual(visible[:5].tolist(), [False, True, False, False, True])
+        self.assertEqual(visible.sum(), 30)
+
+    def test_pixels_are_floored_and_kept_inside_the_image(self):
+        pose = circle_pose()
+        pose[0, :2] = (0.0, 0.0)
+        pose[1, :2] = (1.0, 1.0)
+        pose[2, :2] = (0.4999, 0.2)
+        points, visible = landmarks_to_pixels(pose, WIDTH, HEIGHT)
+        self.assertEqual(points.dtype, np.int32)
+        self.assertEqual(points[:3].tolist(), [[0, 0], [WIDTH - 1, HEIGHT - 1], [319, 96]])
+        self.assertTrue(visible[:3].all())
+
+
+class TestDrawPose(unittest.TestCase):
+    def draw(self, pose, **kwargs):
+        image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+        points, visible = landmarks_to_pixels(pose, WIDTH, HEIGHT)
+        draw_pose(image, points, visible, **kwargs)
+        return image, points
+
+    def color_at(self, image, point):
+        return tuple(int(value) for value in image[point[1], point[0]])
+
+    def test_default_style_colors_each_side(self):
+        image, points = self.draw(circle_pose())
+        self.assertEqual(self.color_at(image, points[LEFT_LANDMARKS["ELBOW"]]), LEFT_COLOR)
+        self.assertEqual(self.color_at(image, points[RIGHT_LANDMARKS["ELBOW"]]), RIGHT_COLOR)
+        self.assertEqual(self.color_at(image, points[NOSE]), WHITE_COLOR)
+
+    def test_assessed_side_highlights_one_side(self):
+        image, points = self.draw(circle_pose(), style="assessed_side", side="right")
+        self.assertEqual(self.color_at(image, points[RIGHT_LANDMARKS["ELBOW"]]), RIGHT_COLOR)
+        self.assertEqual(self.color_at(image, points[RIGHT_LANDMARKS["WRIST"]]), RIGHT_COLOR)
+        self.assertEqual(self.color_at(image, points[LEFT_LANDMARKS["ELBOW"]]), DIMMED_COLOR)
+        self.assertEqual(self.color_at(image, points[NOSE]), DIMMED_COLOR)
+        # The highlighted forearm is drawn in the side color
+        elbow, wrist = points[RIGHT_LANDMARKS["ELBOW"]], points[RIGHT_LANDMARKS["WRIST"]]
+        self.assertEqual(self.color_at(image, (elbow + wrist) // 2), RIGHT_COLOR)
+
+    def test_hidden_landmarks_and_their_connections_are_not_drawn(self):
+        pose = circle_pose()
+        pose[:, 3] = 0.0
+        arm = [LEFT_LANDMARKS["SHOULDER"], LEFT_LANDMARKS["ELBOW"], LEFT_LANDMARKS["WRIST"]]
+        pose[arm, 3] = 1.0
+        image, points = self.draw(pose)
+        elbow, wrist = points[LEFT_LANDMARKS["ELBOW"]], points[LEFT_LANDMARKS["WRIST"]]
+        forearm = (elbow + wrist) // 2
+        self.assertEqual(self.color_at(image, forearm), WHITE_COLOR)
+
+        pose[LEFT_LANDMARKS["WRIST"], 3] = 0.0
+        image, _ = self.draw(pose)
+        self.assertFalse(image[wrist[1], wrist[0]].any())
+        self.assertFalse(image[forearm[1], forearm[0]].any())
+        self.assertEqual(self.color_at(image, elbow), LEFT_COLOR)
+
+    def test_no_visible_landmarks(self):
+        pose = circle_pose()
+        pose[:, 3] = 0.0
+        for style in ("default", "assessed_side"):
+            image, _ = self.draw(pose, style=style, side="left")
+            self.assertFalse(image.any())
+        image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+        self.assertIs(draw_landmarks(image, LandmarkFrame(pose), in_place=True), image)
+        self.assertFalse(image.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from src.utils.instrumentation import instrumentation
+from src.utils.profiling import SessionProfiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestSessionProfiler(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        instrumentation.tracer = None
+        self.directory.cleanup()
+
+    def test_environment(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(SessionProfiler.from_environment())
+        with mock.patch.dict(os.environ, {"FMA_TRACE": "/tmp/trace.json", "FMA_PROFILE": "CPROFILE"}, clear=True):
+            profiler = SessionProfiler.from_environment()
+            self.assertEqual((profiler.trace_path, profiler.profile_mode), ("/tmp/trace.json", "cprofile"))
+        with mock.patch.dict(os.environ, {"FMA_PROFILE": "nonsense"}, clear=True):
+            self.assertIsNone(SessionProfiler.from_environment())
+        with mock.patch.dict(os.environ, {"FMA_PROFILE": "sample", "FMA_PROFILE_INTERVAL_MS": "2"}, clear=True):
+            self.assertEqual(SessionProfiler.from_environment().profile_interval_ms, 2.0)
+        with mock.patch.dict(os.environ, {"FMA_PROFILE": "sample", "FMA_PROFILE_INTERVAL_MS": "2ms"}, clear=True):
+            self.assertEqual(SessionProfiler.from_environment().profile_interval_ms, 5.0)
+
+    def test_trace_spans_are_labelled_per_exercise(self):
+        trace_path = os.path.join(self.directory.name, "trace.json")
+        profiler = SessionProfiler(trace_path, "cprofile", output_directory=self.directory.name).start()
+        for exercise_id in ("a_2_flexor", "c_flexion"):
+            profiler.begin_exercise(exercise_id, "affected")
+            for _ in range(3):
+                start = instrumentation.time()
+                busy(0.001)
+                instrumentation.add("pose", start)
+            worker = threading.Thread(target=lambda: instrumentation.add("capture", instrumentation.time()),
+                                      name="capture-thread")
+            worker.start()
+            worker.join()
+            profiler.end_exercise()
+        profiler.close()
+        self.assertIsNone(instrumentation.tracer)
+
+        with open(trace_path) as f:
+            events = json.load(f)
+        spans = [event for event in events if event["ph"] == "X"]
+        self.assertEqual(len([span for span in spans if span["name"] == "pose"]), 6)
+        self.assertEqual({span["args"]["exercise"] for span in spans}, {"a_2_flexor", "c_flexion"})
+        self.assertTrue(all(span["dur"] >= 1000 for span in spans if span["name"] == "pose"))
+        thread_names = {event["args"]["name"] for event in events if event["name"] == "thread_name"}
+        self.assertIn("capture-thread", thread_names)
+
+        self.assertEqual(len(profiler.profile_paths), 2)
+        stats = pstats.Stats(profiler.profile_paths[0])
+        self.assertTrue(any(function[2] == "busy" for function in stats.stats))
+
+    def test_no_span_is_lost_while_flushing(self):
+        trace_path = os.path.join(self.directory.name, "trace.json")
+        profiler = SessionProfiler(trace_path, output_directory=self.directory.name).start()
+        appending, flushed = threading.Event(), threading.Event()
+
+        class SlowList(list):
+            """Holds a worker's append open until the main thread has flushed"""
+            def append(self, item):
+                appending.set()
+                flushed.wait(0.5)
+                super().append(item)
+
+        profiler._events = SlowList()
+        worker = threading.Thread(target=profiler.span, args=("capture", 0.0, 0.001))
+        worker.start()
+        appending.wait()
+        profiler._flush_trace()
+        flushed.set()
+        worker.join()
+        profiler.close()
+
+        with open(trace_path) as f:
+            events = json.load(f)
+        self.assertEqual([event["name"] for event in events if event["ph"] == "X"], ["capture"])
+
+    def test_sampling_profile(self):
+        profiler = SessionProfiler(profile_mode="sample", profile_interval_ms=1,
+                                   output_directory=self.directory.name).start()
+        profiler.begin_exercise("d_nose_knee", "unaffected")
+        busy(0.1)
+        profiler.end_exercise()
+        with open(profiler.profile_paths[0]) as f:
+            stacks = f.read()
+        self.assertIn("busy (test_profiling.py", stacks)
+
+
+if __name__ == "__main__":
+    unittest.main()
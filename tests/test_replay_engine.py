@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.landmark_frame import LandmarkFrame
+from src.core.pose_evaluator import PoseEvaluator
+from src.core.replay_engine import ReplayEngine
+from src.core.session_recorder import SessionRecorder, COORDINATE_SCALE
+from src.utils.clock import ReplayClock
+from src.utils.file_utils import load_fugl_meyer_tests
+
+NOSE, LEFT_INDEX, LEFT_KNEE = 0, 19, 25
+
+
+def nose_knee_frames(fps=10, repetitions=4):
+    """Left index finger going nose -> away -> knee -> away, slower each repetition"""
+    rng = np.random.default_rng(0)
+    pose = np.round(rng.uniform(0.2, 0.8, (33, 4)) * COORDINATE_SCALE) / COORDINATE_SCALE
+    pose[NOSE, :2] = (0.5, 0.2)
+    pose[LEFT_KNEE, :2] = (0.5, 0.8)
+    away = (0.9, 0.5)
+    frames = []
+    for repetition in range(repetitions):
+        hold = 3 + 4 * repetition
+        for target in ((0.5, 0.2), away, (0.5, 0.8), away):
+            for _ in range(hold):
+                frame_pose = pose.copy()
+                frame_pose[LEFT_INDEX, :2] = target
+                frames.append(LandmarkFrame(frame_pose, timestamp=len(frames) / fps))
+    return frames
+
+
+class TestReplayEngine(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.fma")
+        self.exercise = next(exercise for exercise in load_fugl_meyer_tests()["exercises"]
+                             if exercise["id"] == "d_nose_knee")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record_live(self, frames, fps=10):
+        """Score the frames as a live session would, at capture time, and record them"""
+        clock = ReplayClock()
+        evaluator = PoseEvaluator("left", clock)
+        evaluator.set_assessment_side("unaffected")
+        recorder = SessionRecorder(self.path, metadata={"non_affected_side": "left"})
+        recorder.start()
+        recorder.begin_segment(self.exercise["id"], "unaffected", "left")
+        scores = []
+        for index, frame in enumerate(frames):
+            clock.set_ms(index * 1000 / fps)
+            scores.append(evaluator.evaluate_exercise(self.exercise, frame))
+            recorder.record(frame, index * 1000 / fps, scores[-1], evaluator.get_last_metrics())
+        recorder.close()
+        return scores
+
+    def test_timed_exercise_replays_on_recorded_clock(self):
+        scores = self.record_live(nose_knee_frames())
+        # Slower repetitions score lower on time, so the clock matters
+        self.assertGreater(len(set(scores)), 1)
+
+        result, = ReplayEngine().rescore_archive(self.path)
+        self.assertEqual(result["changed_frames"], 0)
+        self.assertEqual(result["score"], result["recorded_score"])
+        self.assertEqual(result["evaluated_frames"], len(scores))
+
+    def test_overrides_change_the_configuration(self):
+        self.record_live(nose_knee_frames())
+        result, = ReplayEngine(overrides={"d_nose_knee": {"duration": 2}}).rescore_archive(self.path)
+        self.assertEqual(result["evaluated_frames"], 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import unittest
+import numpy as np
+from src.utils.roi import square_roi, crop_roi, roi_to_frame
+
+WIDTH, HEIGHT = 640, 480
+
+
+class TestSquareRoi(unittest.TestCase):
+    def test_square_around_the_points(self):
+        # 64 x 48 pixel extent, scaled by 2 around the center (320, 240)
+        self.assertEqual(square_roi([(0.45, 0.45), (0.55, 0.55)], WIDTH, HEIGHT, scale=2.0), (256, 176, 384, 304))
+
+    def test_shifted_inside_the_frame_at_the_edges(self):
+        self.assertEqual(square_roi([(0.0, 0.0), (0.05, 0.05)], WIDTH, HEIGHT, scale=3.0), (0, 0, 96, 96))
+        self.assertEqual(square_roi([(0.95, 0.95), (1.0, 1.0)], WIDTH, HEIGHT, scale=3.0), (544, 384, 640, 480))
+
+    def test_clipped_to_the_frame(self):
+        # Wider than the frame is high: the side is clipped to the height
+        self.assertEqual(square_roi([(0.0, 0.4), (1.0, 0.6)], WIDTH, HEIGHT, scale=1.5), (80, 0, 560, 480))
+
+    def test_min_size(self):
+        self.assertEqual(square_roi([(0.5, 0.5)], WIDTH, HEIGHT, scale=3.0, min_size=96), (272, 192, 368, 288))
+        # Not beyond the frame either
+        self.assertEqual(square_roi([(0.5, 0.5)], WIDTH, HEIGHT, min_size=1000), (80, 0, 560, 480))
+
+    def test_no_points(self):
+        self.assertIsNone(square_roi([], WIDTH, HEIGHT))
+        self.assertIsNone(square_roi(np.empty((0, 2)), WIDTH, HEIGHT))
+
+
+class TestCropMapping(unittest.TestCase):
+    def test_crop_is_a_contiguous_copy(self):
+        frame = np.arange(HEIGHT * WIDTH * 3, dtype=np.uint32).reshape(HEIGHT, WIDTH, 3)
+        crop = crop_roi(frame, (100, 50, 200, 150))
+        self.assertEqual(crop.shape, (100, 100, 3))
+        self.assertTrue(crop.flags["C_CONTIGUOUS"])
+        np.testing.assert_array_equal(crop, frame[50:150, 100:200])
+        crop[:] = 0
+        self.assertTrue(frame[50:150, 100:200].all())
+
+    def test_crop_landmark_frame_round_trip(self):
+        frame = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+        frame[300, 500] = 255
+        roi = square_roi([(500 / WIDTH, 300 / HEIGHT)], WIDTH, HEIGHT, min_size=96)
+        # A landmark found on the marked pixel of the crop, in crop-normalized coordinates
+        crop = crop_roi(frame, roi)
+        row, column = np.argwhere(crop == 255)[0]
+        x, y = roi_to_frame(column / crop.shape[1], row / crop.shape[0], roi, WIDTH, HEIGHT)
+        self.assertAlmostEqual(x, 500 / WIDTH)
+        self.assertAlmostEqual(y, 300 / HEIGHT)
+
+    def test_roi_corners_map_to_frame(self):
+        roi = (160, 120, 400, 360)
+        self.assertEqual(roi_to_frame(0.0, 0.0, roi, WIDTH, HEIGHT), (0.25, 0.25))
+        self.assertEqual(roi_to_frame(1.0, 1.0, roi, WIDTH, HEIGHT), (0.625, 0.75))
+        # Landmarks outside the crop map outside it too
+        self.assertEqual(roi_to_frame(-0.5, 1.5, roi, WIDTH, HEIGHT), (0.0625, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import json
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from run_tests import metric_deltas, write_junit
+
+
+class TestMetricDeltas(unittest.TestCase):
+    def test_numeric_tuple_and_label_expectations(self):
+        expected = {"abduction_angle": (80, 100), "flexion_angle": (80, 100), "elevation": (-10, 10),
+                    "repetitions": 3, "gesture": "Closed_Fist", "pronation": (1, 2), "side": ("left", "right"),
+                    "missing": (0, 1), "hand": None}
+        metrics = {"abduction_angle": 75.5, "flexion_angle": 104.0, "elevation": 2.0, "repetitions": 5,
+                   "gesture": "Open_Palm", "pronation": 2, "side": "left", "hand": None}
+        self.assertEqual(metric_deltas(expected, metrics), {
+            "abduction_angle": -4.5,  # Below the range
+            "flexion_angle": 4.0,  # Above it
+            "elevation": 0,  # Inside it
+            "repetitions": 2,
+            "gesture": False,
+            "pronation": 0,
+            "side": True,
+            "missing": None,
+            "hand": True
+        })
+
+
+class TestJunitOutput(unittest.TestCase):
+    def test_statuses_and_metrics(self):
+        result = {"exercise": "c_flexion", "score": 2, "metrics": {"gesture": "Closed_Fist"},
+                  "metric_deltas": {"gesture": True}, "seconds": 0.25}
+        results = [
+            dict(result, image="C-2.png", status="passed", errors=[]),
+            dict(result, image="C-0.png", status="failed", errors=["gesture: expected Open_Palm", "score 2"]),
+            dict(result, image="C-1.png", status="error", errors=["RuntimeError: no model"]),
+            dict(result, image="C-9.png", status="skipped", errors=["No expected metrics defined"])
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.xml")
+            write_junit(results, 1.5, path)
+            suite = ET.parse(path).getroot()
+
+        self.assertEqual({name: suite.get(name) for name in ("tests", "failures", "errors", "skipped", "time")},
+                         {"tests": "4", "failures": "1", "errors": "1", "skipped": "1", "time": "1.500"})
+        cases = {case.get("name"): case for case in suite.iter("testcase")}
+        self.assertEqual(cases["C-2.png"].get("classname"), "c_flexion")
+        self.assertEqual(cases["C-2.png"].get("time"), "0.250")
+        self.assertEqual([child.tag for child in cases["C-2.png"]], ["system-out"])
+        failure = cases["C-0.png"].find("failure")
+        self.assertEqual(failure.get("message"), "gesture: expected Open_Palm; score 2")
+        self.assertEqual(json.loads(failure.text), {"gesture": "Closed_Fist"})
+        self.assertEqual(cases["C-1.png"].find("error").get("message"), "RuntimeError: no model")
+        self.assertEqual(cases["C-9.png"].find("skipped").get("message"), "No expected metrics defined")
+        self.assertEqual(json.loads(cases["C-2.png"].find("system-out").text),
+                         {"score": 2, "metrics": {"gesture": "Closed_Fist"}, "metric_deltas": {"gesture": True}})
+
+
+if __name__ == "__main__":
+    unittest.main()
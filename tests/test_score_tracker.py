@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import unittest
+from src.core.score_tracker import ScoreTracker
+
+
+def hold_time(fps, stabilization_ms=1000):
+    """Seconds of holding a score of 2 until it counts"""
+    tracker = ScoreTracker(stabilization_ms, dropout_tolerance_ms=300)
+    frame = 0
+    while tracker.update(2, frame / fps) < 2:
+        frame += 1
+    return frame / fps
+
+
+class TestScoreTracker(unittest.TestCase):
+    def test_hold_time_independent_of_frame_rate(self):
+        for fps in (8, 15, 30, 60):
+            with self.subTest(fps=fps):
+                self.assertAlmostEqual(hold_time(fps), 1.0, delta=1 / fps)
+        self.assertEqual(hold_time(30, stabilization_ms=0), 0.0)
+
+    def test_lower_score_in_window_holds_only_the_lower_score(self):
+        tracker = ScoreTracker(500)
+        for frame in range(20):
+            tracker.update(1 if frame == 5 else 2, frame / 10)
+        # 2 was held from 0.6 s, long enough by 1.1 s
+        self.assertEqual(tracker.best_score, 2)
+        tracker = ScoreTracker(500)
+        for frame in range(10):
+            tracker.update(1 if frame == 5 else 2, frame / 10)
+        self.assertEqual(tracker.best_score, 1)
+
+    def test_dropouts(self):
+        def run(tolerance_ms):
+            tracker = ScoreTracker(1000, dropout_tolerance_ms=tolerance_ms)
+            for frame in range(40):
+                # No pose from 0.4 to 0.6 s
+                score = None if 12 <= frame < 18 else 2
+                tracker.update(score, frame / 30)
+            return tracker.best_score
+        self.assertEqual(run(250), 2)
+        self.assertEqual(run(100), 0)
+
+    def test_frame_count_configurations(self):
+        tracker = ScoreTracker.for_exercise({"required_stable_frames": 3})
+        self.assertEqual([tracker.update(score) for score in (2, None, 2, 1, 2, 2)], [0, 0, 0, 1, 2, 2])
+        self.assertEqual(ScoreTracker.for_exercise({"stabilization_ms": 0}).update(1, 5.0), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src.core.landmark_frame import LandmarkFrame
+from src.core.session_recorder import SessionRecorder, SessionArchive, COORDINATE_SCALE
+
+
+def on_grid(values):
+    """Values the archive stores exactly"""
+    return np.round(np.asarray(values, dtype=np.float32) * COORDINATE_SCALE) / COORDINATE_SCALE
+
+
+def make_frames(count, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for index in range(count):
+        if index % 10 == 9:
+            frames.append(None)  # No pose detected
+            continue
+        frame = LandmarkFrame(on_grid(rng.uniform(-0.5, 1.5, (33, 4))), timestamp=index / 30)
+        if index % 3 == 0:
+            frame.empty_hands()
+            frame.hands[0] = on_grid(rng.uniform(0, 1, (21, 3)))
+            frame.set_gesture("right", "Open_Palm", 0.8125)
+        frames.append(frame)
+    return frames
+
+
+class TestSessionRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.fma")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, segments, chunk_frames=16):
+        recorder = SessionRecorder(self.path, metadata={"non_affected_side": "left"}, chunk_frames=chunk_frames)
+        self.assertTrue(recorder.start())
+        for (exercise_id, phase, side), frames in segments.items():
+            recorder.begin_segment(exercise_id, phase, side)
+            for index, frame in enumerate(frames):
+                score = None if frame is None else index % 3
+                recorder.record(frame, index * 1000 / 30, score, {"index": index, "angle": index / 7})
+        recorder.close()
+        self.assertIsNone(recorder.error)
+
+    def test_round_trip(self):
+        frames = make_frames(50)
+        self.record({("A2", "unaffected", "left"): make_frames(20, seed=1),
+                     ("A2", "affected", "right"): frames})
+
+        with SessionArchive(self.path) as archive:
+            self.assertEqual(archive.metadata, {"non_affected_side": "left"})
+            self.assertEqual([(info["phase"], info["frames"]) for info in archive.segments],
+                             [("unaffected", 20), ("affected", 50)])
+            segment = archive.read_segment("A2", "affected")
+            self.assertIsNone(archive.read_segment("A3", "affected"))
+
+        self.assertEqual(segment.side, "right")
+        # Timestamps are kept to the microsecond
+        np.testing.assert_allclose(segment.timestamps_ms, [index * 1000 / 30 for index in range(50)], atol=1e-3)
+        self.assertEqual(segment.metrics[7], {"index": 7, "angle": round(7 / 7, 4)})
+        for index, (expected, replayed) in enumerate(zip(frames, segment.landmark_frames())):
+            if expected is None:
+                self.assertIsNone(replayed)
+                self.assertEqual(segment.scores[index], -1)
+                continue
+            self.assertEqual(segment.scores[index], index % 3)
+            np.testing.assert_array_equal(replayed.pose, expected.pose)
+            if expected.hands is None:
+                self.assertIsNone(replayed.hands)
+            else:
+                np.testing.assert_array_equal(replayed.hands, expected.hands)
+                self.assertEqual(replayed.right_gesture, "Open_Palm")
+                self.assertEqual(replayed.right_gesture_score, 0.8125)
+                self.assertIsNone(replayed.left_gesture)
+
+    def test_quantization_error_is_bounded(self):
+        rng = np.random.default_rng(2)
+        pose = rng.uniform(0, 1, (33, 4))
+        self.record({("B", "affected", "left"): [LandmarkFrame(pose)]})
+        with SessionArchive(self.path) as archive:
+            replayed = archive.read_segment("B", "affected").pose[0]
+        self.assertLessEqual(np.abs(replayed - pose).max(), 0.5 / COORDINATE_SCALE + 1e-7)
+
+    def test_unclosed_recording_is_rejected(self):
+        recorder = SessionRecorder(self.path)
+        recorder.start()
+        recorder.begin_segment("A2", "affected", "left")
+        recorder.record(LandmarkFrame(np.zeros((33, 4))), 0.0)
+        recorder.end_segment()
+        with self.assertRaises(ValueError):
+            SessionArchive(self.path)
+        recorder.close()
+
+    def test_failed_recording_is_rejected(self):
+        recorder = SessionRecorder(self.path, chunk_frames=4)
+        recorder.start()
+        write_chunk = recorder._write_chunk
+        chunks = []
+
+        def failing_write_chunk(segment, records):
+            chunks.append(len(records))
+            if len(chunks) == 2:
+                raise OSError("No space left on device")
+            write_chunk(segment, records)
+
+        with mock.patch.object(recorder, "_write_chunk", failing_write_chunk):
+            recorder.begin_segment("A2", "affected", "left")
+            for frame in make_frames(12):
+                recorder.record(frame, 0.0)
+            recorder.close()
+        self.assertIsInstance(recorder.error, OSError)
+        # The chunks after the failure are dropped, not written after a gap
+        self.assertEqual(chunks, [4, 4])
+        with self.assertRaises(ValueError):
+            SessionArchive(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
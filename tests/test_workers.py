@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import unittest
+from unittest import mock
+from src.utils import workers
+from src.utils.workers import adaptive_worker_count
+
+
+class TestAdaptiveWorkerCount(unittest.TestCase):
+    def test_bounds(self):
+        self.assertEqual(adaptive_worker_count(1, 1024, requested=8), 1)
+        self.assertGreaterEqual(adaptive_worker_count(100, 1024), 1)
+        # A budget no machine can meet still leaves one worker
+        self.assertEqual(adaptive_worker_count(100, 10 ** 9, requested=8), 1)
+
+    def test_limited_by_memory(self):
+        with mock.patch.object(workers, "available_memory_bytes", return_value=3 * 1024 ** 3):
+            self.assertEqual(adaptive_worker_count(100, 1024, requested=8), 3)
+        with mock.patch.object(workers, "available_memory_bytes", return_value=None):
+            self.assertEqual(adaptive_worker_count(100, 1024, requested=8), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()